@@ -1,16 +1,30 @@
 from azure.devops.connection import Connection
-from azure.devops.v6_0.work_item_tracking.models import Wiql
-from typing import List, Dict
+from azure.devops.v7_1.work_item_tracking.models import Wiql
+from typing import Iterator, List, Dict
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../python')))
+from agents.replay import ReplayWitClient, wrap_wit_client
+from agents.work_item_hydrator import WorkItemHydrator
+
+BATCH_API_VERSION = '7.1'
 
 class AzureDevOpsIntegration:
-    def __init__(self, connection: Connection, project_name: str):
+    def __init__(self, connection: Connection, project_name: str, max_workers: int = 8):
         self.connection = connection
         self.project_name = project_name
-        self.wit_client = connection.clients.get_work_item_tracking_client()
+        self.max_workers = max_workers
+        # The live client, or its record/replay stand-in (PIPELINE_REPLAY_MODE)
+        self.wit_client = wrap_wit_client(connection.clients.get_work_item_tracking_client)
 
-    def get_requirements(self) -> List[Dict]:
+    def get_requirements(self) -> Iterator[Dict]:
         """
         Fetch requirements from Azure DevOps
+
+        Work items are retrieved in concurrent, field-projected chunks of up to
+        200 ids and yielded in WIQL order as each chunk arrives, so callers can
+        start analysing before the last chunk has been fetched.
         """
         wiql = Wiql(
             query=f"""
@@ -24,25 +38,44 @@ class AzureDevOpsIntegration:
         )
         
         wiql_results = self.wit_client.query_by_wiql(wiql).work_items
-        requirements = []
-        
-        if wiql_results:
-            for item in wiql_results:
-                work_item = self.wit_client.get_work_item(item.id)
-                requirements.append({
-                    'id': work_item.id,
-                    'title': work_item.fields['System.Title'],
-                    'description': work_item.fields.get('System.Description', ''),
-                    'acceptance_criteria': work_item.fields.get('Microsoft.VSTS.Common.AcceptanceCriteria', '')
-                })
-        
-        return requirements
+        if not wiql_results:
+            return
+
+        hydrator = WorkItemHydrator(self.wit_client, max_workers=self.max_workers, project=self.project_name)
+        for work_item in hydrator.iter_hydrate([item.id for item in wiql_results]):
+            yield {
+                'id': work_item.id,
+                'title': work_item.fields['System.Title'],
+                'description': work_item.fields.get('System.Description', ''),
+                'acceptance_criteria': work_item.fields.get('Microsoft.VSTS.Common.AcceptanceCriteria', '')
+            }
 
     def create_test_case(self, title: str, description: str, steps: List[Dict]) -> int:
         """
         Create a test case in Azure DevOps
         """
-        test_case = [
+        created_test_case = self.wit_client.create_work_item(
+            document=self.build_test_case_document(title, description, steps),
+            project=self.project_name,
+            type="Test Case"
+        )
+        
+        return created_test_case.id
+
+    def update_test_results(self, test_case_id: int, test_result: Dict):
+        """
+        Update test results in Azure DevOps
+        """
+        self.wit_client.update_work_item(
+            document=self.build_test_result_document(test_result),
+            id=test_case_id
+        )
+
+    def build_test_case_document(self, title: str, description: str, steps: List[Dict]) -> List[Dict]:
+        """
+        Build the JSON-Patch document that creates a test case
+        """
+        return [
             {
                 "op": "add",
                 "path": "/fields/System.Title",
@@ -59,20 +92,12 @@ class AzureDevOpsIntegration:
                 "value": self._format_test_steps(steps)
             }
         ]
-        
-        created_test_case = self.wit_client.create_work_item(
-            document=test_case,
-            project=self.project_name,
-            type="Test Case"
-        )
-        
-        return created_test_case.id
 
-    def update_test_results(self, test_case_id: int, test_result: Dict):
+    def build_test_result_document(self, test_result: Dict) -> List[Dict]:
         """
-        Update test results in Azure DevOps
+        Build the JSON-Patch document that records a test result
         """
-        test_results = [
+        return [
             {
                 "op": "add",
                 "path": "/fields/Microsoft.VSTS.TCM.TestResult",
@@ -84,11 +109,34 @@ class AzureDevOpsIntegration:
                 "value": test_result['comment']
             }
         ]
-        
-        self.wit_client.update_work_item(
-            document=test_results,
-            id=test_case_id
+
+    def send_batch(self, requests: List[Dict]) -> List[Dict]:
+        """
+        Send work item requests through the work item $batch endpoint
+
+        Args:
+            requests (List[Dict]): Batch entries with method, uri, headers and body
+
+        Returns:
+            List[Dict]: One response per request, in order, each with 'code' and 'body'
+        """
+        if isinstance(self.wit_client, ReplayWitClient):
+            return self.wit_client.replay_call(
+                'send_batch', requests, lambda: self._post_batch(self.wit_client.real_client(), requests)
+            )
+        return self._post_batch(self.wit_client, requests)
+
+    def _post_batch(self, wit_client, requests: List[Dict]) -> List[Dict]:
+        url = f"{self.connection.base_url.rstrip('/')}/_apis/wit/$batch?api-version={BATCH_API_VERSION}"
+        service_client = wit_client._client
+        response = service_client.send(
+            service_client.post(url),
+            headers={'Content-Type': 'application/json'},
+            # msrest serializes the content itself; a pre-encoded string would arrive as one JSON string
+            content=requests
         )
+        response.raise_for_status()
+        return response.json()['value']
 
     def _format_test_steps(self, steps: List[Dict]) -> str:
         """
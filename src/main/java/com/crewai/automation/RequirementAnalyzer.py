@@ -1,19 +1,27 @@
-from typing import List, Dict
+import os
+import sys
+from typing import List, Dict, Optional
 from crewai import Agent
 from langchain.tools import Tool
 from .AzureDevOpsIntegration import AzureDevOpsIntegration
+from .WorkItemBatchWriter import WorkItemBatchWriter
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../python')))
+from agents.llm_cache import LLMResponseCache, cached_execute_task
 
 class RequirementAnalyzer:
-    def __init__(self, agent: Agent, azure_devops: AzureDevOpsIntegration):
+    def __init__(self, agent: Agent, azure_devops: AzureDevOpsIntegration,
+                 cache: Optional[LLMResponseCache] = None):
         self.agent = agent
         self.azure_devops = azure_devops
+        self.cache = cache or LLMResponseCache.from_env()
         self._setup_tools()
 
     def _setup_tools(self):
         self.tools = [
             Tool(
                 name="fetch_requirements",
-                func=self.azure_devops.get_requirements,
+                func=lambda *_: list(self.azure_devops.get_requirements()),
                 description="Fetch requirements from Azure DevOps"
             ),
             Tool(
@@ -30,6 +38,7 @@ class RequirementAnalyzer:
         """
         requirements = self.azure_devops.get_requirements()
         test_scenarios = []
+        writer = WorkItemBatchWriter(self.azure_devops)
 
         for req in requirements:
             # Use the agent to analyze the requirement and create test scenarios
@@ -46,17 +55,24 @@ class RequirementAnalyzer:
             4. Business logic validation
             """
 
-            scenarios = self.agent.execute_task(analysis_prompt)
+            scenarios = cached_execute_task(self.agent, analysis_prompt, self.cache)
             parsed_scenarios = self._parse_scenarios(scenarios, req['id'])
-            test_scenarios.extend(parsed_scenarios)
 
-            # Create test cases in Azure DevOps
+            # Queue test case creation in Azure DevOps, keyed by scenario index
             for scenario in parsed_scenarios:
-                self.azure_devops.create_test_case(
+                writer.queue_create_test_case(
                     title=scenario['title'],
                     description=scenario['description'],
-                    steps=scenario['steps']
+                    steps=scenario['steps'],
+                    key=len(test_scenarios)
                 )
+                test_scenarios.append(scenario)
+
+        writer.flush()
+        for result in writer.results:
+            test_scenarios[result['key']]['id'] = result['id']
+            if result['status'] == 'Failed':
+                print(f"Error creating test case '{test_scenarios[result['key']]['title']}': {result['error']}")
 
         return test_scenarios
 
@@ -0,0 +1,100 @@
+import glob
+import os
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional
+
+# Stack trace lines kept per failure slice
+MAX_TRACE_LINES = 12
+
+class SurefireReportParser:
+    """
+    Streams target/surefire-reports/TEST-*.xml with iterparse.
+
+    Each <testcase> is counted and cleared as soon as its end tag is read, so
+    memory stays constant however large the reports grow: only totals,
+    per-class counts and the first max_failures failure slices (test, type,
+    message and the head of the stack trace) are kept.
+    """
+
+    def __init__(self, max_failures: int = 20, max_trace_lines: int = MAX_TRACE_LINES):
+        self.max_failures = max_failures
+        self.max_trace_lines = max_trace_lines
+
+    def parse(self, reports_dir: str) -> Dict:
+        """
+        Parse every surefire XML report in a directory
+
+        Args:
+            reports_dir (str): Surefire reports directory
+
+        Returns:
+            Dict: total_tests, passed, failed, errors, skipped, execution_time
+                (seconds), classes (per-class tests/failed/skipped), failures
+                (failure slices) and omitted_failures
+        """
+        summary = {
+            'total_tests': 0, 'passed': 0, 'failed': 0, 'errors': 0, 'skipped': 0,
+            'execution_time': 0.0, 'classes': {}, 'failures': [], 'omitted_failures': 0
+        }
+        for path in sorted(glob.glob(os.path.join(reports_dir, 'TEST-*.xml'))):
+            try:
+                self._parse_file(path, summary)
+            except ET.ParseError as e:
+                # A fork killed mid-write leaves a truncated report
+                print(f"Error parsing surefire report {path}: {e}")
+        summary['passed'] = summary['total_tests'] - summary['failed'] - summary['errors'] - summary['skipped']
+        summary['execution_time'] = round(summary['execution_time'], 3)
+        return summary
+
+    def _parse_file(self, path: str, summary: Dict):
+        root = None
+        for event, element in ET.iterparse(path, events=('start', 'end')):
+            if event == 'start':
+                if root is None:
+                    root = element
+                continue
+            if element.tag != 'testcase':
+                continue
+            self._add_testcase(element, summary)
+            # Drop the finished testcase and everything parsed before it
+            element.clear()
+            root.clear()
+
+    def _add_testcase(self, testcase: ET.Element, summary: Dict):
+        class_name = testcase.get('classname') or ''
+        counts = summary['classes'].setdefault(class_name.rsplit('.', 1)[-1],
+                                               {'tests': 0, 'failed': 0, 'skipped': 0})
+        counts['tests'] += 1
+        summary['total_tests'] += 1
+        summary['execution_time'] += float(testcase.get('time') or 0)
+
+        outcome = None
+        for child in testcase:
+            if child.tag in ('failure', 'error', 'skipped'):
+                outcome = child
+                break
+        if outcome is None:
+            return
+        if outcome.tag == 'skipped':
+            counts['skipped'] += 1
+            summary['skipped'] += 1
+            return
+
+        counts['failed'] += 1
+        summary['failed' if outcome.tag == 'failure' else 'errors'] += 1
+        if len(summary['failures']) >= self.max_failures:
+            summary['omitted_failures'] += 1
+            return
+        summary['failures'].append({
+            'test': f"{class_name}.{testcase.get('name')}",
+            'kind': outcome.tag,
+            'type': outcome.get('type'),
+            'message': (outcome.get('message') or '').strip()[:500],
+            'trace': self._trace_head(outcome.text)
+        })
+
+    def _trace_head(self, trace: Optional[str]) -> List[str]:
+        lines = [line.rstrip() for line in (trace or '').strip().splitlines() if line.strip()]
+        if len(lines) > self.max_trace_lines:
+            return lines[:self.max_trace_lines] + [f"... {len(lines) - self.max_trace_lines} more lines"]
+        return lines
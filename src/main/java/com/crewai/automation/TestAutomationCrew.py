@@ -2,13 +2,16 @@ from crewai import Agent, Task, Crew, Process
 from langchain_openai import ChatOpenAI
 from azure.devops.connection import Connection
 from msrest.authentication import BasicAuthentication
+import os
 
 class TestAutomationCrew:
     def __init__(self, azure_pat, azure_org_url, project_name):
         self.openai_model = ChatOpenAI(
             model="gpt-4",
             temperature=0.7,
-            api_key="your_openai_api_key"
+            api_key="your_openai_api_key",
+            # e.g. the record/replay stand-in started with `agents/replay.py serve`
+            base_url=os.getenv('OPENAI_BASE_URL')
         )
         self.azure_connection = self._setup_azure_connection(azure_pat, azure_org_url)
         self.project_name = project_name
@@ -1,11 +1,16 @@
 import os
-from typing import List, Dict
+import sys
+from typing import List, Dict, Optional
 from crewai import Agent
 from jinja2 import Template
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../python')))
+from agents.llm_cache import LLMResponseCache, cached_execute_task
+
 class TestAutomationGenerator:
-    def __init__(self, agent: Agent):
+    def __init__(self, agent: Agent, cache: Optional[LLMResponseCache] = None):
         self.agent = agent
+        self.cache = cache or LLMResponseCache.from_env()
         self.page_object_template = self._load_template('page_object.java.j2')
         self.test_class_template = self._load_template('test_class.java.j2')
 
@@ -34,7 +39,7 @@ class TestAutomationGenerator:
             3. Validations and verifications
             """
 
-            analysis_result = self.agent.execute_task(analysis_prompt)
+            analysis_result = cached_execute_task(self.agent, analysis_prompt, self.cache)
             page_objects.update(self._create_page_objects(analysis_result))
 
         return page_objects
@@ -60,7 +65,7 @@ class TestAutomationGenerator:
             4. Error handling
             """
 
-            test_code = self.agent.execute_task(generation_prompt)
+            test_code = cached_execute_task(self.agent, generation_prompt, self.cache)
             test_classes[f"{scenario['title']}Test"] = test_code
 
         return test_classes
@@ -1,27 +1,48 @@
+import json
+import os
 import subprocess
-from typing import List, Dict
+from typing import List, Dict, Optional
 from crewai import Agent
 from .AzureDevOpsIntegration import AzureDevOpsIntegration
+from .SurefireReportParser import SurefireReportParser
+from .WorkItemBatchWriter import WorkItemBatchWriter
 
 class TestExecutor:
     def __init__(self, agent: Agent, azure_devops: AzureDevOpsIntegration):
         self.agent = agent
         self.azure_devops = azure_devops
+        # Parallel Maven mode: module build threads (-T), surefire JVM forks and TestNG parallelism
+        self.maven_threads = os.getenv('MAVEN_THREADS', '')
+        self.fork_count = os.getenv('SUREFIRE_FORK_COUNT', '')
+        self.testng_parallel = os.getenv('TESTNG_PARALLEL', '')
+        self.testng_thread_count = os.getenv('TESTNG_THREAD_COUNT', '')
+        # Failure slices sent to the analysis prompt
+        self.max_failure_slices = int(os.getenv('MAX_FAILURE_SLICES', '20'))
 
-    def execute_tests(self, test_cases: List[Dict]) -> List[Dict]:
+    def execute_tests(self, test_cases: List[Dict], tests: Optional[List[str]] = None) -> List[Dict]:
         """
         Execute the generated test cases and analyze results
+
+        Args:
+            test_cases (List[Dict]): Test cases to report results for
+            tests (Optional[List[str]]): Surefire -Dtest patterns (e.g. LoginTest,
+                CheckoutTest#testPay); None runs the whole testng.xml suite
         """
         results = []
         
         # Run tests using Maven
         try:
-            subprocess.run(['mvn', 'clean', 'test'], check=True)
+            command = self._maven_command(tests)
+            print(f"Running: {' '.join(command)}")
+            completed = subprocess.run(command)
             test_output = self._parse_test_results('target/surefire-reports')
+            if completed.returncode != 0 and not test_output['total_tests']:
+                # Nothing ran: a build or configuration error, not test failures
+                raise subprocess.CalledProcessError(completed.returncode, command)
             
             analysis_prompt = f"""
             Analyze the following test execution results:
-            {test_output}
+            {self._format_for_analysis(test_output)}
 
             Provide:
             1. Summary of test execution
@@ -31,7 +52,7 @@ class TestExecutor:
             """
             
             analysis = self.agent.execute_task(analysis_prompt)
-            results = self._process_analysis(analysis, test_cases)
+            results = self._process_analysis(analysis, test_cases, test_output)
             
         except subprocess.CalledProcessError as e:
             print(f"Error executing tests: {e}")
@@ -39,42 +60,92 @@ class TestExecutor:
         
         return results
 
+    def _maven_command(self, tests: Optional[List[str]] = None) -> List[str]:
+        """
+        Build the Maven command line for the configured execution mode
+
+        Args:
+            tests (Optional[List[str]]): Surefire -Dtest patterns; when given,
+                surefire runs them instead of the testng.xml suite
+
+        Returns:
+            List[str]: mvn arguments
+        """
+        command = ['mvn', '-B', 'clean', 'test']
+        if self.maven_threads:
+            command += ['-T', self.maven_threads]
+        if self.fork_count:
+            # Each fork is a separate JVM; keep them alive across test classes
+            command += [f'-DforkCount={self.fork_count}', '-DreuseForks=true']
+        if self.testng_parallel:
+            command.append(f'-Dparallel={self.testng_parallel}')
+            if self.testng_thread_count:
+                command.append(f'-DthreadCount={self.testng_thread_count}')
+        if tests:
+            command += [f"-Dtest={','.join(tests)}", '-Dsurefire.failIfNoSpecifiedTests=false']
+        return command
+
     def _parse_test_results(self, reports_dir: str) -> Dict:
         """
         Parse test execution reports from surefire-reports directory
+
+        Args:
+            reports_dir (str): Surefire reports directory
+
+        Returns:
+            Dict: Totals, per-class counts and failure slices
         """
-        # Implementation would parse XML test reports
-        # For now, returning a sample structure
-        return {
-            'total_tests': 10,
-            'passed': 8,
-            'failed': 1,
-            'skipped': 1,
-            'execution_time': '2m 30s'
-        }
-
-    def _process_analysis(self, analysis: str, test_cases: List[Dict]) -> List[Dict]:
+        return SurefireReportParser(max_failures=self.max_failure_slices).parse(reports_dir)
+
+    def _format_for_analysis(self, test_output: Dict) -> str:
+        """Totals plus the failure slices; passing tests and full logs are left out"""
+        summary = {key: value for key, value in test_output.items() if key not in ('classes', 'failures')}
+        lines = [json.dumps(summary)]
+        for failure in test_output['failures']:
+            lines.append(f"\n{failure['kind'].upper()} {failure['test']}: {failure['type']}: {failure['message']}")
+            lines.extend(f"    {line}" for line in failure['trace'])
+        if test_output['omitted_failures']:
+            lines.append(f"\n... {test_output['omitted_failures']} more failures not shown")
+        return '\n'.join(lines)
+
+    def _test_case_status(self, test_case: Dict, test_output: Dict) -> str:
+        """Status of a test case from the counts of its generated {title}Test class"""
+        counts = test_output['classes'].get(f"{test_case.get('title', '')}Test")
+        if not counts:
+            return 'Not Executed'
+        if counts['failed']:
+            return 'Failed'
+        return 'Passed' if counts['tests'] > counts['skipped'] else 'Skipped'
+
+    def _process_analysis(self, analysis: str, test_cases: List[Dict], test_output: Dict) -> List[Dict]:
         """
         Process the agent's analysis and update Azure DevOps
         """
         results = []
+        writer = WorkItemBatchWriter(self.azure_devops)
         
         # Here you would parse the agent's analysis and create structured results
-        # For now, using a sample structure
         for test_case in test_cases:
+            status = self._test_case_status(test_case, test_output)
             result = {
                 'test_case_id': test_case['id'],
-                'status': 'Passed',  # This would come from actual test results
-                'comment': 'Test executed successfully'  # This would come from analysis
+                'status': status,
+                'comment': 'Test executed successfully' if status == 'Passed' else f'Test {status.lower()}'  # This would come from analysis
             }
             
-            # Update test result in Azure DevOps
-            self.azure_devops.update_test_results(
+            # Queue the test result update for Azure DevOps
+            writer.queue_update_test_results(
                 test_case_id=test_case['id'],
-                test_result=result
+                test_result=result,
+                key=len(results)
             )
             
             results.append(result)
+
+        writer.flush()
+        for update in writer.failures():
+            results[update['key']]['publish_error'] = update['error']
+            print(f"Error publishing result for test case {results[update['key']]['test_case_id']}: {update['error']}")
         
         return results
 
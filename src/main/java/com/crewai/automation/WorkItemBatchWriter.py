@@ -0,0 +1,141 @@
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+from .AzureDevOpsIntegration import AzureDevOpsIntegration, BATCH_API_VERSION
+
+# The work item $batch endpoint accepts at most 200 requests per call
+MAX_BATCH_SIZE = 200
+
+class WorkItemBatchWriter:
+    """
+    Queues test case creations and result updates and flushes them to Azure
+    DevOps through the work item $batch endpoint instead of one JSON-Patch
+    request per work item.
+
+    A group is flushed as soon as it reaches max_batch_size operations, or
+    when an operation is queued after the oldest pending one has waited
+    max_delay seconds; leaving the writer's context flushes the remainder.
+    """
+
+    def __init__(self, azure_devops: AzureDevOpsIntegration, max_batch_size: int = MAX_BATCH_SIZE,
+                 max_delay: float = 5.0):
+        self.azure_devops = azure_devops
+        self.max_batch_size = min(max_batch_size, MAX_BATCH_SIZE)
+        self.max_delay = max_delay
+        self.results: List[Dict] = []
+        self._pending: List[Dict] = []
+        self._oldest_pending: Optional[float] = None
+        self._lock = threading.RLock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+    def queue_create_test_case(self, title: str, description: str, steps: List[Dict], key: Any = None):
+        """
+        Queue the creation of a test case
+
+        Args:
+            key (Any): Caller-side identifier echoed back in the result, e.g. the scenario index
+        """
+        uri = f"/{quote(self.azure_devops.project_name)}/_apis/wit/workitems/{quote('$Test Case')}?api-version={BATCH_API_VERSION}"
+        self._queue('create', key, 'PATCH', uri,
+                    self.azure_devops.build_test_case_document(title, description, steps))
+
+    def queue_update_test_results(self, test_case_id: int, test_result: Dict, key: Any = None):
+        """
+        Queue a test result update
+
+        Args:
+            key (Any): Caller-side identifier echoed back in the result; defaults to test_case_id
+        """
+        uri = f"/_apis/wit/workitems/{test_case_id}?api-version={BATCH_API_VERSION}"
+        self._queue('update', test_case_id if key is None else key, 'PATCH', uri,
+                    self.azure_devops.build_test_result_document(test_result))
+
+    def flush(self) -> List[Dict]:
+        """
+        Send every pending operation
+
+        Returns:
+            List[Dict]: One result per flushed operation with 'key', 'operation',
+                'id', 'status' ('Succeeded' or 'Failed') and 'error'
+        """
+        with self._lock:
+            pending, self._pending, self._oldest_pending = self._pending, [], None
+            flushed = []
+            for start in range(0, len(pending), self.max_batch_size):
+                flushed.extend(self._send_group(pending[start:start + self.max_batch_size]))
+            self.results.extend(flushed)
+            return flushed
+
+    def failures(self) -> List[Dict]:
+        """Return every failed result flushed so far"""
+        return [result for result in self.results if result['status'] == 'Failed']
+
+    def _queue(self, operation: str, key: Any, method: str, uri: str, document: List[Dict]):
+        with self._lock:
+            now = time.monotonic()
+            if self._oldest_pending is None:
+                self._oldest_pending = now
+            self._pending.append({
+                'operation': operation,
+                'key': key,
+                'request': {
+                    'method': method,
+                    'uri': uri,
+                    'headers': {'Content-Type': 'application/json-patch+json'},
+                    'body': document
+                }
+            })
+            if len(self._pending) >= self.max_batch_size or now - self._oldest_pending >= self.max_delay:
+                self.flush()
+
+    def _send_group(self, group: List[Dict]) -> List[Dict]:
+        """
+        Send one $batch call; a transport failure fails only this group and a
+        non-2xx entry fails only that entry
+        """
+        try:
+            responses = self.azure_devops.send_batch([entry['request'] for entry in group])
+        except Exception as e:
+            print(f"Error sending work item batch of {len(group)} operations: {str(e)}")
+            return [self._result(entry, None, str(e)) for entry in group]
+
+        results = []
+        for entry, response in zip(group, responses):
+            body = response.get('body')
+            if isinstance(body, str):
+                try:
+                    body = json.loads(body)
+                except ValueError:
+                    pass
+            if 200 <= response.get('code', 500) < 300:
+                results.append(self._result(entry, body.get('id') if isinstance(body, dict) else None, None))
+            else:
+                results.append(self._result(entry, None, f"HTTP {response.get('code')}: {self._error_message(body)}"))
+        for entry in group[len(responses):]:
+            results.append(self._result(entry, None, 'No response returned for this operation'))
+        return results
+
+    def _error_message(self, body: Any) -> str:
+        if isinstance(body, dict):
+            value = body.get('value')
+            if body.get('message'):
+                return body['message']
+            if isinstance(value, dict) and value.get('Message'):
+                return value['Message']
+        return str(body)
+
+    def _result(self, entry: Dict, work_item_id: Optional[int], error: Optional[str]) -> Dict:
+        return {
+            'key': entry['key'],
+            'operation': entry['operation'],
+            'id': work_item_id,
+            'status': 'Failed' if error else 'Succeeded',
+            'error': error
+        }
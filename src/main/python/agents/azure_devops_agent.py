@@ -3,6 +3,10 @@ from azure.devops.connection import Connection
 from azure.devops.v7_1.work_item_tracking.models import Wiql
 from msrest.authentication import BasicAuthentication
 from dotenv import load_dotenv
+from agents.replay import wrap_wit_client
+from agents.requirement_store import DEFAULT_STORE_PATH, RequirementStore, format_changed_date, parse_changed_date
+from agents.work_item_hydrator import REQUIREMENT_FIELDS, WorkItemHydrator
+from typing import Dict, Optional
 import os
 
 class AzureDevOpsAgent:
@@ -11,6 +15,8 @@ class AzureDevOpsAgent:
         self.pat = os.getenv('AZURE_DEVOPS_PAT')
         self.organization = os.getenv('AZURE_DEVOPS_ORG')
         self.project = os.getenv('AZURE_DEVOPS_PROJECT')
+        self.hydration_workers = int(os.getenv('AZURE_DEVOPS_HYDRATION_WORKERS', '8'))
+        self.store_path = os.getenv('REQUIREMENT_STORE_PATH', DEFAULT_STORE_PATH)
         self.connection = self._create_connection()
 
     def _create_connection(self):
@@ -18,6 +24,10 @@ class AzureDevOpsAgent:
         organization_url = f"https://dev.azure.com/{self.organization}"
         return Connection(base_url=organization_url, creds=credentials)
 
+    def _wit_client(self):
+        # Built lazily so replay mode never touches the live service
+        return wrap_wit_client(self.connection.clients.get_work_item_tracking_client)
+
     def create_agent(self):
         return Agent(
             role='Azure DevOps Requirements Fetcher',
@@ -32,42 +42,119 @@ class AzureDevOpsAgent:
     def fetch_requirements(self) -> list:
         """Fetch test requirements from Azure DevOps project"""
         try:
-            wit_client = self.connection.clients.get_work_item_tracking_client()
+            wit_client = self._wit_client()
             
             # Query to fetch requirement work items
-            wiql = Wiql(
-                query=f"""
-                SELECT [System.Id], [System.Title], [System.Description]
-                FROM workitems
-                WHERE [System.WorkItemType] = 'Product Backlog Item'
-                AND [System.TeamProject] = '{self.project}'
-                AND [System.State] = 'Committed'
-                ORDER BY [System.Id]
-                """
-            )
-            
-            # Execute the query
-            query_results = wit_client.query_by_wiql(wiql).work_items
+            query_results = wit_client.query_by_wiql(self._requirements_query()).work_items
             
             requirements = []
             if query_results:
-                # Get work items with full details
-                work_items = wit_client.get_work_items(
-                    ids=[result.id for result in query_results],
-                    expand="All"
-                )
-                
-                for work_item in work_items:
-                    requirement = {
-                        'id': work_item.id,
-                        'title': work_item.fields['System.Title'],
-                        'description': work_item.fields.get('System.Description', ''),
-                        'acceptance_criteria': work_item.fields.get('Microsoft.VSTS.Common.AcceptanceCriteria', '')
-                    }
-                    requirements.append(requirement)
+                # Hydrate in service-sized chunks, projecting only the fields we use
+                hydrator = WorkItemHydrator(wit_client, max_workers=self.hydration_workers)
+                for work_item in hydrator.iter_hydrate([result.id for result in query_results]):
+                    requirements.append(self._to_requirement(work_item))
             
             return requirements
             
         except Exception as e:
             print(f"Error fetching requirements: {str(e)}")
-            return []
\ No newline at end of file
+            return []
+
+    def sync_requirements(self, store: Optional[RequirementStore] = None) -> Dict:
+        """
+        Incrementally sync committed requirements into the local store
+
+        Only work items changed since the stored System.ChangedDate watermark
+        (plus ids the store has never seen) are hydrated; the committed id list
+        itself is a single cheap WIQL call used to detect removals.
+
+        Args:
+            store (Optional[RequirementStore]): Store to sync into; opened from
+                REQUIREMENT_STORE_PATH when omitted
+
+        Returns:
+            Dict: 'changed' (new or changed requirements), 'removed' (requirements
+                that were deleted or left the committed state) and 'unchanged' (count)
+        """
+        owns_store = store is None
+        store = store or RequirementStore(self.store_path)
+        try:
+            wit_client = self._wit_client()
+            committed_ids = [result.id for result in wit_client.query_by_wiql(self._requirements_query()).work_items]
+            known_revisions = store.known_revisions()
+            watermark = store.get_watermark()
+
+            if watermark:
+                changed_since = {
+                    result.id for result in wit_client.query_by_wiql(
+                        self._requirements_query(changed_since=watermark), time_precision=True
+                    ).work_items
+                }
+                candidate_ids = [work_item_id for work_item_id in committed_ids
+                                 if work_item_id in changed_since or work_item_id not in known_revisions]
+            else:
+                candidate_ids = committed_ids
+
+            hydrator = WorkItemHydrator(
+                wit_client,
+                fields=REQUIREMENT_FIELDS + ['System.Rev', 'System.ChangedDate'],
+                max_workers=self.hydration_workers
+            )
+            changed = []
+            # Compared as datetimes: ADO drops trailing zeros, so '...:05.1Z' sorts after '...:05.13Z' as text
+            latest_change = parse_changed_date(watermark) if watermark else None
+            for work_item in hydrator.iter_hydrate(candidate_ids):
+                changed_date = str(work_item.fields['System.ChangedDate'])
+                changed_at = parse_changed_date(work_item.fields['System.ChangedDate'])
+                if latest_change is None or changed_at > latest_change:
+                    latest_change = changed_at
+                rev = work_item.fields['System.Rev']
+                if known_revisions.get(work_item.id) == rev:
+                    continue
+                requirement = self._to_requirement(work_item)
+                requirement.update(rev=rev, changed_date=changed_date)
+                changed.append(requirement)
+
+            committed = set(committed_ids)
+            removed_ids = [work_item_id for work_item_id in known_revisions if work_item_id not in committed]
+            removed = store.get_requirements(removed_ids)
+            store.apply_sync(changed, removed_ids, format_changed_date(latest_change) if latest_change else None)
+
+            for requirement in changed:
+                del requirement['rev'], requirement['changed_date']
+            return {
+                'changed': changed,
+                'removed': removed,
+                'unchanged': len(committed_ids) - len(changed)
+            }
+
+        except Exception as e:
+            print(f"Error syncing requirements: {str(e)}")
+            return {'changed': [], 'removed': [], 'unchanged': 0}
+        finally:
+            if owns_store:
+                store.close()
+
+    def _requirements_query(self, changed_since: Optional[str] = None) -> Wiql:
+        """Build the WIQL query for committed PBIs, optionally only those changed since a watermark"""
+        changed_clause = f"AND [System.ChangedDate] >= '{changed_since}'" if changed_since else ""
+        return Wiql(
+            query=f"""
+            SELECT [System.Id], [System.Title], [System.Description]
+            FROM workitems
+            WHERE [System.WorkItemType] = 'Product Backlog Item'
+            AND [System.TeamProject] = '{self.project}'
+            AND [System.State] = 'Committed'
+            {changed_clause}
+            ORDER BY [System.Id]
+            """
+        )
+
+    def _to_requirement(self, work_item) -> dict:
+        """Map a hydrated work item to the requirement dict used downstream"""
+        return {
+            'id': work_item.id,
+            'title': work_item.fields['System.Title'],
+            'description': work_item.fields.get('System.Description', ''),
+            'acceptance_criteria': work_item.fields.get('Microsoft.VSTS.Common.AcceptanceCriteria', '')
+        }
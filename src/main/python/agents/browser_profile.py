@@ -0,0 +1,117 @@
+import json
+import os
+from typing import Dict, List, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from agents.driver_resolver import resolve_chromedriver
+from agents.test_timing import command_timing_enabled, instrument_driver
+
+DEFAULT_PROFILES_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '../../../test/resources/browser_profiles.json')
+)
+DEFAULT_PROFILE = 'default'
+
+
+class BrowserProfile:
+    """
+    Browser performance settings shared by generated tests and the locator suggester.
+
+    The 'default' profile reproduces the original behaviour (headed Chrome,
+    everything loaded, 10s implicit wait). Faster profiles run headless, skip
+    images and extensions, return from navigation at DOMContentLoaded
+    ('eager') and block URL patterns such as fonts and analytics. Waits are
+    meant to be explicit (page objects use explicit_wait); stacking an
+    implicit wait on top multiplies the time a failing lookup takes.
+    """
+
+    def __init__(self, name: str, headless: bool = False, disable_images: bool = False,
+                 disable_extensions: bool = False, page_load_strategy: str = 'normal',
+                 blocked_urls: Optional[List[str]] = None, window_size: Optional[str] = None,
+                 implicit_wait: float = 10, explicit_wait: float = 10, arguments: Optional[List[str]] = None):
+        if page_load_strategy not in ('normal', 'eager', 'none'):
+            raise ValueError(f"Unknown page load strategy in browser profile {name}: {page_load_strategy}")
+        self.name = name
+        self.headless = headless
+        self.disable_images = disable_images
+        self.disable_extensions = disable_extensions
+        self.page_load_strategy = page_load_strategy
+        self.blocked_urls = blocked_urls or []
+        self.window_size = window_size
+        self.implicit_wait = implicit_wait
+        self.explicit_wait = explicit_wait
+        self.arguments = arguments or []
+
+    @classmethod
+    def from_dict(cls, name: str, settings: Dict) -> 'BrowserProfile':
+        return cls(name=name, **settings)
+
+    def chrome_options(self):
+        """Build ChromeOptions for this profile"""
+        options = Options()
+        if self.headless:
+            options.add_argument('--headless=new')
+        if self.disable_extensions:
+            options.add_argument('--disable-extensions')
+        if self.disable_images:
+            options.add_argument('--blink-settings=imagesEnabled=false')
+            options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        if self.window_size:
+            options.add_argument(f'--window-size={self.window_size}')
+        for argument in self.arguments:
+            options.add_argument(argument)
+        options.page_load_strategy = self.page_load_strategy
+        return options
+
+    def apply(self, driver):
+        """Apply the settings that can only be made on a running session"""
+        driver.implicitly_wait(self.implicit_wait)
+        if self.blocked_urls:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_urls})
+
+
+def load_browser_profiles(path: Optional[str] = None) -> Dict[str, BrowserProfile]:
+    """
+    Load every profile from the profiles file
+
+    Args:
+        path (Optional[str]): JSON file of profile settings by name (BROWSER_PROFILES_PATH)
+
+    Returns:
+        Dict[str, BrowserProfile]: Profiles by name
+    """
+    path = path or os.getenv('BROWSER_PROFILES_PATH', DEFAULT_PROFILES_PATH)
+    with open(path) as f:
+        return {name: BrowserProfile.from_dict(name, settings) for name, settings in json.load(f).items()}
+
+
+def load_browser_profile(name: Optional[str] = None, path: Optional[str] = None) -> BrowserProfile:
+    """
+    Load the named profile (BROWSER_PROFILE, 'default' if unset)
+
+    A missing profiles file yields the built-in default profile, so generated
+    tests keep working outside this repository layout.
+    """
+    name = name or os.getenv('BROWSER_PROFILE', DEFAULT_PROFILE)
+    try:
+        profiles = load_browser_profiles(path)
+    except FileNotFoundError:
+        if name != DEFAULT_PROFILE:
+            raise
+        return BrowserProfile(DEFAULT_PROFILE)
+    if name not in profiles:
+        raise KeyError(f"Unknown browser profile '{name}'; available: {', '.join(sorted(profiles))}")
+    return profiles[name]
+
+
+def create_driver(profile: Optional[BrowserProfile] = None):
+    """Start Chrome configured by the profile"""
+    profile = profile or load_browser_profile()
+    driver = webdriver.Chrome(service=Service(resolve_chromedriver()), options=profile.chrome_options())
+    profile.apply(driver)
+    if command_timing_enabled():
+        driver = instrument_driver(driver)
+    return driver
@@ -0,0 +1,289 @@
+"""
+Code generation templates, compiled once per process, and the renderers
+that turn a scenario into (file path, content) pairs.
+
+All generators render through TEMPLATE_ENVIRONMENT. Its templates are
+compiled when this module is imported and the compiled code is kept in a
+FileSystemBytecodeCache (JINJA_BYTECODE_CACHE_DIR), so later processes and
+pool workers load them without re-parsing. The renderers do no I/O and
+only depend on the scenario, so they can run in any process.
+"""
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from jinja2 import DictLoader, Environment, FileSystemBytecodeCache
+
+PYTHON_PAGE_OBJECT_SOURCE = '''
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.common.keys import Keys
+
+class {{ class_name }}:
+    def __init__(self, driver, timeout=10):
+        self.driver = driver
+        self.wait = WebDriverWait(driver, timeout)
+        
+    {% for element in elements %}
+    # {{ element.description }}
+    {{ element.name }}_locator = (By.{{ element.by }}, "{{ element.value }}")
+    
+    def {{ element.name }}(self):
+        return self.wait.until(
+            EC.presence_of_element_located(self.{{ element.name }}_locator)
+        )
+    {% endfor %}
+    
+    {% for action in actions %}
+    def {{ action.name }}(self{% if action.params %}, {{ action.params }}{% endif %}):
+        """{{ action.description }}"""
+        {{ action.implementation }}
+    {% endfor %}
+'''
+
+PYTHON_TEST_CLASS_SOURCE = '''
+import unittest
+from agents.browser_profile import load_browser_profile
+from agents.driver_pool import get_driver_pool
+from pages.{{ page_class_file }} import {{ page_class }}
+import os
+from dotenv import load_dotenv
+
+class {{ test_class_name }}(unittest.TestCase):
+    def setUp(self):
+        load_dotenv()
+        # Headless, resource and wait settings come from BROWSER_PROFILE
+        self.profile = load_browser_profile()
+        # Warm, reset browser sessions are shared by the tests of this process
+        self.driver = get_driver_pool().lease()
+        self.base_url = os.getenv('TEST_WEBSITE_URL')
+        self.page = {{ page_class }}(self.driver, timeout=self.profile.explicit_wait)
+
+    def tearDown(self):
+        if self.driver:
+            get_driver_pool().release(self.driver)
+
+    {% for test_case in test_cases %}
+    def test_{{ test_case.name }}(self):
+        """{{ test_case.description }}"""
+        {% for step in test_case.steps %}
+        {{ step }}
+        {% endfor %}
+    {% endfor %}
+
+if __name__ == '__main__':
+    unittest.main()
+'''
+
+JAVA_PAGE_OBJECT_SOURCE = '''
+package com.crewai.pages;
+
+import org.openqa.selenium.By;
+import org.openqa.selenium.WebDriver;
+import org.openqa.selenium.WebElement;
+import org.openqa.selenium.support.ui.WebDriverWait;
+import org.openqa.selenium.support.ui.ExpectedConditions;
+
+public class {{ class_name }} extends BasePage {
+    public {{ class_name }}(WebDriver driver) {
+        super(driver);
+    }
+{%- for locator in locators %}
+
+    private By {{ locator.field }} = {{ locator.by }}("{{ locator.value }}");
+
+    public void {{ locator.field }}() {
+        driver.findElement({{ locator.field }}).click();
+    }
+{%- endfor %}
+}
+'''
+
+JAVA_TEST_CLASS_SOURCE = '''
+package com.crewai.tests;
+
+import com.crewai.pages.{{ page_class }};
+import org.testng.annotations.BeforeMethod;
+import org.testng.annotations.AfterMethod;
+
+public class {{ test_class_name }} extends BaseTest {
+    private {{ page_class }} page;
+
+    @BeforeMethod
+    public void setUpTest() {
+        super.setUp();
+        page = new {{ page_class }}(driver);
+        driver.get(System.getenv("TEST_WEBSITE_URL"));
+    }
+
+    @AfterMethod
+    public void tearDownTest() {
+        super.tearDown();
+    }
+
+    // Add test methods here
+}
+'''
+
+TEMPLATE_SOURCES = {
+    'python_page_object.py.j2': PYTHON_PAGE_OBJECT_SOURCE,
+    'python_test_class.py.j2': PYTHON_TEST_CLASS_SOURCE,
+    'java_page_object.java.j2': JAVA_PAGE_OBJECT_SOURCE,
+    'java_test_class.java.j2': JAVA_TEST_CLASS_SOURCE,
+}
+
+
+def _bytecode_cache():
+    directory = os.getenv('JINJA_BYTECODE_CACHE_DIR', os.path.join('.crewai_cache', 'jinja2'))
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError as e:
+        print(f"Jinja2 bytecode cache disabled: {str(e)}")
+        return None
+    return FileSystemBytecodeCache(directory)
+
+
+# Same options as jinja2.Template(...), so the rendered output is unchanged
+TEMPLATE_ENVIRONMENT = Environment(
+    loader=DictLoader(TEMPLATE_SOURCES),
+    bytecode_cache=_bytecode_cache(),
+    auto_reload=False,
+    cache_size=-1
+)
+
+PYTHON_PAGE_OBJECT = TEMPLATE_ENVIRONMENT.get_template('python_page_object.py.j2')
+PYTHON_TEST_CLASS = TEMPLATE_ENVIRONMENT.get_template('python_test_class.py.j2')
+JAVA_PAGE_OBJECT = TEMPLATE_ENVIRONMENT.get_template('java_page_object.java.j2')
+JAVA_TEST_CLASS = TEMPLATE_ENVIRONMENT.get_template('java_test_class.java.j2')
+
+
+@lru_cache(maxsize=4096)
+def name_variants(title: str) -> Dict[str, str]:
+    """
+    Class, module and file names derived from a requirement title
+
+    Args:
+        title (str): Requirement title, e.g. 'User Login'
+
+    Returns:
+        Dict[str, str]: pascal ('UserLogin'), snake ('user_login'), page_class,
+            page_module, test_class and test_module; shared, do not modify
+    """
+    pascal = title.replace(' ', '')
+    snake = title.lower().replace(' ', '_')
+    return {
+        'pascal': pascal,
+        'snake': snake,
+        'page_class': f"{pascal}Page",
+        'page_module': f"{snake}_page",
+        'test_class': f"Test{pascal}",
+        'test_module': f"test_{snake}",
+    }
+
+
+def identifier(text: str) -> str:
+    """Lower-case identifier of free text such as an action, e.g. 'Add to Cart' -> 'addtocart'"""
+    name = re.sub(r'\W', '', text).lower()
+    return name if name and not name[0].isdigit() else f"_{name}"
+
+
+def render_python_page_object(scenario: Dict) -> Tuple[str, str]:
+    """
+    Render the Python page object of a scenario
+
+    Returns:
+        Tuple[str, str]: File path and content
+    """
+    names = name_variants(scenario['requirement_title'])
+    # Extract page elements and actions from test cases
+    elements = []
+    actions = []
+
+    # Add common actions
+    actions.append({
+        'name': 'navigate_to',
+        'description': 'Navigate to the page',
+        'params': 'url',
+        'implementation': 'self.driver.get(url)'
+    })
+
+    content = PYTHON_PAGE_OBJECT.render(
+        class_name=names['page_class'],
+        elements=elements,
+        actions=actions
+    )
+    return f"src/main/python/pages/{names['page_module']}.py", content
+
+
+def render_python_test_class(scenario: Dict) -> Tuple[str, str]:
+    """
+    Render the Python test module of a scenario
+
+    Returns:
+        Tuple[str, str]: File path and content
+    """
+    names = name_variants(scenario['requirement_title'])
+    test_cases = []
+    for test_case in scenario['test_cases']:
+        # Always create at least one valid test method
+        steps = [f"self.page.navigate_to(self.base_url)"]
+        # If there are additional steps, add them here
+        if 'steps' in test_case and isinstance(test_case['steps'], list):
+            steps.extend(test_case['steps'])
+        case = {
+            'name': test_case['title'].lower().replace(' ', '_'),
+            'description': test_case['title'],
+            'steps': steps
+        }
+        test_cases.append(case)
+    # If no test cases, add a dummy test to avoid empty class
+    if not test_cases:
+        test_cases.append({
+            'name': 'dummy',
+            'description': 'Dummy test to ensure at least one test method exists.',
+            'steps': ['self.page.navigate_to(self.base_url)']
+        })
+
+    content = PYTHON_TEST_CLASS.render(
+        test_class_name=names['test_class'],
+        page_class=names['page_class'],
+        page_class_file=names['page_module'],
+        test_cases=test_cases
+    )
+    return f"src/test/python/{names['test_module']}.py", content
+
+
+def java_action_text(scenario: Dict) -> str:
+    """Action the Java page object gets a locator for; for demo, the first test case title"""
+    test_cases = scenario.get('test_cases') or []
+    return test_cases[0]['title'] if test_cases else "Add to Cart"
+
+
+def render_java_page_object(scenario: Dict, locator: Optional[Dict] = None) -> Tuple[str, str]:
+    """
+    Render the Java page object of a scenario
+
+    Args:
+        scenario (Dict): Test scenario details
+        locator (Optional[Dict]): field/by/value of the action's locator, if one was found
+
+    Returns:
+        Tuple[str, str]: File path and content
+    """
+    names = name_variants(scenario['requirement_title'])
+    content = JAVA_PAGE_OBJECT.render(class_name=names['page_class'], locators=[locator] if locator else [])
+    return f"src/main/java/com/crewai/pages/{names['page_class']}.java", content
+
+
+def render_java_test_class(scenario: Dict) -> Tuple[str, str]:
+    """
+    Render the Java TestNG class of a scenario
+
+    Returns:
+        Tuple[str, str]: File path and content
+    """
+    names = name_variants(scenario['requirement_title'])
+    content = JAVA_TEST_CLASS.render(page_class=names['page_class'], test_class_name=names['test_class'])
+    return f"src/test/java/com/crewai/tests/{names['test_class']}.java", content
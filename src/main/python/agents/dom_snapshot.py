@@ -0,0 +1,164 @@
+import difflib
+import re
+from typing import Dict, List, Set
+
+# One execute_script round trip: the locator-relevant attributes of every
+# element that has an id, an accessible name or a test hook, or is clickable
+SNAPSHOT_SCRIPT = """
+const clickable = new Set(['BUTTON', 'A', 'INPUT', 'SELECT', 'TEXTAREA']);
+const rows = [];
+for (const el of document.querySelectorAll('*')) {
+    const id = el.id || '';
+    const aria = el.getAttribute('aria-label') || '';
+    const dataTestAttribute = el.hasAttribute('data-test') ? 'data-test'
+        : (el.hasAttribute('data-testid') ? 'data-testid' : '');
+    const role = el.getAttribute('role') || '';
+    if (!id && !aria && !dataTestAttribute && !role && !clickable.has(el.tagName)) {
+        continue;
+    }
+    const texts = [];
+    for (const node of el.childNodes) {
+        if (node.nodeType === Node.TEXT_NODE && node.nodeValue.trim()) {
+            texts.push(node.nodeValue);
+        }
+    }
+    rows.push([el.tagName.toLowerCase(), id, texts, role, aria,
+               dataTestAttribute ? el.getAttribute(dataTestAttribute) : '', dataTestAttribute]);
+}
+return rows;
+"""
+
+FIELDS = ('tag', 'id', 'texts', 'role', 'aria_label', 'data_test', 'data_test_attribute')
+TOKEN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+
+def tokens(text: str) -> List[str]:
+    """'addToCart', 'add-to-cart' and 'Add to Cart' all give ['add', 'to', 'cart']"""
+    return [token.lower() for token in TOKEN.findall(text or '')]
+
+
+def normalize(text: str) -> str:
+    return ' '.join((text or '').split()).lower()
+
+
+def _css_string(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+class DomSnapshot:
+    """
+    The page's locator-relevant elements, pulled with a single execute_script
+    and indexed locally.
+
+    Inverted indexes map id tokens, button text, aria-label and data-test /
+    data-testid values to elements, so every lookup after the snapshot is
+    answered in memory instead of with WebDriver round trips per element.
+    find() returns matches in the order the live scan did (exact button
+    text, partial button text, id), then aria-label and data-test matches,
+    and falls back to fuzzy matches when nothing matched directly.
+    """
+
+    def __init__(self, rows: List[List]):
+        self.elements: List[Dict] = [dict(zip(FIELDS, row)) for row in rows]
+        self.buttons: List[int] = []
+        self.button_text: Dict[str, List[int]] = {}
+        self.id_tokens: Dict[str, Set[int]] = {}
+        self.aria_label: Dict[str, List[int]] = {}
+        self.data_test: Dict[str, List[int]] = {}
+        for position, element in enumerate(self.elements):
+            if element['tag'] == 'button':
+                self.buttons.append(position)
+                for text in element['texts']:
+                    self.button_text.setdefault(normalize(text), []).append(position)
+            for token in set(tokens(element['id'])):
+                self.id_tokens.setdefault(token, set()).add(position)
+            if element['aria_label']:
+                self.aria_label.setdefault(normalize(element['aria_label']), []).append(position)
+            if element['data_test']:
+                self.data_test.setdefault(normalize(element['data_test']), []).append(position)
+
+    @classmethod
+    def capture(cls, driver) -> 'DomSnapshot':
+        """Snapshot the page the driver is showing"""
+        return cls(driver.execute_script(SNAPSHOT_SCRIPT) or [])
+
+    def find(self, action_text: str, fuzzy_cutoff: float = 0.8) -> List[Dict[str, str]]:
+        """
+        Locators for an action, best first
+
+        Args:
+            action_text (str): Action such as 'Add to Cart'
+            fuzzy_cutoff (float): Minimum similarity (0-1) of a fuzzy match
+
+        Returns:
+            List[Dict[str, str]]: by ('XPATH', 'ID' or 'CSS_SELECTOR'), value and
+                match ('exact', 'partial', 'id', 'aria_label', 'data_test' or 'fuzzy')
+        """
+        locators = []
+        # Same semantics as the live XPaths: text()= compares every direct
+        # text node, contains(text(), ...) only the first one
+        if any(action_text in self.elements[position]['texts']
+               for position in self.button_text.get(normalize(action_text), [])):
+            locators.append({'by': 'XPATH', 'value': f"//button[text()='{action_text}']", 'match': 'exact'})
+        if any(self.elements[position]['texts'] and action_text in self.elements[position]['texts'][0]
+               for position in self.buttons):
+            locators.append({'by': 'XPATH', 'value': f"//button[contains(text(), '{action_text}')]",
+                             'match': 'partial'})
+        for position in self._id_matches(action_text):
+            locators.append({'by': 'ID', 'value': self.elements[position]['id'], 'match': 'id'})
+        for position in self.aria_label.get(normalize(action_text), []):
+            locators.append(self._aria_locator(position, 'aria_label'))
+        words = tokens(action_text)
+        for key in dict.fromkeys((normalize(action_text), '-'.join(words), '_'.join(words))):
+            for position in self.data_test.get(key, []):
+                locators.append(self._data_test_locator(position, 'data_test'))
+        if not locators:
+            locators = self._fuzzy(action_text, fuzzy_cutoff)
+        return self._dedupe(locators)
+
+    def _id_matches(self, action_text: str) -> List[int]:
+        """Elements whose id contains the action text (as the live scan did) or all of its tokens"""
+        words = tokens(action_text)
+        positions = set.intersection(*(self.id_tokens.get(word, set()) for word in words)) if words else set()
+        needle = action_text.lower()
+        positions.update(position for position, element in enumerate(self.elements)
+                         if element['id'] and needle in element['id'].lower())
+        return sorted(positions)
+
+    def _fuzzy(self, action_text: str, cutoff: float) -> List[Dict[str, str]]:
+        wanted = normalize(action_text)
+        locators = []
+        for text in difflib.get_close_matches(wanted, list(self.button_text), n=3, cutoff=cutoff):
+            for position in self.button_text[text]:
+                locators.append({'by': 'XPATH', 'match': 'fuzzy', 'value': (
+                    f"//button[normalize-space(text())='{' '.join(self.elements[position]['texts'][0].split())}']")})
+        ids = {' '.join(tokens(element['id'])): position
+               for position, element in enumerate(self.elements) if element['id']}
+        for text in difflib.get_close_matches(' '.join(tokens(action_text)), list(ids), n=3, cutoff=cutoff):
+            locators.append({'by': 'ID', 'value': self.elements[ids[text]]['id'], 'match': 'fuzzy'})
+        for text in difflib.get_close_matches(wanted, list(self.aria_label), n=3, cutoff=cutoff):
+            locators.extend(self._aria_locator(position, 'fuzzy') for position in self.aria_label[text])
+        for text in difflib.get_close_matches(wanted, list(self.data_test), n=3, cutoff=cutoff):
+            locators.extend(self._data_test_locator(position, 'fuzzy') for position in self.data_test[text])
+        return locators
+
+    def _aria_locator(self, position: int, match: str) -> Dict[str, str]:
+        element = self.elements[position]
+        return {'by': 'CSS_SELECTOR', 'match': match,
+                'value': f'{element["tag"]}[aria-label="{_css_string(element["aria_label"])}"]'}
+
+    def _data_test_locator(self, position: int, match: str) -> Dict[str, str]:
+        element = self.elements[position]
+        return {'by': 'CSS_SELECTOR', 'match': match,
+                'value': f'[{element["data_test_attribute"]}="{_css_string(element["data_test"])}"]'}
+
+    @staticmethod
+    def _dedupe(locators: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        seen = set()
+        unique = []
+        for locator in locators:
+            key = (locator['by'], locator['value'])
+            if key not in seen:
+                seen.add(key)
+                unique.append(locator)
+        return unique
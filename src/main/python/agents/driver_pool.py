@@ -0,0 +1,183 @@
+import atexit
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+from agents.browser_profile import create_driver
+
+# Storage is per origin, so it is cleared before leaving the page
+CLEAR_STORAGE_SCRIPT = "window.localStorage.clear(); window.sessionStorage.clear();"
+
+
+class _Session:
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+
+
+class DriverPool:
+    """
+    Pool of warm WebDriver sessions shared by the tests of one process.
+
+    lease() hands out an idle session (starting one if the pool is below
+    max_size, otherwise waiting for a release); release() resets cookies,
+    storage, extra windows and navigates to about:blank before the session
+    is reused. A session is quit and replaced after max_uses leases, when
+    the caller reports it broken, or when its reset fails.
+    """
+
+    def __init__(self, driver_factory: Callable = create_driver, max_size: int = 1, max_uses: int = 50):
+        self.driver_factory = driver_factory
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self._idle: List[_Session] = []
+        self._leased: Dict[int, _Session] = {}
+        self._starting = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self._stats = {
+            'leases': 0,
+            'reused_leases': 0,
+            'sessions_created': 0,
+            'sessions_recycled': 0,
+            'lease_wait_seconds': 0.0,
+            'max_lease_wait_seconds': 0.0
+        }
+
+    @classmethod
+    def from_env(cls) -> 'DriverPool':
+        return cls(
+            max_size=int(os.getenv('DRIVER_POOL_SIZE', '1')),
+            max_uses=int(os.getenv('DRIVER_POOL_MAX_USES', '50'))
+        )
+
+    def lease(self, timeout: Optional[float] = None):
+        """
+        Lease a session, waiting up to timeout seconds when all are in use
+
+        Returns:
+            WebDriver: A reset session, or a newly started one
+
+        Raises:
+            TimeoutError: If no session became available in time
+        """
+        started = time.perf_counter()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Driver pool is closed")
+            if not self._condition.wait_for(
+                    lambda: self._idle or len(self._leased) + self._starting < self.max_size, timeout):
+                raise TimeoutError(f"No WebDriver session available after {timeout}s")
+            session = self._idle.pop() if self._idle else None
+            if session is None:
+                # Reserve the slot, then start the browser outside the lock
+                self._starting += 1
+        if session is None:
+            try:
+                session = _Session(self.driver_factory())
+            finally:
+                with self._condition:
+                    self._starting -= 1
+                    self._condition.notify()
+            with self._condition:
+                self._stats['sessions_created'] += 1
+        waited = time.perf_counter() - started
+        with self._condition:
+            session.uses += 1
+            self._leased[id(session.driver)] = session
+            self._stats['leases'] += 1
+            self._stats['reused_leases'] += session.uses > 1
+            self._stats['lease_wait_seconds'] += waited
+            self._stats['max_lease_wait_seconds'] = max(self._stats['max_lease_wait_seconds'], waited)
+        return session.driver
+
+    def release(self, driver, broken: bool = False):
+        """
+        Return a leased session to the pool
+
+        Args:
+            driver: The leased WebDriver
+            broken (bool): Quit the session instead of reusing it, e.g. after a browser crash
+        """
+        with self._condition:
+            session = self._leased.pop(id(driver), None)
+        if session is None:
+            return
+        recycle = broken or self._closed or session.uses >= self.max_uses or not self._reset(driver)
+        if recycle:
+            self._quit(driver)
+        with self._condition:
+            if recycle:
+                self._stats['sessions_recycled'] += 1
+            else:
+                self._idle.append(session)
+            self._condition.notify()
+
+    def metrics(self) -> Dict:
+        """Lease counts, session reuse ratio and lease wait times"""
+        with self._condition:
+            stats = dict(self._stats)
+        leases = stats['leases']
+        stats['reuse_ratio'] = stats['reused_leases'] / leases if leases else 0.0
+        stats['average_lease_wait_seconds'] = stats['lease_wait_seconds'] / leases if leases else 0.0
+        return stats
+
+    def close(self, report: bool = True):
+        """Quit idle sessions; sessions still leased are quit when released"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for session in idle:
+            self._quit(session.driver)
+        metrics = self.metrics()
+        if report and metrics['leases']:
+            print(f"Driver pool: {metrics['leases']} leases, {metrics['sessions_created']} sessions started, "
+                  f"reuse ratio {metrics['reuse_ratio']:.0%}, average lease wait "
+                  f"{metrics['average_lease_wait_seconds']:.2f}s (max {metrics['max_lease_wait_seconds']:.2f}s)")
+
+    def _reset(self, driver) -> bool:
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            try:
+                driver.execute_script(CLEAR_STORAGE_SCRIPT)
+            except WebDriverException:
+                pass  # about:blank, data: URLs and error pages have no storage
+            if hasattr(driver, 'execute_cdp_cmd'):
+                # Chromium clears cookies for every domain, not just the current one
+                driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            else:
+                driver.delete_all_cookies()
+            driver.get('about:blank')
+            return True
+        except Exception as e:
+            print(f"Recycling WebDriver session after failed reset: {str(e)}")
+            return False
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Error quitting WebDriver session: {str(e)}")
+
+
+_pool: Optional[DriverPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool() -> DriverPool:
+    """The process-wide pool used by generated tests, closed at interpreter exit"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool.from_env()
+            atexit.register(_pool.close)
+        return _pool
@@ -0,0 +1,119 @@
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Optional
+
+try:
+    from webdriver_manager.chrome import ChromeDriverManager
+except ImportError:  # optional: fall back to PATH / Selenium Manager
+    ChromeDriverManager = None
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'crewai', 'chromedriver.json')
+# Chrome updates itself, so a resolved driver is re-checked once a day
+DEFAULT_CACHE_TTL_SECONDS = 24 * 60 * 60
+# A lock older than this belongs to a process that died while resolving
+STALE_LOCK_SECONDS = 300
+
+_resolved = {}
+_resolved_lock = threading.Lock()
+
+
+def resolve_chromedriver() -> Optional[str]:
+    """
+    Resolve the chromedriver binary once per process, and once per machine
+
+    Resolution order: the CHROMEDRIVER_PATH pin, this process's earlier
+    result, the machine-wide cache file (CHROMEDRIVER_CACHE_PATH, valid for
+    CHROMEDRIVER_CACHE_TTL_SECONDS), then webdriver-manager and finally
+    chromedriver on PATH. Only one process at a time resolves and writes
+    the machine cache; the others wait for its result.
+
+    Returns:
+        Optional[str]: Path to chromedriver, or None to let Selenium Manager locate it
+
+    Raises:
+        FileNotFoundError: If CHROMEDRIVER_PATH is set but does not exist
+    """
+    pinned = os.getenv('CHROMEDRIVER_PATH')
+    if pinned:
+        if not os.path.isfile(pinned):
+            raise FileNotFoundError(f"CHROMEDRIVER_PATH does not exist: {pinned}")
+        return pinned
+
+    with _resolved_lock:
+        if 'path' not in _resolved:
+            _resolved['path'] = _resolve_with_machine_cache(
+                os.getenv('CHROMEDRIVER_CACHE_PATH', DEFAULT_CACHE_PATH),
+                int(os.getenv('CHROMEDRIVER_CACHE_TTL_SECONDS', str(DEFAULT_CACHE_TTL_SECONDS)))
+            )
+        return _resolved['path']
+
+
+def _resolve_with_machine_cache(cache_path: str, ttl_seconds: int) -> Optional[str]:
+    cached = _read_cache(cache_path, ttl_seconds)
+    if cached:
+        return cached
+    os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+    with _FileLock(f"{cache_path}.lock"):
+        # Another process may have resolved it while we waited for the lock
+        cached = _read_cache(cache_path, ttl_seconds)
+        if cached:
+            return cached
+        path = _download_or_locate()
+        if path:
+            temp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump({'path': path, 'resolved_at': time.time()}, f)
+            os.replace(temp_path, cache_path)
+        return path
+
+
+def _read_cache(cache_path: str, ttl_seconds: int) -> Optional[str]:
+    try:
+        with open(cache_path) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - entry.get('resolved_at', 0) > ttl_seconds or not os.path.isfile(entry.get('path', '')):
+        return None
+    return entry['path']
+
+
+def _download_or_locate() -> Optional[str]:
+    if ChromeDriverManager is not None:
+        try:
+            return ChromeDriverManager().install()
+        except Exception as e:
+            # Air-gapped runners cannot reach the driver download site
+            print(f"ChromeDriverManager failed, looking for chromedriver on PATH: {str(e)}")
+    return shutil.which('chromedriver')
+
+
+class _FileLock:
+    """Cross-process lock held by exclusively creating a lock file"""
+
+    def __init__(self, path: str, poll_interval: float = 0.1):
+        self.path = path
+        self.poll_interval = poll_interval
+
+    def __enter__(self):
+        while True:
+            try:
+                os.close(os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.path) > STALE_LOCK_SECONDS:
+                        os.remove(self.path)
+                        continue
+                except OSError:
+                    continue
+                time.sleep(self.poll_interval)
+
+    def __exit__(self, *exc_info):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
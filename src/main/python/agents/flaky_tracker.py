@@ -0,0 +1,110 @@
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+DEFAULT_HISTORY_PATH = os.path.join('.crewai_cache', 'test_history.db')
+
+# One character per run, oldest first
+PASSED = 'P'
+FAILED = 'F'
+FLAKY = 'K'  # failed, then passed on retry
+
+
+class FlakyTracker:
+    """
+    Per-test outcome history and the quarantine derived from it.
+
+    Each run appends P (passed), F (failed) or K (failed, then passed on a
+    retry) to the test's history, keeping the last `window` runs. A test's
+    flake rate is the share of those runs that were K, plus a run that
+    changed outcome from the previous one without a retry (P after F or F
+    after P). Tests with at least min_runs runs and a flake rate at or above
+    threshold are quarantined.
+    """
+
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH, window: int = 20, threshold: float = 0.2,
+                 min_runs: int = 5):
+        self.path = path
+        self.window = window
+        self.threshold = threshold
+        self.min_runs = min_runs
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS test_history (
+                test_id TEXT PRIMARY KEY,
+                outcomes TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+
+    @classmethod
+    def from_env(cls) -> 'FlakyTracker':
+        return cls(
+            path=os.getenv('TEST_HISTORY_PATH', DEFAULT_HISTORY_PATH),
+            window=int(os.getenv('FLAKE_WINDOW', '20')),
+            threshold=float(os.getenv('FLAKE_QUARANTINE_THRESHOLD', '0.2')),
+            min_runs=int(os.getenv('FLAKE_MIN_RUNS', '5'))
+        )
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def flake_rate(self, outcomes: str) -> float:
+        if not outcomes:
+            return 0.0
+        flaky = sum(1 for outcome in outcomes if outcome == FLAKY)
+        flips = sum(1 for previous, current in zip(outcomes, outcomes[1:])
+                    if {previous, current} == {PASSED, FAILED})
+        return (flaky + flips) / len(outcomes)
+
+    def quarantined(self) -> Set[str]:
+        """Test ids whose flake rate is at or above the threshold"""
+        rows = self.connection.execute("SELECT test_id, outcomes FROM test_history").fetchall()
+        return {
+            test_id for test_id, outcomes in rows
+            if len(outcomes) >= self.min_runs and self.flake_rate(outcomes) >= self.threshold
+        }
+
+    def stats(self) -> Dict[str, Tuple[int, float]]:
+        """Runs and flake rate by test id"""
+        rows = self.connection.execute("SELECT test_id, outcomes FROM test_history").fetchall()
+        return {test_id: (len(outcomes), self.flake_rate(outcomes)) for test_id, outcomes in rows}
+
+    def record(self, outcomes: Iterable[Tuple[str, str]]):
+        """
+        Append one run's outcomes
+
+        Args:
+            outcomes (Iterable[Tuple[str, str]]): (test id, PASSED / FAILED / FLAKY) pairs
+        """
+        now = datetime.now().isoformat()
+        with self.connection:
+            for test_id, outcome in outcomes:
+                row = self.connection.execute(
+                    "SELECT outcomes FROM test_history WHERE test_id = ?", (test_id,)
+                ).fetchone()
+                history = ((row[0] if row else '') + outcome)[-self.window:]
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO test_history (test_id, outcomes, updated_at) VALUES (?, ?, ?)",
+                    (test_id, history, now)
+                )
+
+
+def run_outcome(test_case: Dict) -> Optional[str]:
+    """History outcome of an executed test case, None for skips and non-test failures"""
+    if '.' not in (test_case.get('test') or ''):
+        return None
+    if test_case['status'] == 'PASSED':
+        return FLAKY if test_case.get('attempts', 1) > 1 else PASSED
+    if test_case['status'] == 'FAILED':
+        return FAILED
+    return None
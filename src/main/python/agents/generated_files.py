@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Iterable, Optional, Set
+
+DEFAULT_MANIFEST_PATH = os.path.join('.crewai_cache', 'generation_manifest.json')
+
+
+def content_digest(content: str) -> str:
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def atomic_write(path: str, content: str):
+    """Write through a temp file in the target directory and rename it into place"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        # mkstemp creates 0600; keep the mode of the file being replaced
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def generated_requirement_ids(manifest_path: Optional[str] = None) -> Set[str]:
+    """
+    Requirement ids that have generated files recorded, across all namespaces
+
+    Args:
+        manifest_path (Optional[str]): Manifest to read; defaults to GENERATION_MANIFEST_PATH
+
+    Returns:
+        Set[str]: Requirement ids (as strings)
+    """
+    path = manifest_path or os.getenv('GENERATION_MANIFEST_PATH', DEFAULT_MANIFEST_PATH)
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return set()
+    return {entry['requirement_id'] for entries in manifest.values()
+            for entry in entries.values() if 'requirement_id' in entry}
+
+
+class GeneratedFileWriter:
+    """
+    Writes rendered files only when their content changed.
+
+    The manifest records the content hash, size and mtime of every file a
+    generator wrote, under the generator's namespace. A file whose rendered
+    hash matches the manifest and whose size and mtime are unchanged on disk
+    is left alone, so unchanged output keeps its mtime (and __pycache__ and
+    anything keyed on file changes stays valid). A file edited by hand since
+    the last run is re-hashed and rewritten if it differs.
+
+    Entries also record the requirement each file was generated for. A run
+    may cover only some requirements (incremental sync, a failed fetch), so
+    files it did not render are kept; prune() deletes only the files of
+    requirement ids the caller knows were removed.
+    """
+
+    def __init__(self, namespace: str, manifest_path: str = DEFAULT_MANIFEST_PATH, incremental: bool = True):
+        self.namespace = namespace
+        self.manifest_path = manifest_path
+        # False rewrites every file, as before incremental generation
+        self.incremental = incremental
+        try:
+            with open(manifest_path) as f:
+                self.manifest: Dict[str, Dict[str, Dict]] = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.manifest = {}
+        self.previous: Dict[str, Dict] = self.manifest.get(namespace, {})
+        # Files not rendered in this run stay recorded until prune() removes them
+        self.current: Dict[str, Dict] = dict(self.previous)
+        self._rendered: Set[str] = set()
+        self.stats = {'written': 0, 'unchanged': 0, 'pruned': 0}
+        # write() may be called from several writer threads
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, namespace: str) -> 'GeneratedFileWriter':
+        return cls(
+            namespace,
+            manifest_path=os.getenv('GENERATION_MANIFEST_PATH', DEFAULT_MANIFEST_PATH),
+            incremental=os.getenv('INCREMENTAL_GENERATION', 'true').lower() == 'true'
+        )
+
+    def write(self, path: str, content: str, requirement_id=None) -> bool:
+        """
+        Write a rendered file unless it is already up to date
+
+        Args:
+            path (str): Target file path
+            content (str): Rendered content
+            requirement_id: Requirement the file was generated for, used by prune()
+
+        Returns:
+            bool: True if the file was written
+        """
+        path = os.path.normpath(path)
+        digest = content_digest(content)
+        written = not (self.incremental and self._up_to_date(path, digest))
+        if written:
+            atomic_write(path, content)
+        stat = os.stat(path)
+        entry = {'sha256': digest, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        if requirement_id is not None:
+            entry['requirement_id'] = str(requirement_id)
+        with self._lock:
+            self.current[path] = entry
+            self._rendered.add(path)
+            self.stats['written' if written else 'unchanged'] += 1
+        return written
+
+    def prune(self, removed_ids: Optional[Iterable] = None):
+        """
+        Delete the generated files of removed requirements
+
+        Args:
+            removed_ids (Optional[Iterable]): Requirement ids known to be deleted
+                or closed; files of any other requirement are never pruned
+        """
+        removed = {str(requirement_id) for requirement_id in removed_ids or ()}
+        if not removed:
+            return
+        for path, entry in sorted(self.current.items()):
+            if entry.get('requirement_id') not in removed or path in self._rendered:
+                continue
+            try:
+                os.remove(path)
+                self.stats['pruned'] += 1
+            except FileNotFoundError:
+                pass
+            del self.current[path]
+
+    def save(self):
+        """Atomically store this run's entries as the namespace's manifest"""
+        # Re-read so namespaces saved by other writers since __init__ are kept
+        try:
+            with open(self.manifest_path) as f:
+                self.manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            pass
+        self.manifest[self.namespace] = self.current
+        atomic_write(self.manifest_path, json.dumps(self.manifest, indent=2, sort_keys=True))
+
+    def _up_to_date(self, path: str, digest: str) -> bool:
+        entry = self.previous.get(path)
+        if entry is None or entry['sha256'] != digest:
+            return False
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return False
+        if stat.st_size == entry['size'] and stat.st_mtime_ns == entry['mtime_ns']:
+            return True
+        # Touched since the last run; only the content decides
+        with open(path, encoding='utf-8') as f:
+            return content_digest(f.read()) == digest
@@ -0,0 +1,202 @@
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from agents.code_templates import (java_action_text, render_java_page_object, render_java_test_class,
+                                   render_python_page_object, render_python_test_class)
+from agents.generated_files import GeneratedFileWriter
+
+LANGUAGES = ('python', 'java')
+
+
+def render_scenario(scenario: Dict, languages: Sequence[str], locator: Optional[Dict] = None) -> Dict:
+    """
+    Render every artifact of one scenario, capturing its error instead of raising
+
+    Returns:
+        Dict: requirement_id, requirement_title, files ((language, path, content)
+            tuples, sorted by path) and error
+    """
+    result = {
+        'requirement_id': scenario.get('requirement_id'),
+        'requirement_title': scenario.get('requirement_title'),
+        'files': [],
+        'error': None
+    }
+    try:
+        files = []
+        if 'python' in languages:
+            files.append(('python',) + render_python_page_object(scenario))
+            files.append(('python',) + render_python_test_class(scenario))
+        if 'java' in languages:
+            files.append(('java',) + render_java_page_object(scenario, locator))
+            files.append(('java',) + render_java_test_class(scenario))
+        result['files'] = sorted(files, key=lambda file: file[1])
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {str(e)}"
+    return result
+
+
+def _render_chunk(chunk: List[Tuple[Dict, Optional[Dict]]], languages: Sequence[str]) -> List[Dict]:
+    """Process pool entry point; renders a chunk of (scenario, locator) pairs in order"""
+    return [render_scenario(scenario, languages, locator) for scenario, locator in chunk]
+
+
+class GenerationEngine:
+    """
+    Renders Python and Java artifacts for many scenarios at once.
+
+    Rendering is CPU-bound and runs in a process pool over chunks of
+    scenarios; rendered files are handed to a thread pool in batches as each
+    chunk comes back, so disk writes overlap with rendering. Chunks are
+    consumed in input order and two scenarios rendering the same path are
+    resolved in favour of the first, so the output does not depend on how
+    the work was scheduled. A scenario that fails to render is reported with
+    its error; the rest are still written.
+
+    Scenarios given as an iterator rather than a list (e.g. straight from
+    RequirementsAnalyzer.analyze_requirements) are rendered one by one as
+    they are produced, so generation overlaps requirement analysis.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = 64, write_batch_size: int = 128,
+                 writer_threads: int = 4,
+                 locator_lookup: Optional[Callable[[Iterable[str]], Dict[str, Optional[Dict]]]] = None):
+        self.workers = workers or int(os.getenv('GENERATION_WORKERS', str(os.cpu_count() or 1)))
+        self.chunk_size = chunk_size
+        self.write_batch_size = write_batch_size
+        self.writer_threads = writer_threads
+        # Action texts -> Java locator field (or None) by action; defaults to one LocatorService session
+        self.locator_lookup = locator_lookup
+
+    def generate(self, test_scenarios: Iterable[Dict], languages: Sequence[str] = LANGUAGES,
+                 removed_ids: Optional[Iterable] = None) -> Dict:
+        """
+        Generate and write the artifacts of all scenarios
+
+        Args:
+            test_scenarios (Iterable[Dict]): Scenarios to generate code for; a list
+                is rendered in parallel chunks, any other iterable as it is produced
+            languages (Sequence[str]): 'python' and/or 'java'
+            removed_ids (Optional[Iterable]): Requirements removed from the backlog,
+                whose generated files are deleted; files of any other requirement
+                not in test_scenarios are kept. Read once every scenario is rendered
+
+        Returns:
+            Dict: 'scenarios' (per-scenario files and error, in input order),
+                'failed' and the written/unchanged/pruned counts per language
+        """
+        writers = {language: GeneratedFileWriter.from_env(language) for language in languages}
+        if isinstance(test_scenarios, list):
+            rendered = self._render_all(test_scenarios, languages)
+        else:
+            rendered = self._render_as_produced(test_scenarios, languages)
+
+        results = []
+        claimed: Dict[str, Optional[str]] = {}
+        with ThreadPoolExecutor(max_workers=self.writer_threads) as write_pool:
+            writes = []
+            batch: List[Tuple[str, str, str, Optional[str]]] = []
+            for result in rendered:
+                results.append(result)
+                if result['error'] is None:
+                    for language, path, content in result['files']:
+                        if path in claimed:
+                            result['error'] = f"{path} is already generated for {claimed[path]}"
+                            continue
+                        claimed[path] = result['requirement_title']
+                        batch.append((language, path, content, result['requirement_id']))
+                if len(batch) >= self.write_batch_size:
+                    writes.append(write_pool.submit(self._write_batch, writers, batch))
+                    batch = []
+                if result['error'] is not None:
+                    print(f"Error generating {result['requirement_title']}: {result['error']}")
+                # Results only carry paths; the rendered content has been queued for writing
+                result['files'] = [path for _, path, _ in result['files']]
+            if batch:
+                writes.append(write_pool.submit(self._write_batch, writers, batch))
+            for write in writes:
+                error = write.exception()
+                if error is not None:
+                    print(f"Error writing generated files: {str(error)}")
+        failed = sum(1 for result in results if result['error'] is not None)
+
+        summary = {'scenarios': results, 'failed': failed}
+        removed_ids = set(removed_ids or ())
+        for language, writer in writers.items():
+            writer.prune(removed_ids)
+            writer.save()
+            summary[language] = dict(writer.stats)
+            print(f"Generated {language} files: {writer.stats['written']} written, "
+                  f"{writer.stats['unchanged']} unchanged, {writer.stats['pruned']} pruned")
+        return summary
+
+    def _render_all(self, test_scenarios: List[Dict], languages: Sequence[str]) -> Iterable[Dict]:
+        """Render a complete list, with all of its Java locators looked up in one batch"""
+        actions = [self._action_text(scenario) for scenario in test_scenarios]
+        locators = self._lookup_locators({action for action in actions if action}) if 'java' in languages else {}
+        work = [(scenario, locators.get(action)) for scenario, action in zip(test_scenarios, actions)]
+        yield from self._render(work, languages)
+
+    def _render_as_produced(self, test_scenarios: Iterable[Dict], languages: Sequence[str]) -> Iterator[Dict]:
+        """Render each scenario in-process as soon as the iterator produces it"""
+        lookup = self.locator_lookup
+        service = None
+        if lookup is None and 'java' in languages:
+            # One browser session for every scenario of the run, as in a list lookup
+            from agents.java_test_generator import lookup_locators
+            from agents.locator_suggester import LocatorService
+            service = LocatorService(login_required=False)
+            lookup = lambda actions: lookup_locators(actions, service)
+        locators: Dict[str, Optional[Dict]] = {}
+        try:
+            for scenario in test_scenarios:
+                action = self._action_text(scenario) if 'java' in languages else None
+                if action and action not in locators:
+                    locators.update(self._lookup_locators({action}, lookup))
+                yield render_scenario(scenario, languages, locators.get(action))
+        finally:
+            if service is not None:
+                service.close()
+
+    def _render(self, work: List[Tuple[Dict, Optional[Dict]]], languages: Sequence[str]) -> Iterable[Dict]:
+        chunks = [work[start:start + self.chunk_size] for start in range(0, len(work), self.chunk_size)]
+        if self.workers <= 1 or len(chunks) <= 1:
+            # Not worth starting interpreters for a single chunk
+            for chunk in chunks:
+                yield from _render_chunk(chunk, languages)
+            return
+        pool_options = {'max_tasks_per_child': 64} if sys.version_info >= (3, 11) else {}
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(chunks)),
+                                 mp_context=multiprocessing.get_context('spawn'), **pool_options) as pool:
+            # map yields in submission order, whichever chunk finishes first
+            for rendered in pool.map(_render_chunk, chunks, [languages] * len(chunks)):
+                yield from rendered
+
+    @staticmethod
+    def _action_text(scenario: Dict) -> Optional[str]:
+        try:
+            return java_action_text(scenario)
+        except Exception:
+            # Malformed scenario; rendering reports the error for it
+            return None
+
+    def _lookup_locators(self, actions: Set[str], lookup: Optional[Callable] = None) -> Dict[str, Optional[Dict]]:
+        """Java locators by action text, all distinct actions in one batch"""
+        lookup = lookup or self.locator_lookup
+        if lookup is None:
+            # Imported here so render workers never load Selenium
+            from agents.java_test_generator import lookup_locators
+            lookup = lookup_locators
+        try:
+            return lookup(sorted(actions))
+        except Exception as e:
+            print(f"Error looking up locators: {str(e)}")
+            return {}
+
+    @staticmethod
+    def _write_batch(writers: Dict[str, GeneratedFileWriter], batch: List[Tuple[str, str, str, Optional[str]]]):
+        for language, path, content, requirement_id in batch:
+            writers[language].write(path, content, requirement_id=requirement_id)
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_MANIFEST_PATH = os.path.join('.crewai_cache', 'impact_manifest.json')
+PAGE_OBJECT_PATH = "src/main/python/pages/{name}_page.py"
+TEST_MODULE_PATH = "src/test/python/test_{name}.py"
+
+
+def _file_digest(path: str) -> Optional[str]:
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def requirement_digest(requirement: Dict) -> str:
+    """Hash of the requirement fields that drive generation"""
+    content = {field: requirement.get(field) for field in ('title', 'description', 'acceptance_criteria')}
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class ImpactAnalyzer:
+    """
+    Selects the scenarios whose tests can have changed since they last ran.
+
+    The manifest maps each requirement id to its test module and page object
+    and to a fingerprint of requirement content, page object and test module
+    as of its last execution. A scenario is run when its fingerprint
+    changed, when it has never run, when its last run had failures, or when
+    it is in the smoke set; everything else is skipped.
+    """
+
+    def __init__(self, path: str = DEFAULT_MANIFEST_PATH, smoke: Iterable[str] = ()):
+        self.path = path
+        # Requirement ids or test module names that always run
+        self.smoke = {str(entry).strip() for entry in smoke if str(entry).strip()}
+        try:
+            with open(path) as f:
+                self.manifest: Dict[str, Dict] = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.manifest = {}
+        self._fingerprints: Dict[str, Dict] = {}
+
+    @classmethod
+    def from_env(cls) -> Optional['ImpactAnalyzer']:
+        """The analyzer configured by the environment, or None when IMPACT_ANALYSIS is off"""
+        if os.getenv('IMPACT_ANALYSIS', 'false').lower() != 'true':
+            return None
+        return cls(
+            path=os.getenv('IMPACT_MANIFEST_PATH', DEFAULT_MANIFEST_PATH),
+            smoke=os.getenv('IMPACT_SMOKE_SET', '').split(',')
+        )
+
+    def select(self, test_scenarios: List[Dict], requirements: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Split scenarios into those to run and those unaffected by changes
+
+        Args:
+            test_scenarios (List[Dict]): Generated scenarios
+            requirements (List[Dict]): Requirements the scenarios were generated from
+
+        Returns:
+            Tuple[List[Dict], List[Dict]]: Scenarios to run, and skipped scenarios
+                as requirement_id/requirement_title/test_module entries
+        """
+        requirements_by_id = {str(requirement['id']): requirement for requirement in requirements}
+        selected, skipped = [], []
+        for scenario in test_scenarios:
+            requirement_id = str(scenario['requirement_id'])
+            fingerprint = self._fingerprint(scenario, requirements_by_id.get(requirement_id))
+            self._fingerprints[requirement_id] = fingerprint
+            previous = self.manifest.get(requirement_id)
+            if (requirement_id in self.smoke or fingerprint['test_module'] in self.smoke
+                    or previous is None or previous.get('failed_tests', 1) > 0
+                    or any(previous.get(key) != fingerprint[key] for key in fingerprint)):
+                selected.append(scenario)
+            else:
+                skipped.append({
+                    'requirement_id': scenario['requirement_id'],
+                    'requirement_title': scenario['requirement_title'],
+                    'test_module': fingerprint['test_module']
+                })
+        print(f"Impact analysis: running {len(selected)} of {len(test_scenarios)} scenarios, "
+              f"{len(skipped)} unaffected")
+        return selected, skipped
+
+    def record(self, results: Dict):
+        """
+        Store fingerprints and outcomes of the executed scenarios and save the manifest
+
+        Args:
+            results (Dict): TestExecutor.execute_tests results
+        """
+        for scenario_result in results['scenario_results']:
+            requirement_id = str(scenario_result['requirement_id'])
+            fingerprint = self._fingerprints.get(requirement_id)
+            if fingerprint is None:
+                continue
+            self.manifest[requirement_id] = dict(
+                fingerprint,
+                passed_tests=scenario_result['passed_tests'],
+                failed_tests=scenario_result['failed_tests'],
+                executed_at=results['execution_time']
+            )
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+    def _fingerprint(self, scenario: Dict, requirement: Optional[Dict]) -> Dict:
+        name = scenario['requirement_title'].lower().replace(' ', '_')
+        page_object = PAGE_OBJECT_PATH.format(name=name)
+        test_module = TEST_MODULE_PATH.format(name=name)
+        return {
+            'test_module': f"test_{name}",
+            'page_object': page_object,
+            # Without the requirement, fall back to the scenario generated from it
+            'requirement_hash': requirement_digest(requirement) if requirement else hashlib.sha256(
+                json.dumps(scenario, sort_keys=True, default=str).encode('utf-8')).hexdigest(),
+            'page_object_hash': _file_digest(page_object),
+            'test_module_hash': _file_digest(test_module)
+        }
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+DEFAULT_CACHE_PATH = os.path.join('.crewai_cache', 'llm_responses.db')
+
+
+def cache_key(model: Optional[str], system_prompt: str, user_prompt: str, temperature: Optional[float]) -> str:
+    """
+    Content address of a completion request
+
+    Args:
+        model (Optional[str]): Model name
+        system_prompt (str): System message
+        user_prompt (str): User message
+        temperature (Optional[float]): Sampling temperature; None for the API default
+
+    Returns:
+        str: Hex SHA-256 of the request
+    """
+    payload = json.dumps([model, system_prompt, user_prompt, temperature], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Persistent SQLite cache of completion texts keyed by cache_key.
+
+    Entries older than ttl_seconds are treated as misses, and once the cache
+    holds more than max_entries the least recently used entries are evicted.
+    With bypass set, lookups always miss but fresh responses are still stored.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = 5000,
+                 ttl_seconds: float = 7 * 24 * 3600, bypass: bool = False):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.connection.commit()
+
+    @classmethod
+    def from_env(cls) -> 'LLMResponseCache':
+        """Build a cache configured by the LLM_CACHE_* environment variables"""
+        return cls(
+            path=os.getenv('LLM_CACHE_PATH', DEFAULT_CACHE_PATH),
+            max_entries=int(os.getenv('LLM_CACHE_MAX_ENTRIES', '5000')),
+            ttl_seconds=float(os.getenv('LLM_CACHE_TTL_SECONDS', str(7 * 24 * 3600))),
+            bypass=os.getenv('LLM_CACHE_BYPASS', 'false').lower() == 'true'
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss"""
+        with self._lock:
+            if self.bypass:
+                self.misses += 1
+                return None
+            now = time.time()
+            row = self.connection.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self.connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self.connection.commit()
+                self.misses += 1
+                return None
+            self.connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.connection.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, response: Optional[str]):
+        """Store a response and evict expired or least recently used entries; None is not stored"""
+        if response is None:
+            return
+        with self._lock:
+            now = time.time()
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, response, now, now)
+            )
+            self.connection.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+            self.connection.execute("""
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+            self.connection.commit()
+
+    def delete(self, key: str):
+        """Drop the entry for key, e.g. a response that turned out not to be usable"""
+        with self._lock:
+            self.connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.connection.commit()
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and the current entry count"""
+        with self._lock:
+            entries = self.connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries}
+
+    def close(self):
+        self.connection.close()
+
+
+def cached_execute_task(agent, prompt: str, cache: LLMResponseCache) -> str:
+    """
+    Run agent.execute_task through the response cache
+
+    The agent's role, goal and backstory stand in for the system prompt and
+    its llm supplies the model name and temperature.
+
+    Args:
+        agent: CrewAI agent
+        prompt (str): Task prompt
+        cache (LLMResponseCache): Cache to consult and fill
+
+    Returns:
+        str: The agent's (possibly cached) response
+    """
+    llm = getattr(agent, 'llm', None)
+    model = getattr(llm, 'model_name', None) or getattr(llm, 'model', None)
+    model = str(model) if model is not None else None
+    system_prompt = "\n".join(str(getattr(agent, attribute, '')) for attribute in ('role', 'goal', 'backstory'))
+    key = cache_key(model, system_prompt, prompt, getattr(llm, 'temperature', None))
+    response = cache.get(key)
+    if response is None:
+        response = str(agent.execute_task(prompt))
+        cache.set(key, response)
+    return response
@@ -1,47 +1,162 @@
 import os
+import sys
+from typing import Dict, Iterable, List, Optional
 from dotenv import load_dotenv
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 
-def suggest_locators(action_text, login_required=True):
-    load_dotenv()
-    url = os.getenv('TEST_WEBSITE_URL')
-    username = os.getenv('TEST_USERNAME', 'standard_user')
-    password = os.getenv('TEST_PASSWORD', 'secret_sauce')
-    driver = webdriver.Chrome()
-    driver.get(url)
+# Also run as a script, where agents/ is not importable by default
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from agents.browser_profile import create_driver, load_browser_profile
+from agents.dom_snapshot import DomSnapshot
 
-    # Perform login if required (example for saucedemo.com)
-    if login_required:
-        try:
-            driver.find_element(By.ID, 'user-name').send_keys(username)
-            driver.find_element(By.ID, 'password').send_keys(password)
-            driver.find_element(By.ID, 'login-button').click()
-            print(f"Logged in as {username}")
-        except Exception as e:
-            print(f"Login step failed: {e}")
+def find_locators(driver, action_text: str) -> List[Dict[str, str]]:
+    """
+    Locators for an action on the page the driver is showing, queried live
+
+    Costs a WebDriver round trip per element with an id; DomSnapshot answers
+    the same lookups from a single round trip.
 
-    print(f"Scanning {url} for action: '{action_text}'\n")
+    Args:
+        driver: WebDriver on the page to scan
+        action_text (str): Action such as 'Add to Cart'
 
+    Returns:
+        List[Dict[str, str]]: by ('XPATH' or 'ID'), value and match ('exact',
+            'partial' or 'id'), best first
+    """
+    locators = []
     # Try to find by exact button text
-    try:
-        button = driver.find_element(By.XPATH, f"//button[text()='{action_text}']")
-        print(f"Suggested locator: By.XPATH, \"//button[text()='{action_text}']\"")
-    except:
-        print("No button found with exact text.")
+    exact = f"//button[text()='{action_text}']"
+    if driver.find_elements(By.XPATH, exact):
+        locators.append({'by': 'XPATH', 'value': exact, 'match': 'exact'})
 
     # Try to find by partial match
-    buttons = driver.find_elements(By.XPATH, f"//button[contains(text(), '{action_text}')]")
-    for btn in buttons:
-        print(f"Suggested locator: By.XPATH, \"//button[contains(text(), '{action_text}')]\"")
+    partial = f"//button[contains(text(), '{action_text}')]"
+    for _ in driver.find_elements(By.XPATH, partial):
+        locators.append({'by': 'XPATH', 'value': partial, 'match': 'partial'})
 
     # Try to find by id
-    elements = driver.find_elements(By.XPATH, f"//*[@id]")
-    for el in elements:
-        if action_text.lower() in el.get_attribute("id").lower():
-            print(f"Suggested locator: By.ID, \"{el.get_attribute('id')}\"")
+    for element in driver.find_elements(By.XPATH, "//*[@id]"):
+        element_id = element.get_attribute("id")
+        if action_text.lower() in element_id.lower():
+            locators.append({'by': 'ID', 'value': element_id, 'match': 'id'})
+    return locators
+
+
+class LocatorService:
+    """
+    One browser session that answers locator lookups for a whole generation run.
+
+    The browser is started, pointed at TEST_WEBSITE_URL and (optionally)
+    logged in on first use, then every batch of action texts is looked up on
+    that page. In snapshot mode (LOCATOR_SNAPSHOT, on by default) each batch
+    takes one DomSnapshot and answers every action from its indexes;
+    otherwise elements are queried live, with the implicit wait dropped since
+    the page has already loaded. A session that dies is restarted once per
+    batch.
+    """
+
+    def __init__(self, url: Optional[str] = None, login_required: bool = True, driver_factory=None,
+                 snapshot: Optional[bool] = None):
+        load_dotenv()
+        self.url = url or os.getenv('TEST_WEBSITE_URL')
+        self.login_required = login_required
+        if snapshot is None:
+            snapshot = os.getenv('LOCATOR_SNAPSHOT', 'true').lower() == 'true'
+        self.snapshot = snapshot
+        self.driver_factory = driver_factory or (lambda: create_driver(load_browser_profile()))
+        self.driver = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def lookup(self, action_texts: Iterable[str]) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Look up a batch of actions in the shared session
+
+        Args:
+            action_texts (Iterable[str]): Actions to find locators for
 
-    driver.quit()
+        Returns:
+            Dict[str, List[Dict[str, str]]]: Locators by action text, best first;
+                empty for actions with no match or when the browser is unavailable
+        """
+        action_texts = list(dict.fromkeys(action_texts))
+        results = {action_text: [] for action_text in action_texts}
+        for _ in range(2):
+            try:
+                driver = self._session()
+                snapshot = self._snapshot(driver) if self.snapshot else None
+                for action_text in action_texts:
+                    if snapshot is not None:
+                        results[action_text] = snapshot.find(action_text)
+                    else:
+                        results[action_text] = find_locators(driver, action_text)
+                return results
+            except Exception as e:
+                print(f"Locator session failed: {str(e).splitlines()[0] if str(e) else e}")
+                self.close()
+        return results
+
+    def best(self, action_text: str) -> Optional[Dict[str, str]]:
+        locators = self.lookup([action_text])[action_text]
+        return locators[0] if locators else None
+
+    def close(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+
+    def _snapshot(self, driver) -> Optional[DomSnapshot]:
+        try:
+            return DomSnapshot.capture(driver)
+        except Exception as e:
+            # e.g. scripts disabled; fall back to live queries
+            print(f"DOM snapshot failed, querying elements live: {str(e).splitlines()[0] if str(e) else e}")
+            return None
+
+    def _session(self):
+        if self.driver is None:
+            driver = self.driver_factory()
+            try:
+                driver.get(self.url)
+                if self.login_required:
+                    login(driver)
+                driver.implicitly_wait(0)
+            except Exception:
+                driver.quit()
+                raise
+            self.driver = driver
+        return self.driver
+
+
+def login(driver):
+    """Log in with TEST_USERNAME / TEST_PASSWORD (the saucedemo.com login form)"""
+    username = os.getenv('TEST_USERNAME', 'standard_user')
+    password = os.getenv('TEST_PASSWORD', 'secret_sauce')
+    try:
+        driver.find_element(By.ID, 'user-name').send_keys(username)
+        driver.find_element(By.ID, 'password').send_keys(password)
+        driver.find_element(By.ID, 'login-button').click()
+        print(f"Logged in as {username}")
+    except Exception as e:
+        print(f"Login step failed: {e}")
+
+
+def suggest_locators(action_text, login_required=True):
+    with LocatorService(login_required=login_required) as service:
+        print(f"Scanning {service.url} for action: '{action_text}'\n")
+        locators = service.lookup([action_text])[action_text]
+    if not any(locator['match'] == 'exact' for locator in locators):
+        print("No button found with exact text.")
+    for locator in locators:
+        print(f"Suggested locator: By.{locator['by']}, \"{locator['value']}\"")
 
 # Example usage:
 if __name__ == "__main__":
@@ -0,0 +1,167 @@
+import html
+import re
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional
+
+from agents.rate_limiter import estimate_tokens
+
+try:
+    import tiktoken
+except ImportError:  # optional: fall back to the character-based estimate
+    tiktoken = None
+
+REQUIREMENT_MARKER = "=== Requirement {id} ==="
+REQUIREMENT_MARKER_PATTERN = re.compile(r"^[#*\s]*=+\s*Requirement\s+(\S+?)\s*=+[*\s]*$", re.MULTILINE)
+
+_BLOCK_TAGS = {'p', 'div', 'br', 'li', 'ul', 'ol', 'tr', 'table', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _BLOCK_TAGS:
+            self.parts.append('\n')
+        if tag == 'li':
+            self.parts.append('- ')
+
+    def handle_endtag(self, tag):
+        if tag in _BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+def strip_html(text: Optional[str]) -> str:
+    """
+    Reduce the HTML Azure DevOps stores in rich-text fields to plain text
+
+    Args:
+        text (Optional[str]): Field value, possibly HTML
+
+    Returns:
+        str: Text with tags removed, entities decoded and blank runs collapsed
+    """
+    if not text:
+        return ''
+    if '<' not in text:
+        return html.unescape(text).strip()
+    extractor = _TextExtractor()
+    extractor.feed(text)
+    extractor.close()
+    lines = (re.sub(r'[ \t\xa0]+', ' ', line).strip() for line in ''.join(extractor.parts).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+class TokenCounter:
+    """
+    Counts tokens locally with tiktoken when it is installed and its encoding
+    can be loaded, otherwise with the same four-characters-per-token estimate
+    the rate limiter uses.
+    """
+
+    def __init__(self, model: str):
+        self.encoding = None
+        if tiktoken is not None:
+            try:
+                try:
+                    self.encoding = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    self.encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                # tiktoken downloads its BPE files on first use, which fails offline
+                print(f"Token encoding unavailable, estimating token counts: {str(e)}")
+
+    def count(self, text: str) -> int:
+        if self.encoding is None:
+            return estimate_tokens(text)
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+
+def render_requirement(requirement: Dict) -> str:
+    """Render one requirement block of a packed prompt, HTML stripped"""
+    return (
+        f"{REQUIREMENT_MARKER.format(id=requirement['id'])}\n"
+        f"Title: {requirement['title']}\n"
+        f"Description: {strip_html(requirement.get('description'))}\n"
+        f"Acceptance Criteria: {strip_html(requirement.get('acceptance_criteria'))}\n"
+    )
+
+
+def plain_requirement(requirement: Dict) -> Dict:
+    """Copy of a requirement with the HTML stripped from its rich-text fields"""
+    return dict(
+        requirement,
+        description=strip_html(requirement.get('description')),
+        acceptance_criteria=strip_html(requirement.get('acceptance_criteria'))
+    )
+
+
+def pack_requirements(requirements: List[Dict], budget: int, cost: Callable[[Dict], int],
+                      max_group_size: Optional[int] = None) -> List[List[Dict]]:
+    """
+    Bin-pack requirements into groups whose total cost fits the budget
+
+    First-fit decreasing: the most expensive requirements are placed first,
+    each into the first group with room left. A requirement that exceeds the
+    budget on its own gets a group to itself. Requirements keep their input
+    order within each group.
+
+    Args:
+        requirements (List[Dict]): Requirements to pack
+        budget (int): Prompt token budget per group
+        cost (Callable[[Dict], int]): Prompt tokens a requirement consumes
+        max_group_size (Optional[int]): Most requirements per group, e.g. as many
+            expected completions as fit the model's output limit
+
+    Returns:
+        List[List[Dict]]: Groups of requirements
+    """
+    costs = [cost(requirement) for requirement in requirements]
+    order = sorted(range(len(requirements)), key=lambda index: -costs[index])
+    groups: List[List[int]] = []
+    remaining: List[int] = []
+    for index in order:
+        for group_index, room in enumerate(remaining):
+            if costs[index] <= room and (max_group_size is None or len(groups[group_index]) < max_group_size):
+                groups[group_index].append(index)
+                remaining[group_index] -= costs[index]
+                break
+        else:
+            groups.append([index])
+            remaining.append(budget - costs[index])
+    groups.sort(key=min)
+    return [[requirements[index] for index in sorted(group)] for group in groups]
+
+
+def demultiplex(content: str, requirement_ids: List, truncated: bool = False) -> Dict[str, str]:
+    """
+    Split a packed completion back into one section per requirement
+
+    Args:
+        content (str): Completion text with REQUIREMENT_MARKER headers
+        requirement_ids (List): Ids that were packed into the prompt
+        truncated (bool): The completion hit the output limit; only sections
+            closed by a following marker are kept
+
+    Returns:
+        Dict[str, str]: Section text by str(requirement id); ids the model skipped are absent
+    """
+    wanted = {str(requirement_id) for requirement_id in requirement_ids}
+    sections: Dict[str, str] = {}
+    markers = list(REQUIREMENT_MARKER_PATTERN.finditer(content))
+    closed = markers
+    if truncated and markers:
+        # The last section may stop mid test case; drop its requirement altogether
+        closed = markers[:-1]
+        wanted.discard(markers[-1].group(1))
+    for position, marker in enumerate(closed):
+        requirement_id = marker.group(1)
+        if requirement_id not in wanted:
+            continue
+        end = markers[position + 1].start() if position + 1 < len(markers) else len(content)
+        sections[requirement_id] = sections.get(requirement_id, '') + content[marker.end():end]
+    return sections
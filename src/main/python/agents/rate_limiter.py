@@ -0,0 +1,76 @@
+import asyncio
+import time
+from typing import Optional
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (about four characters per token) used for rate limiting"""
+    return max(1, len(text) // 4)
+
+
+class AsyncRateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limiter for asyncio callers.
+
+    Both limits are continuously refilled token buckets holding at most one
+    minute of budget; a limit of None disables that bucket.
+    """
+
+    def __init__(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._request_budget = float(requests_per_minute or 0)
+        self._token_budget = float(tokens_per_minute or 0)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int = 0):
+        """
+        Wait until one request carrying the given number of tokens may be sent
+
+        Args:
+            tokens (int): Estimated prompt plus completion tokens for the request
+        """
+        async with self._lock:
+            if self.tokens_per_minute:
+                # A single request larger than the whole budget can never fit otherwise
+                tokens = min(tokens, self.tokens_per_minute)
+            while True:
+                self._refill()
+                request_wait = self._wait_time(self._request_budget, 1, self.requests_per_minute)
+                token_wait = self._wait_time(self._token_budget, tokens, self.tokens_per_minute)
+                wait = max(request_wait, token_wait)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            if self.requests_per_minute:
+                self._request_budget -= 1
+            if self.tokens_per_minute:
+                self._token_budget -= tokens
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]):
+        """
+        Correct the token bucket once the real usage of a request is known
+
+        Args:
+            estimated_tokens (int): Tokens passed to acquire for the request
+            actual_tokens (Optional[int]): Total tokens reported by the API, if any
+        """
+        if self.tokens_per_minute and actual_tokens is not None:
+            self._token_budget -= actual_tokens - estimated_tokens
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed_minutes = (now - self._updated) / 60
+        self._updated = now
+        if self.requests_per_minute:
+            self._request_budget = min(self.requests_per_minute,
+                                       self._request_budget + elapsed_minutes * self.requests_per_minute)
+        if self.tokens_per_minute:
+            self._token_budget = min(self.tokens_per_minute,
+                                     self._token_budget + elapsed_minutes * self.tokens_per_minute)
+
+    def _wait_time(self, budget: float, needed: int, per_minute: Optional[int]) -> float:
+        if not per_minute or budget >= needed:
+            return 0
+        return (needed - budget) / per_minute * 60
@@ -0,0 +1,429 @@
+"""
+Record/replay stand-ins for OpenAI chat completions and the Azure DevOps work
+item tracking client, so the pipeline can run offline and deterministically.
+
+PIPELINE_REPLAY_MODE=record calls the real services and writes every response
+to PIPELINE_FIXTURES_DIR; PIPELINE_REPLAY_MODE=replay serves those fixtures
+instead, with REPLAY_LATENCY_SECONDS of injected latency and REPLAY_ERROR_RATE
+of injected failures (seeded by REPLAY_SEED).
+
+Clients the pipeline does not construct itself (e.g. the legacy crew's
+ChatOpenAI) can be pointed at the HTTP stand-in via OPENAI_BASE_URL:
+
+    python src/main/python/agents/replay.py serve --port 8765
+"""
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_FIXTURES_DIR = os.path.join('src', 'test', 'resources', 'replay')
+
+# Request fields that determine a completion; transport options such as stream are ignored
+_COMPLETION_KEY_FIELDS = ('model', 'messages', 'temperature', 'tools', 'tool_choice', 'response_format')
+
+
+class FixtureNotFoundError(LookupError):
+    """Raised in replay mode when no fixture was recorded for a request"""
+
+
+class InjectedReplayError(RuntimeError):
+    """Raised by the stand-ins to simulate a transient service failure"""
+
+
+class ReplayStore:
+    """
+    Fixture files keyed by a hash of the normalized request, plus the latency
+    and error injection applied when serving them.
+    """
+
+    def __init__(self, mode: str, fixtures_dir: str = DEFAULT_FIXTURES_DIR, latency: float = 0.0,
+                 error_rate: float = 0.0, seed: Optional[int] = None):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown replay mode: {mode}")
+        self.mode = mode
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional['ReplayStore']:
+        """Build the store configured by the environment, or None when replay is off"""
+        mode = os.getenv('PIPELINE_REPLAY_MODE', '').lower()
+        if mode not in ('record', 'replay'):
+            return None
+        seed = os.getenv('REPLAY_SEED')
+        return cls(
+            mode=mode,
+            fixtures_dir=os.getenv('PIPELINE_FIXTURES_DIR', DEFAULT_FIXTURES_DIR),
+            latency=float(os.getenv('REPLAY_LATENCY_SECONDS', '0')),
+            error_rate=float(os.getenv('REPLAY_ERROR_RATE', '0')),
+            seed=int(seed) if seed else None
+        )
+
+    def key(self, namespace: str, request: Any) -> str:
+        payload = json.dumps([namespace, request], sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def load(self, namespace: str, request: Any) -> Any:
+        """Return the recorded response for request, raising FixtureNotFoundError if absent"""
+        path = self._path(namespace, request)
+        try:
+            with open(path) as f:
+                return json.load(f)['response']
+        except FileNotFoundError:
+            raise FixtureNotFoundError(f"No {namespace} fixture recorded for request {self.key(namespace, request)}")
+
+    def save(self, namespace: str, request: Any, response: Any):
+        path = self._path(namespace, request)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({'request': request, 'response': response}, f, indent=2, sort_keys=True, default=str)
+        os.replace(temp_path, path)
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self.error_rate > 0 and self._random.random() < self.error_rate
+
+    def call(self, namespace: str, request: Any, perform: Callable[[], Any]) -> Any:
+        """
+        Serve request from its fixture (replay) or perform and record it (record)
+
+        Args:
+            namespace (str): Fixture namespace, e.g. 'openai.chat' or 'wit.get_work_items'
+            request (Any): JSON-serializable request description used as the key
+            perform (Callable[[], Any]): Makes the real call and returns a JSON-serializable response
+        """
+        if self.mode == 'record':
+            response = perform()
+            self.save(namespace, request, response)
+            return response
+        time.sleep(self.latency)
+        if self.should_fail():
+            raise InjectedReplayError(f"Injected failure for {namespace}")
+        return self.load(namespace, request)
+
+    async def call_async(self, namespace: str, request: Any, perform) -> Any:
+        """Async counterpart of call; perform is a coroutine function"""
+        if self.mode == 'record':
+            response = await perform()
+            self.save(namespace, request, response)
+            return response
+        await asyncio.sleep(self.latency)
+        if self.should_fail():
+            raise InjectedReplayError(f"Injected failure for {namespace}")
+        return self.load(namespace, request)
+
+    def _path(self, namespace: str, request: Any) -> str:
+        return os.path.join(self.fixtures_dir, namespace, f"{self.key(namespace, request)}.json")
+
+
+def completion_request(request: Dict) -> Dict:
+    """Normalize chat completion arguments into the fixture key"""
+    return {field: request[field] for field in _COMPLETION_KEY_FIELDS if request.get(field) is not None}
+
+
+def _completion_from_dict(data: Dict):
+    from openai.types.chat import ChatCompletion
+    return ChatCompletion.model_validate(data)
+
+
+def _chunks_from_dict(data: Dict, chunk_size: int = 64):
+    """Re-stream a recorded completion as chat.completion.chunk objects"""
+    from openai.types.chat import ChatCompletionChunk
+    content = data['choices'][0]['message'].get('content') or ''
+    for start in range(0, max(len(content), 1), chunk_size):
+        yield ChatCompletionChunk.model_validate({
+            'id': data.get('id', 'replay'),
+            'object': 'chat.completion.chunk',
+            'created': data.get('created', 0),
+            'model': data.get('model', 'replay'),
+            'choices': [{
+                'index': 0,
+                'delta': {'content': content[start:start + chunk_size]},
+                'finish_reason': None
+            }]
+        })
+
+
+class _ReplayCompletions:
+    def __init__(self, store: ReplayStore, client_factory: Callable[[], Any]):
+        self._store = store
+        self._client_factory = client_factory
+
+    def create(self, **kwargs):
+        request = completion_request(kwargs)
+
+        def perform():
+            if kwargs.get('stream'):
+                # Record the stream as one completion so both modes share a fixture
+                parts = []
+                for chunk in self._client_factory().chat.completions.create(**kwargs):
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        parts.append(chunk.choices[0].delta.content)
+                return {
+                    'id': 'recorded-stream',
+                    'object': 'chat.completion',
+                    'created': int(time.time()),
+                    'model': kwargs.get('model', ''),
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': ''.join(parts)}}]
+                }
+            return self._client_factory().chat.completions.create(**kwargs).model_dump()
+
+        data = self._store.call('openai.chat', request, perform)
+        return _chunks_from_dict(data) if kwargs.get('stream') else _completion_from_dict(data)
+
+
+class _AsyncReplayCompletions:
+    def __init__(self, store: ReplayStore, client_factory: Callable[[], Any]):
+        self._store = store
+        self._client_factory = client_factory
+        self._client = None
+
+    async def create(self, **kwargs):
+        async def perform():
+            if self._client is None:
+                self._client = self._client_factory()
+            return (await self._client.chat.completions.create(**kwargs)).model_dump()
+
+        return _completion_from_dict(await self._store.call_async('openai.chat', completion_request(kwargs), perform))
+
+
+class ReplayOpenAI:
+    """
+    Drop-in for the openai module / OpenAI client exposing chat.completions.create.
+    The real client is only built (via client_factory) in record mode.
+    """
+
+    def __init__(self, store: ReplayStore, client_factory: Callable[[], Any]):
+        self.chat = SimpleNamespace(completions=_ReplayCompletions(store, client_factory))
+
+
+class AsyncReplayOpenAI:
+    """Drop-in for openai.AsyncOpenAI exposing chat.completions.create and close"""
+
+    def __init__(self, store: ReplayStore, client_factory: Callable[[], Any]):
+        self._completions = _AsyncReplayCompletions(store, client_factory)
+        self.chat = SimpleNamespace(completions=self._completions)
+
+    async def close(self):
+        if self._completions._client is not None:
+            await self._completions._client.close()
+
+
+def _to_namespace(value: Any) -> Any:
+    if isinstance(value, dict):
+        return SimpleNamespace(**{name: _to_namespace(item) for name, item in value.items()})
+    if isinstance(value, list):
+        return [_to_namespace(item) for item in value]
+    return value
+
+
+def _namespace_friendly(value: Any) -> Any:
+    """Serialize SDK results; work item field names stay dict keys, not attributes"""
+    if hasattr(value, 'as_dict'):
+        return value.as_dict()
+    if isinstance(value, SimpleNamespace):
+        return {name: _namespace_friendly(item) for name, item in vars(value).items()}
+    if isinstance(value, list):
+        return [_namespace_friendly(item) for item in value]
+    return value
+
+
+class ReplayWitClient:
+    """
+    Record/replay stand-in for WorkItemTrackingClient covering the calls the
+    pipeline makes. The real client is only built (via client_factory) in record mode.
+    """
+
+    def __init__(self, store: ReplayStore, client_factory: Callable[[], Any]):
+        self._store = store
+        self._client_factory = client_factory
+        self._client = None
+        self._lock = threading.Lock()
+
+    def real_client(self):
+        """The wrapped WorkItemTrackingClient; only needed (and built) in record mode"""
+        with self._lock:
+            if self._client is None:
+                self._client = self._client_factory()
+            return self._client
+
+    def replay_call(self, method: str, request: Any, perform: Callable[[], Any]) -> Any:
+        """Record/replay a call the SDK client does not model, e.g. the $batch endpoint"""
+        return self._store.call(f"wit.{method}", request, perform)
+
+    def _call(self, method: str, request: Dict, *args, **kwargs):
+        data = self.replay_call(
+            method, request,
+            lambda: _namespace_friendly(getattr(self.real_client(), method)(*args, **kwargs))
+        )
+        return self._restore(data)
+
+    def _restore(self, data: Any) -> Any:
+        if isinstance(data, list):
+            return [self._restore(item) for item in data]
+        if isinstance(data, dict):
+            fields = data.get('fields')
+            restored = _to_namespace({name: item for name, item in data.items() if name != 'fields'})
+            if 'fields' in data:
+                restored.fields = fields
+            return restored
+        return data
+
+    def query_by_wiql(self, wiql, team_context=None, time_precision=None, top=None):
+        request = {'query': ' '.join(wiql.query.split()), 'time_precision': time_precision, 'top': top}
+        return self._call('query_by_wiql', request, wiql, team_context=team_context,
+                          time_precision=time_precision, top=top)
+
+    def get_work_items(self, ids, project=None, fields=None, as_of=None, expand=None, error_policy=None):
+        request = {'ids': list(ids), 'project': project, 'fields': fields, 'expand': expand,
+                   'error_policy': error_policy}
+        return self._call('get_work_items', request, ids, project=project, fields=fields, as_of=as_of,
+                          expand=expand, error_policy=error_policy)
+
+    def get_work_item(self, id, project=None, fields=None, as_of=None, expand=None):
+        request = {'id': id, 'project': project, 'fields': fields, 'expand': expand}
+        return self._call('get_work_item', request, id, project=project, fields=fields, as_of=as_of, expand=expand)
+
+    def create_work_item(self, document, project, type, **kwargs):
+        request = {'document': document, 'project': project, 'type': type}
+        return self._call('create_work_item', request, document=document, project=project, type=type, **kwargs)
+
+    def update_work_item(self, document, id, **kwargs):
+        request = {'document': document, 'id': id}
+        return self._call('update_work_item', request, document=document, id=id, **kwargs)
+
+
+def wrap_openai_client(client_factory: Callable[[], Any], store: Optional[ReplayStore] = None):
+    """
+    Return the completion client the pipeline should use
+
+    Args:
+        client_factory (Callable[[], Any]): Builds the real client (e.g. lambda: openai)
+        store (Optional[ReplayStore]): Replay store; read from the environment when omitted
+
+    Returns:
+        The real client, or a ReplayOpenAI when record/replay is enabled
+    """
+    store = store or ReplayStore.from_env()
+    return ReplayOpenAI(store, client_factory) if store else client_factory()
+
+
+def wrap_async_openai_client(client_factory: Callable[[], Any], store: Optional[ReplayStore] = None):
+    """Async counterpart of wrap_openai_client"""
+    store = store or ReplayStore.from_env()
+    return AsyncReplayOpenAI(store, client_factory) if store else client_factory()
+
+
+def wrap_wit_client(client_factory: Callable[[], Any], store: Optional[ReplayStore] = None):
+    """Return the real work item tracking client, or a ReplayWitClient when record/replay is enabled"""
+    store = store or ReplayStore.from_env()
+    return ReplayWitClient(store, client_factory) if store else client_factory()
+
+
+class ReplayCompletionServer:
+    """
+    OpenAI-compatible HTTP stand-in answering POST /v1/chat/completions from
+    the fixtures (replay) or by forwarding to the real API (record).
+    """
+
+    def __init__(self, store: ReplayStore, host: str = '127.0.0.1', port: int = 0):
+        self.store = store
+        self._client = None
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/v1/"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def _upstream(self):
+        if self._client is None:
+            import openai
+            self._client = openai.OpenAI(base_url=os.getenv('REPLAY_UPSTREAM_BASE_URL') or None)
+        return self._client
+
+    def _handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, body: Dict):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if not self.path.rstrip('/').endswith('/chat/completions'):
+                    self._reply(404, {"error": {"message": f"Unsupported path {self.path}"}})
+                    return
+                upstream_request = {name: value for name, value in request.items() if name != 'stream'}
+                try:
+                    data = stand_in.store.call(
+                        'openai.chat', completion_request(request),
+                        lambda: stand_in._upstream().chat.completions.create(**upstream_request).model_dump()
+                    )
+                except InjectedReplayError as e:
+                    self._reply(503, {"error": {"message": str(e), "type": "server_error"}})
+                    return
+                except FixtureNotFoundError as e:
+                    self._reply(404, {"error": {"message": str(e), "type": "invalid_request_error"}})
+                    return
+                if not request.get('stream'):
+                    self._reply(200, data)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                for chunk in _chunks_from_dict(data):
+                    self.wfile.write(f"data: {chunk.model_dump_json()}\n\n".encode())
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.close_connection = True
+
+        return Handler
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve recorded chat completions over HTTP")
+    parser.add_argument('command', choices=['serve'])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--mode', choices=['record', 'replay'], default=os.getenv('PIPELINE_REPLAY_MODE') or 'replay')
+    args = parser.parse_args()
+    os.environ['PIPELINE_REPLAY_MODE'] = args.mode
+    stand_in = ReplayCompletionServer(ReplayStore.from_env(), port=args.port)
+    print(f"Serving {args.mode} completions at {stand_in.base_url} (set OPENAI_BASE_URL to this)", file=sys.stderr)
+    stand_in.serve_forever()
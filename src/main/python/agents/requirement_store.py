@@ -0,0 +1,143 @@
+import os
+import re
+import sqlite3
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Union
+
+DEFAULT_STORE_PATH = os.path.join('.crewai_cache', 'requirements.db')
+# '2024-01-01T10:00:05.13Z' or '2024-01-01T10:00:05+00:00'; ADO drops trailing zeros of the fraction
+_CHANGED_DATE = re.compile(r"(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2})(?:\.(\d+))?\s*(Z|[+-]\d{2}:?\d{2})?$", re.IGNORECASE)
+
+
+def parse_changed_date(value: Union[str, datetime]) -> datetime:
+    """
+    Parse a System.ChangedDate value into an aware UTC datetime
+
+    Args:
+        value (Union[str, datetime]): ISO 8601 timestamp with any number of fractional digits
+
+    Returns:
+        datetime: The same instant in UTC; timestamps without an offset are taken as UTC
+    """
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        match = _CHANGED_DATE.match(value.strip())
+        if not match:
+            raise ValueError(f"Unrecognised System.ChangedDate: {value!r}")
+        seconds, fraction, offset = match.groups()
+        # Padded or cut to microseconds, which fromisoformat accepts on every supported Python
+        text = f"{seconds.replace(' ', 'T')}.{(fraction or '').ljust(6, '0')[:6]}"
+        if offset and offset.upper() != 'Z':
+            text += offset if ':' in offset else f"{offset[:3]}:{offset[3:]}"
+        parsed = datetime.fromisoformat(text)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def format_changed_date(value: datetime) -> str:
+    """The one format watermarks are stored in, e.g. '2024-01-01T10:00:05.130000Z'"""
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+class RequirementStore:
+    """
+    Local SQLite copy of the committed requirements, keyed by work item id,
+    together with the System.ChangedDate watermark of the last sync.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS requirements (
+                id INTEGER PRIMARY KEY,
+                rev INTEGER NOT NULL,
+                changed_date TEXT NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT,
+                acceptance_criteria TEXT
+            );
+            CREATE TABLE IF NOT EXISTS sync_state (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get_watermark(self) -> Optional[str]:
+        """Return the latest System.ChangedDate seen by a completed sync"""
+        row = self.connection.execute(
+            "SELECT value FROM sync_state WHERE key = 'changed_date_watermark'"
+        ).fetchone()
+        return row[0] if row else None
+
+    def known_revisions(self) -> Dict[int, int]:
+        """Return the stored System.Rev for every known requirement"""
+        return dict(self.connection.execute("SELECT id, rev FROM requirements"))
+
+    def get_requirements(self, ids: Optional[Iterable[int]] = None) -> List[Dict]:
+        """
+        Load stored requirements
+
+        Args:
+            ids (Optional[Iterable[int]]): Restrict to these ids; all when omitted
+
+        Returns:
+            List[Dict]: Requirements in the same shape fetch_requirements returns
+        """
+        query = "SELECT id, title, description, acceptance_criteria FROM requirements"
+        if ids is None:
+            rows = self.connection.execute(query + " ORDER BY id")
+        else:
+            ids = list(ids)
+            rows = self.connection.execute(
+                query + f" WHERE id IN ({','.join('?' * len(ids))}) ORDER BY id", ids
+            ) if ids else []
+        return [
+            {'id': row[0], 'title': row[1], 'description': row[2], 'acceptance_criteria': row[3]}
+            for row in rows
+        ]
+
+    def apply_sync(self, changed: List[Dict], removed_ids: List[int], watermark: Optional[str]):
+        """
+        Atomically record the outcome of a sync
+
+        Args:
+            changed (List[Dict]): New or changed requirements, each carrying 'rev' and 'changed_date'
+            removed_ids (List[int]): Requirements that were deleted or left the committed state
+            watermark (Optional[str]): New System.ChangedDate watermark, as format_changed_date writes it
+        """
+        with self.connection:
+            self.connection.executemany(
+                """
+                INSERT INTO requirements (id, rev, changed_date, title, description, acceptance_criteria)
+                VALUES (:id, :rev, :changed_date, :title, :description, :acceptance_criteria)
+                ON CONFLICT(id) DO UPDATE SET
+                    rev = excluded.rev,
+                    changed_date = excluded.changed_date,
+                    title = excluded.title,
+                    description = excluded.description,
+                    acceptance_criteria = excluded.acceptance_criteria
+                """,
+                changed
+            )
+            self.connection.executemany(
+                "DELETE FROM requirements WHERE id = ?", [(work_item_id,) for work_item_id in removed_ids]
+            )
+            if watermark:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO sync_state (key, value) VALUES ('changed_date_watermark', ?)",
+                    (watermark,)
+                )
@@ -1,14 +1,57 @@
 from crewai import Agent
-from typing import List, Dict
+from typing import Iterator, List, Dict, Optional
+import asyncio
 import openai
 import os
 from dotenv import load_dotenv
+from agents.llm_cache import LLMResponseCache, cache_key
+from agents.prompt_packer import (REQUIREMENT_MARKER, TokenCounter, demultiplex, pack_requirements, plain_requirement,
+                                  render_requirement)
+from agents.scenario_schema import (RECORD_PACKED_TEST_CASES_TOOL, RECORD_TEST_CASES_TOOL,
+                                    parse_packed_structured_test_cases, parse_structured_test_cases)
+from agents.rate_limiter import AsyncRateLimiter, estimate_tokens
+from agents.replay import wrap_async_openai_client, wrap_openai_client
+from agents.scenario_stream_parser import ScenarioStreamParser
+
+MODEL = "gpt-3.5-turbo"
+SYSTEM_PROMPT = "You are a test automation expert. Generate detailed, practical test scenarios that can be automated using Selenium."
+# Completion tokens assumed per request until the API reports real usage
+EXPECTED_COMPLETION_TOKENS = 800
+# Most completion tokens MODEL returns for one request, however large its context window
+MAX_COMPLETION_TOKENS = 4096
+# None leaves the API default in place; part of the response cache key
+TEMPERATURE = None
+PACKED_PROMPT_HEADER = """
+        Generate detailed test scenarios for each of the following requirements.
+
+        Start the answer for every requirement with its marker line exactly as given,
+        e.g. {marker}, and answer every requirement.
+
+        For each test case, provide:
+        1. Test case title
+        2. Test steps
+        3. Expected results
+        4. Test data requirements
+        """
 
 class RequirementsAnalyzer:
     def __init__(self):
         load_dotenv()
         openai.api_key = os.getenv('OPENAI_API_KEY')
         print(f"Loaded OpenAI API key: {openai.api_key}")
+        self.max_concurrency = int(os.getenv('LLM_MAX_CONCURRENCY', '8'))
+        self.requests_per_minute = int(os.getenv('LLM_REQUESTS_PER_MINUTE', '0')) or None
+        self.tokens_per_minute = int(os.getenv('LLM_TOKENS_PER_MINUTE', '0')) or None
+        self.cache = LLMResponseCache.from_env()
+        self.stream = os.getenv('LLM_STREAM', 'false').lower() == 'true'
+        # 'text' parses free-text completions, 'json' forces a schema-validated tool call
+        self.output_mode = os.getenv('SCENARIO_OUTPUT_MODE', 'text').lower()
+        # Prompt tokens per packed request
+        self.pack_token_budget = int(os.getenv('LLM_PACK_TOKEN_BUDGET', '12000'))
+        # Output limit each packed request is sized against and capped at
+        self.max_completion_tokens = int(os.getenv('LLM_MAX_COMPLETION_TOKENS', str(MAX_COMPLETION_TOKENS)))
+        # The openai module itself, or its record/replay stand-in (PIPELINE_REPLAY_MODE)
+        self.client = wrap_openai_client(lambda: openai)
 
     def create_agent(self):
         return Agent(
@@ -20,30 +63,181 @@ class RequirementsAnalyzer:
             verbose=True
         )
 
-    def analyze_requirements(self, requirements: List[Dict]) -> List[Dict]:
+    def analyze_requirements(self, requirements: List[Dict]) -> Iterator[Dict]:
         """
         Analyze requirements and generate test scenarios
         
+        Each scenario is yielded as soon as its requirement's completion has
+        been parsed (with LLM_STREAM, as soon as the stream closes), so the
+        caller can generate code for it while later requirements are analyzed.
+        
         Args:
             requirements (List[Dict]): List of requirements from Azure DevOps
             
-        Returns:
-            List[Dict]: List of test scenarios
+        Yields:
+            Dict: Test scenario of each requirement, in order
         """
-        test_scenarios = []
-        
         for req in requirements:
             # Generate test scenarios using OpenAI
-            test_cases = self._generate_test_scenarios(req)
+            if self.stream and self.output_mode == 'text':
+                # Code is generated per scenario, so it waits for this requirement's stream only
+                test_cases = list(self.stream_test_scenarios(req))
+            else:
+                test_cases = self._generate_test_scenarios(req)
             
-            scenario = {
+            yield {
                 'requirement_id': req['id'],
                 'requirement_title': req['title'],
                 'test_cases': test_cases
             }
-            test_scenarios.append(scenario)
+
+    async def analyze_requirements_async(self, requirements: List[Dict],
+                                         max_concurrency: Optional[int] = None,
+                                         requests_per_minute: Optional[int] = None,
+                                         tokens_per_minute: Optional[int] = None) -> List[Dict]:
+        """
+        Analyze requirements concurrently with the async OpenAI client
+        
+        Args:
+            requirements (List[Dict]): List of requirements from Azure DevOps
+            max_concurrency (Optional[int]): Completions in flight at once (LLM_MAX_CONCURRENCY)
+            requests_per_minute (Optional[int]): Request rate limit (LLM_REQUESTS_PER_MINUTE)
+            tokens_per_minute (Optional[int]): Token rate limit (LLM_TOKENS_PER_MINUTE)
+            
+        Returns:
+            List[Dict]: List of test scenarios, in the same order as requirements
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        limiter = AsyncRateLimiter(
+            requests_per_minute=requests_per_minute or self.requests_per_minute,
+            tokens_per_minute=tokens_per_minute or self.tokens_per_minute
+        )
+        client = wrap_async_openai_client(lambda: openai.AsyncOpenAI(api_key=openai.api_key, base_url=openai.base_url))
+        try:
+            test_cases = await asyncio.gather(*[
+                self._generate_test_scenarios_async(client, semaphore, limiter, req)
+                for req in requirements
+            ])
+        finally:
+            await client.close()
+
+        return [
+            {
+                'requirement_id': req['id'],
+                'requirement_title': req['title'],
+                'test_cases': cases
+            }
+            for req, cases in zip(requirements, test_cases)
+        ]
+
+    def analyze_requirements_packed(self, requirements: List[Dict], token_budget: Optional[int] = None) -> List[Dict]:
+        """
+        Analyze requirements with several requirements packed into each completion
+        
+        Requirements (with ADO HTML stripped) are bin-packed into prompts whose
+        locally counted tokens fit token_budget, with no more requirements per
+        prompt than expected completions fit the model's output limit
+        (LLM_MAX_COMPLETION_TOKENS). Each response is split back per
+        requirement_id (by its marker, or in json output mode by the
+        requirement_id of each record_packed_test_cases entry); any requirement
+        the model skipped, or whose answer was cut off at the output limit, is
+        retried on its own, also without HTML.
+        
+        Args:
+            requirements (List[Dict]): List of requirements from Azure DevOps
+            token_budget (Optional[int]): Prompt tokens per packed request (LLM_PACK_TOKEN_BUDGET)
+            
+        Returns:
+            List[Dict]: List of test scenarios, in the same order as requirements
+        """
+        counter = TokenCounter(MODEL)
+        budget = (token_budget or self.pack_token_budget) - counter.count(SYSTEM_PROMPT + PACKED_PROMPT_HEADER)
+        groups = pack_requirements(
+            requirements,
+            budget,
+            lambda req: counter.count(render_requirement(req)),
+            max_group_size=max(1, self.max_completion_tokens // EXPECTED_COMPLETION_TOKENS)
+        )
+        print(f"Packed {len(requirements)} requirements into {len(groups)} completion requests")
+
+        test_cases_by_id = {}
+        for group in groups:
+            if len(group) == 1:
+                # Sent on its own, but with the HTML stripped like a packed requirement
+                test_cases_by_id[str(group[0]['id'])] = self._generate_test_scenarios(plain_requirement(group[0]))
+            else:
+                test_cases_by_id.update(self._generate_packed_test_scenarios(group))
+
+        return [
+            {
+                'requirement_id': req['id'],
+                'requirement_title': req['title'],
+                'test_cases': test_cases_by_id[str(req['id'])]
+            }
+            for req in requirements
+        ]
+
+    def _generate_packed_test_scenarios(self, group: List[Dict]) -> Dict[str, List[Dict]]:
+        """
+        Generate test scenarios for a packed group of requirements with one completion
         
-        return test_scenarios
+        Returns:
+            Dict[str, List[Dict]]: Test cases by str(requirement id)
+        """
+        prompt = PACKED_PROMPT_HEADER.format(marker=REQUIREMENT_MARKER.format(id=group[0]['id']))
+        prompt += "\n" + "\n".join(render_requirement(req) for req in group)
+        if self.output_mode == 'json':
+            prompt += ("\nReturn the test cases of every requirement by calling record_packed_test_cases, "
+                       "with requirement_id set to the id in its marker line.\n")
+        key = cache_key(MODEL, SYSTEM_PROMPT, prompt, TEMPERATURE)
+        parsed = {}
+        cached = content = None
+        truncated = False
+        try:
+            cached = content = self.cache.get(key)
+            if content is None:
+                response = self.client.chat.completions.create(
+                    model=MODEL,
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=self.max_completion_tokens,
+                    **self._completion_options(RECORD_PACKED_TEST_CASES_TOOL)
+                )
+                content = self._completion_content(response)
+                truncated = response.choices[0].finish_reason == 'length'
+                if truncated:
+                    print(f"Packed completion for {len(group)} requirements hit the output limit; "
+                          f"retrying the unfinished ones on their own")
+            if content is not None:
+                parsed = self._parse_packed_completion(content, group, truncated)
+        except Exception as e:
+            print(f"Error generating packed test scenarios: {str(e)}")
+
+        test_cases_by_id = {str(req['id']): parsed.get(str(req['id']), []) for req in group}
+        # A cut-off response is never cached, so a cached one is always complete
+        self._cache_if_parsed(key, content, cached, any(test_cases_by_id.values()) and not truncated)
+        for req in group:
+            if not test_cases_by_id[str(req['id'])]:
+                # The model skipped or garbled this requirement; ask for it alone
+                test_cases_by_id[str(req['id'])] = self._generate_test_scenarios(plain_requirement(req))
+        return test_cases_by_id
+
+    def _parse_packed_completion(self, content: str, group: List[Dict], truncated: bool = False) -> Dict[str, List[Dict]]:
+        """
+        Test cases by str(requirement id) from a packed completion; skipped ids are absent
+
+        When the completion was cut off at the output limit only the
+        requirements whose answer was closed before the cut are returned.
+        """
+        if self.output_mode == 'json':
+            test_cases_by_id, rejected = parse_packed_structured_test_cases(content, truncated)
+            if rejected:
+                print(f"Rejected {rejected} packed test case(s) not matching the schema")
+            return test_cases_by_id
+        sections = demultiplex(content, [req['id'] for req in group], truncated)
+        return {requirement_id: self._parse_test_scenarios(section) for requirement_id, section in sections.items()}
 
     def _generate_test_scenarios(self, requirement: Dict) -> List[Dict]:
         """
@@ -55,6 +249,107 @@ class RequirementsAnalyzer:
         Returns:
             List[Dict]: List of test cases for the requirement
         """
+        messages = self._build_messages(requirement)
+        key = self._cache_key(messages)
+        try:
+            cached = content = self.cache.get(key)
+            if content is None:
+                response = self.client.chat.completions.create(
+                    model=MODEL,
+                    messages=messages,
+                    **self._completion_options()
+                )
+                content = self._completion_content(response)
+            test_cases = self._test_cases_from_completion(requirement, content)
+            self._cache_if_parsed(key, content, cached, bool(test_cases))
+            # Fallback: generate a default test case
+            return test_cases or self._default_test_cases(requirement)
+        except Exception as e:
+            print(f"Error generating test scenarios: {str(e)}")
+            return self._default_test_cases(requirement)
+
+    def stream_test_scenarios(self, requirement: Dict) -> Iterator[Dict]:
+        """
+        Stream test cases for a requirement as the completion arrives
+        
+        Each test case is yielded as soon as the next test case header (or the
+        end of the stream) closes it, so callers can start working on it while
+        the model is still generating the rest.
+        
+        Args:
+            requirement (Dict): Single requirement details
+            
+        Yields:
+            Dict: Test cases for the requirement, or the default test case if none parse
+        """
+        if self.output_mode != 'text':
+            # Tool call arguments are only valid once complete, so there is nothing to stream
+            yield from self._generate_test_scenarios(requirement)
+            return
+        messages = self._build_messages(requirement)
+        key = self._cache_key(messages)
+        parser = ScenarioStreamParser()
+        emitted = 0
+        content = None
+        received = []
+        try:
+            content = self.cache.get(key)
+            if content is not None:
+                fragments = iter([content])
+            else:
+                stream = self.client.chat.completions.create(
+                    model=MODEL,
+                    messages=messages,
+                    stream=True,
+                    **self._completion_options()
+                )
+                fragments = (chunk.choices[0].delta.content or '' for chunk in stream if chunk.choices)
+            for fragment in fragments:
+                received.append(fragment)
+                for test_case in parser.feed(fragment):
+                    emitted += 1
+                    yield test_case
+            for test_case in parser.close():
+                emitted += 1
+                yield test_case
+            self._cache_if_parsed(key, ''.join(received), content, emitted > 0)
+        except Exception as e:
+            print(f"Error streaming test scenarios: {str(e)}")
+        if not emitted:
+            yield from self._default_test_cases(requirement)
+
+    async def _generate_test_scenarios_async(self, client, semaphore: asyncio.Semaphore,
+                                             limiter: AsyncRateLimiter, requirement: Dict) -> List[Dict]:
+        """
+        Async counterpart of _generate_test_scenarios, bounded by semaphore and limiter
+        """
+        messages = self._build_messages(requirement)
+        key = self._cache_key(messages)
+        estimated_tokens = sum(estimate_tokens(message['content']) for message in messages) + EXPECTED_COMPLETION_TOKENS
+        try:
+            cached = content = self.cache.get(key)
+            if content is None:
+                async with semaphore:
+                    await limiter.acquire(estimated_tokens)
+                    response = await client.chat.completions.create(
+                        model=MODEL,
+                        messages=messages,
+                        **self._completion_options()
+                    )
+                usage = getattr(response, 'usage', None)
+                limiter.record_usage(estimated_tokens, getattr(usage, 'total_tokens', None))
+                content = self._completion_content(response)
+            test_cases = self._test_cases_from_completion(requirement, content)
+            self._cache_if_parsed(key, content, cached, bool(test_cases))
+            return test_cases or self._default_test_cases(requirement)
+        except Exception as e:
+            print(f"Error generating test scenarios: {str(e)}")
+            return self._default_test_cases(requirement)
+
+    def _build_messages(self, requirement: Dict) -> List[Dict]:
+        """
+        Build the chat messages asking for test scenarios for a requirement
+        """
         prompt = f"""
         Based on the following requirement, generate detailed test scenarios:
         
@@ -68,92 +363,85 @@ class RequirementsAnalyzer:
         3. Expected results
         4. Test data requirements
         """
-        try:
-            response = openai.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a test automation expert. Generate detailed, practical test scenarios that can be automated using Selenium."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            print(f"\n--- RAW OPENAI RESPONSE FOR REQUIREMENT '{requirement['title']}' ---\n{response.choices[0].message.content}\n--- END RESPONSE ---\n")
-            # Process and structure the response
-            test_cases = self._parse_test_scenarios(response.choices[0].message.content)
-            if not test_cases:
-                # Fallback: generate a default test case
-                test_cases = [{
-                    'title': f"Default test for: {requirement['title']}",
-                    'steps': [
-                        f"Review requirement: {requirement['description']}",
-                        "Design a basic test flow based on acceptance criteria."
-                    ],
-                    'expected_results': ["Requirement is covered by at least one test."],
-                    'test_data': {}
-                }]
-            return test_cases
-        except Exception as e:
-            print(f"Error generating test scenarios: {str(e)}")
-            # Fallback: generate a default test case
-            return [
-                {
-                    'title': f"Default test for: {requirement['title']}",
-                    'steps': [
-                        f"Review requirement: {requirement['description']}",
-                        "Design a basic test flow based on acceptance criteria."
-                    ],
-                    'expected_results': ["Requirement is covered by at least one test."],
-                    'test_data': {}
-                }
-            ]
+        if self.output_mode == 'json':
+            prompt += "\nReturn the test cases by calling record_test_cases.\n"
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _completion_options(self, tool: Dict = RECORD_TEST_CASES_TOOL) -> Dict:
+        """Sampling and output options shared by every completion request"""
+        options = {} if TEMPERATURE is None else {'temperature': TEMPERATURE}
+        if self.output_mode == 'json':
+            options['tools'] = [tool]
+            options['tool_choice'] = {"type": "function", "function": {"name": tool['function']['name']}}
+        return options
+
+    def _completion_content(self, response) -> str:
+        """Completion text, or the tool call arguments in json output mode"""
+        message = response.choices[0].message
+        if self.output_mode == 'json' and message.tool_calls:
+            return message.tool_calls[0].function.arguments
+        return message.content
+
+    def _cache_key(self, messages: List[Dict]) -> str:
+        """Response cache key for a system + user message pair"""
+        return cache_key(MODEL, messages[0]['content'], messages[1]['content'], TEMPERATURE)
+
+    def _cache_if_parsed(self, key: str, content: Optional[str], cached: Optional[str], parsed: bool):
+        """
+        Keep only completions that parsed into test cases
+
+        A fresh completion is stored when it parsed; a cached one that no longer
+        parses is dropped, so a malformed response is asked for again instead
+        of being served for the whole TTL.
+        """
+        if cached is not None:
+            if not parsed:
+                self.cache.delete(key)
+        elif parsed and content is not None:
+            self.cache.set(key, content)
+
+    def _test_cases_from_completion(self, requirement: Dict, content: Optional[str]) -> List[Dict]:
+        """
+        Parse a completion into test cases; empty if none could be parsed
+        """
+        print(f"\n--- RAW OPENAI RESPONSE FOR REQUIREMENT '{requirement['title']}' ---\n{content}\n--- END RESPONSE ---\n")
+        if content is None:
+            return []
+        # Process and structure the response
+        if self.output_mode == 'json':
+            test_cases, rejected = parse_structured_test_cases(content)
+            if rejected:
+                print(f"Rejected {rejected} test case(s) not matching the schema for '{requirement['title']}'")
+        else:
+            test_cases = self._parse_test_scenarios(content)
+        return test_cases
+
+    def _default_test_cases(self, requirement: Dict) -> List[Dict]:
+        """
+        Fallback test case used when no test case could be generated
+        """
+        return [
+            {
+                'title': f"Default test for: {requirement['title']}",
+                'steps': [
+                    f"Review requirement: {requirement['description']}",
+                    "Design a basic test flow based on acceptance criteria."
+                ],
+                'expected_results': ["Requirement is covered by at least one test."],
+                'test_data': {}
+            }
+        ]
 
     def _parse_test_scenarios(self, content: str) -> List[Dict]:
         """
-        Improved parser for OpenAI response to extract all test cases, steps, expected results, and test data.
+        Single-pass parser for the free-text response that extracts all test cases,
+        steps, expected results and test data, tolerating common format drift.
         """
-        import re
-        test_cases = []
         try:
-            # Split on both 'Test Case' and 'Test Scenario' headers
-            raw_cases = re.split(r"Test Case \d+:|Test Scenario \d+:", content)
-            for raw_case in raw_cases[1:]:
-                lines = [l.strip() for l in raw_case.strip().split("\n") if l.strip()]
-                test_case = {
-                    'title': '',
-                    'steps': [],
-                    'expected_results': [],
-                    'test_data': {}
-                }
-                current_section = None
-                for line in lines:
-                    # Section headers can be numbered, e.g., '2. Test Steps:'
-                    if "Test Case Title:" in line:
-                        test_case['title'] = line.split("Test Case Title:",1)[1].strip()
-                        current_section = None
-                    elif re.match(r"\d+\.\s*Test Steps:?", line):
-                        current_section = "steps"
-                        continue
-                    elif re.match(r"\d+\.\s*Expected Results:?", line):
-                        current_section = "expected"
-                        continue
-                    elif re.match(r"\d+\.\s*Test Data Requirements:?", line):
-                        current_section = "test_data"
-                        continue
-                    # Collect lines starting with a dash under the current section
-                    if current_section == "steps" and line.startswith("-"):
-                        step = line.lstrip("- ").strip()
-                        if step:
-                            test_case['steps'].append(step)
-                    elif current_section == "expected" and line.startswith("-"):
-                        expected = line.lstrip("- ").strip()
-                        if expected:
-                            test_case['expected_results'].append(expected)
-                    elif current_section == "test_data" and line.startswith("-"):
-                        td = line.lstrip("- ").strip()
-                        if td:
-                            test_case['test_data'][f"data_{len(test_case['test_data'])+1}"] = td
-                if test_case['title']:
-                    test_cases.append(test_case)
-            return test_cases
+            return ScenarioStreamParser.parse(content)
         except Exception as e:
             print(f"Error parsing test scenarios: {str(e)}")
-            return []
\ No newline at end of file
+            return []
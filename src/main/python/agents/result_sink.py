@@ -0,0 +1,207 @@
+import glob
+import json
+import os
+import threading
+import time
+import unittest
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: rely on O_APPEND single-write appends
+    fcntl = None
+
+
+class JsonlResultSink:
+    """
+    Append-only JSON Lines file of test results.
+
+    Every record is encoded to one line and appended with a single write on
+    an O_APPEND descriptor, under an advisory lock where the platform has
+    one, so several threads or worker processes can share a file without
+    interleaving. Lines reach the OS immediately (a crashed run keeps
+    everything written so far); fsync is batched to every fsync_every
+    records or fsync_interval seconds, whichever comes first.
+    """
+
+    def __init__(self, path: str, fsync_every: int = 50, fsync_interval: float = 1.0):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, record: Dict):
+        line = (json.dumps(record, separators=(',', ':'), default=str) + '\n').encode('utf-8')
+        with self._lock:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                os.write(self._fd, line)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+            self._pending += 1
+            if self._pending >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+                self._sync()
+
+    def close(self):
+        with self._lock:
+            if self._fd is None:
+                return
+            self._sync()
+            os.close(self._fd)
+            self._fd = None
+
+    def _sync(self):
+        if self._pending:
+            os.fsync(self._fd)
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+
+class StreamingTestResult(unittest.TestResult):
+    """
+    TestResult that writes one sink record per test as it finishes and keeps
+    the same records (name, status, error, duration) for the caller.
+
+    Outcomes can be reported before tearDown has run, so a test's records
+    are held until stopTest and written with the duration of the whole test.
+    """
+
+    def __init__(self, sink: Optional[JsonlResultSink], scenario: Dict, attempt: int = 1):
+        super().__init__()
+        self.sink = sink
+        self.scenario = scenario
+        self.attempt = attempt
+        self.records = []
+        self._started = {}
+        self._pending = {}
+
+    def startTest(self, test):
+        super().startTest(test)
+        self._started[test.id()] = time.perf_counter()
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        started = self._started.pop(test.id(), None)
+        duration = round(time.perf_counter() - started, 6) if started is not None else None
+        details = self._describe(test)
+        for record in self._pending.pop(test.id(), []):
+            record['duration'] = duration
+            record.update(details)
+            self.records.append(record)
+            if self.sink is not None:
+                self.sink.write(record)
+
+    def addSuccess(self, test):
+        super().addSuccess(test)
+        self._record(test, 'PASSED')
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self._record(test, 'FAILED', self.failures[-1][1])
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self._record(test, 'FAILED', self.errors[-1][1])
+
+    def addSubTest(self, test, subtest, err):
+        super().addSubTest(test, subtest, err)
+        if err is not None:
+            failures = self.failures if issubclass(err[0], test.failureException) else self.errors
+            self._record(test, 'FAILED', failures[-1][1])
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self._record(test, 'SKIPPED', reason)
+
+    def _describe(self, test) -> Dict:
+        """Extra fields added to every record of a finished test"""
+        return {}
+
+    def _record(self, test, status: str, error: Optional[str] = None):
+        record = {
+            'requirement_id': self.scenario['requirement_id'],
+            'requirement_title': self.scenario['requirement_title'],
+            'test': test.id(),
+            'name': test.id().split('.')[-1],
+            'status': status,
+            'error': error,
+            'duration': None,
+            'attempt': self.attempt,
+            'finished_at': datetime.now().isoformat()
+        }
+        if test.id() in self._started:
+            self._pending.setdefault(test.id(), []).append(record)
+            return
+        # Errors outside a running test (e.g. setUpClass) are written immediately
+        self.records.append(record)
+        if self.sink is not None:
+            self.sink.write(record)
+
+
+def write_summary(path: str, summary: Dict):
+    """Atomically write a compact JSON summary"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(summary, f, separators=(',', ':'))
+    os.replace(temp_path, path)
+
+
+def iter_results(paths: Union[str, Iterable[str]]) -> Iterator[Dict]:
+    """
+    Lazily yield records from JSON Lines result files
+
+    Args:
+        paths (Union[str, Iterable[str]]): File paths or glob patterns
+
+    Returns:
+        Iterator[Dict]: Records, one file and one line at a time; a torn final
+            line from an interrupted run is skipped
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    for pattern in paths:
+        for path in sorted(glob.glob(pattern)) or [pattern]:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+
+
+def aggregate_results(paths: Union[str, Iterable[str]]) -> Dict:
+    """
+    Aggregate JSON Lines result files in a single streaming pass
+
+    Returns:
+        Dict: Overall and per-requirement passed/failed/skipped counts and durations
+    """
+    totals = {'tests': 0, 'passed': 0, 'failed': 0, 'skipped': 0, 'duration_seconds': 0.0}
+    requirements: Dict[str, Dict] = {}
+    for record in iter_results(paths):
+        requirement = requirements.setdefault(str(record.get('requirement_id')), {
+            'requirement_title': record.get('requirement_title'),
+            'passed': 0, 'failed': 0, 'skipped': 0, 'duration_seconds': 0.0
+        })
+        key = {'PASSED': 'passed', 'FAILED': 'failed', 'SKIPPED': 'skipped'}.get(record.get('status'), 'failed')
+        duration = record.get('duration') or 0.0
+        for counts in (totals, requirement):
+            counts[key] += 1
+            counts['duration_seconds'] += duration
+        totals['tests'] += 1
+    totals['requirements'] = requirements
+    return totals
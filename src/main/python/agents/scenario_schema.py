@@ -0,0 +1,183 @@
+import json
+import re
+from typing import Dict, List, Tuple
+
+# JSON schema of the structured-output mode; mirrors the dicts _parse_test_scenarios returns
+TEST_CASES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "test_cases": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string"},
+                    "steps": {"type": "array", "items": {"type": "string"}},
+                    "expected_results": {"type": "array", "items": {"type": "string"}},
+                    "test_data": {"type": "array", "items": {"type": "string"}}
+                },
+                "required": ["title", "steps", "expected_results", "test_data"]
+            }
+        }
+    },
+    "required": ["test_cases"]
+}
+
+RECORD_TEST_CASES_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "record_test_cases",
+        "description": "Record the test cases generated for the requirement.",
+        "parameters": TEST_CASES_SCHEMA
+    }
+}
+
+# Packed mode: the test cases of several requirements, each tagged with its id
+PACKED_TEST_CASES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "requirements": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "requirement_id": {"type": "string"},
+                    "test_cases": TEST_CASES_SCHEMA["properties"]["test_cases"]
+                },
+                "required": ["requirement_id", "test_cases"]
+            }
+        }
+    },
+    "required": ["requirements"]
+}
+
+RECORD_PACKED_TEST_CASES_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "record_packed_test_cases",
+        "description": "Record the test cases generated for each requirement, by requirement id.",
+        "parameters": PACKED_TEST_CASES_SCHEMA
+    }
+}
+
+
+def parse_structured_test_cases(arguments: str) -> Tuple[List[Dict], int]:
+    """
+    Validate record_test_cases arguments against TEST_CASES_SCHEMA
+
+    Invalid entries are dropped individually instead of failing the whole
+    response; a missing test_data list is treated as empty.
+
+    Args:
+        arguments (str): JSON arguments of the tool call
+
+    Returns:
+        Tuple[List[Dict], int]: Valid test cases in the pipeline's shape and the
+            number of entries that were rejected
+    """
+    try:
+        payload = json.loads(arguments)
+    except (TypeError, ValueError):
+        return [], 1
+    entries = payload.get("test_cases") if isinstance(payload, dict) else None
+    if not isinstance(entries, list):
+        return [], 1
+    return _valid_test_cases(entries)
+
+
+def parse_packed_structured_test_cases(arguments: str, truncated: bool = False) -> Tuple[Dict[str, List[Dict]], int]:
+    """
+    Validate record_packed_test_cases arguments against PACKED_TEST_CASES_SCHEMA
+
+    Args:
+        arguments (str): JSON arguments of the tool call
+        truncated (bool): The completion hit the output limit; the requirement
+            entries that were closed before the cut are still used
+
+    Returns:
+        Tuple[Dict[str, List[Dict]], int]: Valid test cases by str(requirement id)
+            and the number of entries that were rejected
+    """
+    if truncated:
+        groups = _closed_array_items(arguments, "requirements")
+    else:
+        try:
+            payload = json.loads(arguments)
+        except (TypeError, ValueError):
+            return {}, 1
+        groups = payload.get("requirements") if isinstance(payload, dict) else None
+    if not isinstance(groups, list):
+        return {}, 1
+
+    test_cases_by_id: Dict[str, List[Dict]] = {}
+    rejected = 0
+    for group in groups:
+        if not (isinstance(group, dict) and isinstance(group.get("requirement_id"), (str, int))
+                and isinstance(group.get("test_cases"), list)):
+            rejected += 1
+            continue
+        test_cases, group_rejected = _valid_test_cases(group["test_cases"])
+        test_cases_by_id.setdefault(str(group["requirement_id"]).strip(), []).extend(test_cases)
+        rejected += group_rejected
+    return test_cases_by_id, rejected
+
+
+def _closed_array_items(arguments: str, key: str) -> List:
+    """
+    Items of the top-level array under key that are complete in cut-off JSON
+
+    Decoding stops at the first item the cut runs through, so only items
+    the model finished writing are returned.
+    """
+    decoder = json.JSONDecoder()
+    opening = re.match(r'\s*\{\s*"' + re.escape(key) + r'"\s*:\s*\[', arguments or '')
+    if not opening:
+        return []
+    items = []
+    position = opening.end()
+    while True:
+        position = _skip_separators(arguments, position)
+        if position >= len(arguments) or arguments[position] == ']':
+            return items
+        try:
+            item, position = decoder.raw_decode(arguments, position)
+        except ValueError:
+            return items
+        items.append(item)
+
+
+def _skip_separators(text: str, position: int) -> int:
+    while position < len(text) and (text[position].isspace() or text[position] == ','):
+        position += 1
+    return position
+
+
+def _valid_test_cases(entries: List) -> Tuple[List[Dict], int]:
+    """Schema-valid entries in the pipeline's shape and the number rejected"""
+    test_cases = []
+    rejected = 0
+    for entry in entries:
+        if not isinstance(entry, dict):
+            rejected += 1
+            continue
+        title = entry.get("title")
+        steps = entry.get("steps")
+        expected_results = entry.get("expected_results")
+        test_data = entry.get("test_data", [])
+        if not (isinstance(title, str) and title.strip()
+                and _is_string_list(steps) and _is_string_list(expected_results)
+                and _is_string_list(test_data)):
+            rejected += 1
+            continue
+        test_cases.append({
+            'title': title.strip(),
+            'steps': [step.strip() for step in steps if step.strip()],
+            'expected_results': [result.strip() for result in expected_results if result.strip()],
+            'test_data': {f"data_{index}": item.strip()
+                          for index, item in enumerate((item for item in test_data if item.strip()), start=1)}
+        })
+    return test_cases, rejected
+
+
+def _is_string_list(value) -> bool:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
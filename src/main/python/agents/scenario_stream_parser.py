@@ -0,0 +1,208 @@
+import re
+from typing import Dict, List, Optional
+
+# 'Test Case 1:', '**Test Case 1**:', 'Test Scenario #2 -', '### Test Case 3.', only at the
+# start of a line so a step such as 'Log in as in Test Case 1.' is not taken for a header
+TEST_CASE_HEADER = re.compile(r"(?:#+\s*)?(\*\*|__)?\s*(?:Test Case|Test Scenario)\s*#?\d+\s*(\*\*|__)?\s*[:.\-–]")
+# Numbering, heading and quote markup in front of a title or section header
+LINE_PREFIX = re.compile(r"^(?:\d+[.)]\s*|#+\s*|>\s*)*")
+# '**Test Steps:**', '__Title__: Login' or '**Title: Login**'
+LABEL_EMPHASIS = re.compile(r"\*\*([^*]+?)\*\*|__([^_]+?)__")
+# An item wrapped in emphasis as a whole; '**Open** page' or 'snake_case_' are left alone
+EMPHASIS_WRAPPER = re.compile(r"\*\*([^*]+)\*\*|__([^_]+)__|\*([^*]+)\*|_([^_]+)_")
+# A title, or a section header given bare or with a colon and inline content. The empty
+# group closing each alternative names what matched (lastgroup) in a single match call
+LABEL_LINE = re.compile(
+    r"(?:Test (?:Case|Scenario) )?Title\s*:\s*(?P<title_text>.*)(?P<title>)"
+    r"|(?:Test )?Steps\s*(?::\s*(?P<steps_text>.*))?(?P<steps>)$"
+    r"|Expected Results?\s*(?::\s*(?P<expected_results_text>.*))?(?P<expected_results>)$"
+    r"|Test Data(?: Requirements)?\s*(?::\s*(?P<test_data_text>.*))?(?P<test_data>)$",
+    re.IGNORECASE)
+HEADER_LEADS = frozenset('T#*_')
+PREFIX_CHARS = frozenset('0123456789*_#>')
+EMPHASIS_CHARS = frozenset('*_')
+HEADER_INITIALS = frozenset('TtSsEe')
+# '*' is left out: it may open emphasis and is handled with the prefixed lines
+BULLET_CHARS = frozenset('-•')
+NUMBERED_ITEM = re.compile(r"\d+[.)]\s*(.*)")
+
+
+def unwrap_emphasis(text: str) -> str:
+    """Strip whitespace and one emphasis wrapper around the whole text"""
+    text = text.strip()
+    if text[:1] in EMPHASIS_CHARS:
+        wrapped = EMPHASIS_WRAPPER.fullmatch(text)
+        if wrapped:
+            return next(group for group in wrapped.groups() if group is not None).strip()
+    return text
+
+
+def _unprefix(line: str) -> str:
+    """'1. **Test Steps:**' -> 'Test Steps:'"""
+    line = line[LINE_PREFIX.match(line).end():]
+    if line[:1] in EMPHASIS_CHARS:
+        label = LABEL_EMPHASIS.match(line)
+        if label:
+            line = (label.group(1) or label.group(2)) + line[label.end():]
+            line = line[LINE_PREFIX.match(line).end():]
+    return line
+
+
+class ScenarioStreamParser:
+    """
+    Single-pass, incremental line state machine over a test scenario completion.
+
+    feed() accepts arbitrary text fragments (e.g. streamed deltas) and returns
+    every test case whose block was closed by the next line starting with a
+    'Test Case N:' or 'Test Scenario N:' header; close() flushes the final
+    one. parse() runs the same machine over a complete response.
+
+    Common format drift is tolerated: markdown headings and emphasis around
+    headers, titles given on the header line itself, un-numbered section
+    headers, inline section content and '*', '•' or numbered list items.
+    Emphasis inside an item is kept; only a wrapper around the whole item
+    is removed.
+    """
+
+    def __init__(self):
+        self._buffer = ''
+        self._case: Optional[Dict] = None
+        self._header_title = ''
+        # The list items of the current section are appended to
+        self._items: Optional[List[str]] = None
+
+    @classmethod
+    def parse(cls, content: str) -> List[Dict]:
+        """Parse a complete response"""
+        parser = cls()
+        test_cases = parser._consume_lines(content.split('\n'))
+        test_cases.extend(parser._finish_case())
+        return test_cases
+
+    def feed(self, text: str) -> List[Dict]:
+        """
+        Consume a fragment of the completion
+
+        Args:
+            text (str): Next fragment, possibly ending mid-line
+
+        Returns:
+            List[Dict]: Test cases completed by this fragment
+        """
+        self._buffer += text
+        if '\n' not in self._buffer:
+            return []
+        *lines, self._buffer = self._buffer.split('\n')
+        return self._consume_lines(lines)
+
+    def close(self) -> List[Dict]:
+        """
+        Finish parsing once the completion has ended
+
+        Returns:
+            List[Dict]: The remaining test case, if it has a title
+        """
+        completed = self._consume_lines([self._buffer])
+        self._buffer = ''
+        completed.extend(self._finish_case())
+        return completed
+
+    def _consume_lines(self, lines: List[str]) -> List[Dict]:
+        completed = []
+        # Locals are cheaper than module lookups in the per-line loop
+        bullets, header_leads, emphasis = BULLET_CHARS, HEADER_LEADS, EMPHASIS_CHARS
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            first = line[0]
+            if first in bullets:
+                # Most lines are '-' items; they can never be headers, so _add_item is inlined
+                if self._items is not None:
+                    item = line.lstrip(first).lstrip()
+                    if item[:1] in emphasis:
+                        item = unwrap_emphasis(item)
+                    if item:
+                        self._items.append(item)
+                continue
+            header = TEST_CASE_HEADER.match(line) if first in header_leads and 'Test' in line else None
+            if header:
+                completed.extend(self._start_case(line, header))
+            elif self._case is not None:
+                self._consume_fragment(line)
+        return completed
+
+    def _start_case(self, line: str, header: re.Match) -> List[Dict]:
+        completed = self._finish_case()
+        self._case = {
+            'title': '',
+            'steps': [],
+            'expected_results': [],
+            'test_data': []
+        }
+        rest = line[header.end():].strip()
+        opener, closer = header.groups()
+        if opener and not closer:
+            # '**Test Case 1:** Valid login' or '**Test Case 1: Valid login**'
+            if rest.startswith(opener):
+                rest = rest[len(opener):]
+            elif rest.endswith(opener):
+                rest = rest[:-len(opener)]
+        # 'Test Case 1: Valid login' carries the title on the header line
+        rest = rest.strip()
+        label = LABEL_LINE.match(_unprefix(rest)) if rest else None
+        if label and label.lastgroup == 'title':
+            self._consume_fragment(rest)
+        else:
+            self._header_title = unwrap_emphasis(rest)
+        return completed
+
+    def _consume_fragment(self, line: str):
+        """Consume a stripped, non-empty line of the current case"""
+        first = line[0]
+        item = None
+        numbered = NUMBERED_ITEM.match(line) if first.isdigit() else None
+        if numbered:
+            # '2. Test Steps:' or a numbered item; one match serves both
+            item = numbered.group(1)
+            unprefixed = _unprefix(item) if item[:1] in PREFIX_CHARS else item
+        elif first in PREFIX_CHARS:
+            unprefixed = _unprefix(line)
+            # '*' only bullets when followed by a space; otherwise it opens emphasis
+            if first == '*' and line[1:2].isspace():
+                item = line[1:]
+        else:
+            unprefixed = line
+        # Titles and section headers all start with one of these letters
+        if unprefixed[:1] in HEADER_INITIALS:
+            label = LABEL_LINE.match(unprefixed)
+            if label:
+                section = label.lastgroup
+                text = label.group(f"{section}_text")
+                if section == 'title':
+                    self._case['title'] = unwrap_emphasis(text)
+                    self._items = None
+                else:
+                    self._items = self._case[section]
+                    if text:
+                        self._add_item(text)
+                return
+        if item is not None and self._items is not None:
+            self._add_item(item)
+
+    def _add_item(self, text: str):
+        item = text.strip()
+        if item[:1] in EMPHASIS_CHARS:
+            item = unwrap_emphasis(item)
+        if item:
+            self._items.append(item)
+
+    def _finish_case(self) -> List[Dict]:
+        test_case, self._case, self._items = self._case, None, None
+        if test_case and not test_case['title']:
+            test_case['title'] = self._header_title
+        self._header_title = ''
+        if not test_case or not test_case['title']:
+            return []
+        test_case['test_data'] = {f"data_{index}": item for index, item in enumerate(test_case['test_data'], 1)}
+        return [test_case]
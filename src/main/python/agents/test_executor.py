@@ -3,13 +3,38 @@ import unittest
 import os
 import sys
 import importlib
-from typing import List, Dict
-import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Set
 from datetime import datetime
+from agents.flaky_tracker import FlakyTracker, run_outcome
+from agents.result_sink import JsonlResultSink, write_summary
+from agents.test_timing import TimingTestResult, print_slowest_report, slowest_report
+from agents.test_sharding import assign_shards, load_durations, parse_shard
+
+
+def _execute_scenario_in_worker(scenario: Dict, results_path: str, test_ids: Optional[Set[str]] = None,
+                                excluded_ids: Optional[Set[str]] = None) -> Dict:
+    """Process pool entry point; runs in a freshly spawned interpreter"""
+    with JsonlResultSink(results_path) as sink:
+        return TestExecutor()._execute_scenario_tests(scenario, sink, test_ids, excluded_ids)
+
 
 class TestExecutor:
     def __init__(self):
         self.test_results = []
+        # Scenarios run in separate processes when more than one worker is configured
+        self.workers = int(os.getenv('TEST_EXECUTION_WORKERS', '1'))
+        # 'i/N' runs only this machine's share of the suite
+        self.shard = os.getenv('TEST_SHARD')
+        # Shards are balanced over whole test modules ('module') or individual tests ('method')
+        self.shard_granularity = os.getenv('TEST_SHARD_GRANULARITY', 'module')
+        # Slowest tests and WebDriver commands kept in the summary; 0 disables the report
+        self.timing_report_top = int(os.getenv('TEST_TIMING_TOP', '10'))
+        # Failed tests are rerun in the same worker up to this many times
+        self.max_retries = int(os.getenv('TEST_MAX_RETRIES', '1'))
+        # Quarantined (flaky) tests run beside the main run in their own pool
+        self.quarantine_workers = int(os.getenv('TEST_QUARANTINE_WORKERS', '2'))
 
     def create_agent(self):
         return Agent(
@@ -22,43 +47,223 @@ class TestExecutor:
             verbose=True
         )
 
-    def execute_tests(self, test_scenarios: List[Dict]) -> Dict:
+    def execute_tests(self, test_scenarios: List[Dict], workers: Optional[int] = None,
+                      shard: Optional[str] = None, skipped_scenarios: Optional[List[Dict]] = None) -> Dict:
         """
         Execute the generated test cases and collect results
         
         Args:
             test_scenarios (List[Dict]): List of test scenarios to execute
+            workers (Optional[int]): Worker processes (TEST_EXECUTION_WORKERS); 1 runs in-process
+            shard (Optional[str]): 'i/N' to run only shard i of N (TEST_SHARD)
+            skipped_scenarios (Optional[List[Dict]]): Scenarios impact analysis left out, for the summary
             
         Returns:
             Dict: Test execution results
         """
+        started = datetime.now()
+        shard = shard or self.shard
+        test_filters = [None] * len(test_scenarios)
+        suffix = ''
+        if shard:
+            index, count = parse_shard(shard)
+            test_scenarios, test_filters = self._select_shard(test_scenarios, index, count)
+            suffix = f"_shard{index + 1}of{count}"
+        # One JSON line per test case is appended as soon as the test finishes. Microseconds and
+        # the pid keep runs or shards started in the same second out of each other's file
+        results_path = (f"test-results/test_execution_{started.strftime('%Y%m%d_%H%M%S_%f')}"
+                        f"_{os.getpid()}{suffix}.jsonl")
         results = {
-            'execution_time': datetime.now().isoformat(),
+            'execution_time': started.isoformat(),
+            'results_file': results_path,
+            'shard': shard,
             'total_scenarios': len(test_scenarios),
             'passed_tests': 0,
             'failed_tests': 0,
-            'scenario_results': []
+            'scenario_results': [],
+            'skipped_scenarios': skipped_scenarios or []
         }
 
-        import sys
-        import os
         sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
-        for scenario in test_scenarios:
-            scenario_result = self._execute_scenario_tests(scenario)
-            results['scenario_results'].append(scenario_result)
-            # Update summary counts
-            results['passed_tests'] += scenario_result['passed_tests']
-            results['failed_tests'] += scenario_result['failed_tests']
-        # Save results to a file
+        workers = workers or self.workers
+        tracker = FlakyTracker.from_env()
+        quarantined = tracker.quarantined()
+        # Quarantined tests start first so they finish alongside, not after, the main run
+        quarantine = self._start_quarantine(test_scenarios, test_filters, quarantined,
+                                            results_path.replace('.jsonl', '_quarantine.jsonl'))
+        try:
+            with JsonlResultSink(results_path) as sink:
+                if workers > 1 and len(test_scenarios) > 1:
+                    scenario_results = self._execute_in_pool(test_scenarios, workers, sink, test_filters, quarantined)
+                else:
+                    scenario_results = (
+                        self._execute_scenario_tests(scenario, sink, test_ids, quarantined)
+                        for scenario, test_ids in zip(test_scenarios, test_filters)
+                    )
+                for scenario_result in scenario_results:
+                    results['scenario_results'].append(scenario_result)
+                    # Update summary counts
+                    results['passed_tests'] += scenario_result['passed_tests']
+                    results['failed_tests'] += scenario_result['failed_tests']
+            results['quarantine'] = self._finish_quarantine(quarantine)
+            tracker.record(
+                (test_case['test'], outcome)
+                for scenario_result in results['scenario_results'] + results['quarantine']['scenario_results']
+                for test_case in scenario_result['test_cases']
+                for outcome in [run_outcome(test_case)] if outcome
+            )
+        finally:
+            tracker.close()
+        results['flaky_tests'] = [
+            test_case['test']
+            for scenario_result in results['scenario_results'] for test_case in scenario_result['test_cases']
+            if test_case.get('flaky')
+        ]
+        results['duration_seconds'] = round((datetime.now() - started).total_seconds(), 3)
+        if self.timing_report_top > 0:
+            results['slowest'] = slowest_report(results_path, self.timing_report_top)
+            print_slowest_report(results['slowest'])
+        # Save the run summary next to the per-test results
         self._save_test_results(results)
         return results
 
-    def _execute_scenario_tests(self, scenario: Dict) -> Dict:
+    def _start_quarantine(self, test_scenarios: List[Dict], test_filters: List[Optional[Set[str]]],
+                          quarantined: Set[str], results_path: str) -> Dict:
+        """
+        Submit the quarantined tests of the selected scenarios to their own process pool
+
+        Returns:
+            Dict: The pool, its futures by scenario and the results file, for _finish_quarantine
+        """
+        runs = []
+        for scenario, test_ids in zip(test_scenarios, test_filters):
+            module_prefix = f"{self._test_module_name(scenario)}."
+            scenario_ids = {test_id for test_id in quarantined if test_id.startswith(module_prefix)}
+            if test_ids is not None:
+                scenario_ids &= test_ids
+            if scenario_ids:
+                runs.append((scenario, scenario_ids))
+        if not runs:
+            return {'pool': None, 'runs': [], 'results_file': None}
+        print(f"Running {sum(len(ids) for _, ids in runs)} quarantined tests separately")
+        pool_options = {'max_tasks_per_child': 1} if sys.version_info >= (3, 11) else {}
+        pool = ProcessPoolExecutor(max_workers=max(1, min(self.quarantine_workers, len(runs))),
+                                   mp_context=multiprocessing.get_context('spawn'), **pool_options)
+        return {
+            'pool': pool,
+            'runs': [(scenario, pool.submit(_execute_scenario_in_worker, scenario, results_path, scenario_ids))
+                     for scenario, scenario_ids in runs],
+            'results_file': results_path
+        }
+
+    def _finish_quarantine(self, quarantine: Dict) -> Dict:
+        """Collect quarantined results; they are reported but not counted in the main totals"""
+        summary = {'results_file': quarantine['results_file'], 'passed_tests': 0, 'failed_tests': 0,
+                   'scenario_results': []}
+        try:
+            for scenario, future in quarantine['runs']:
+                try:
+                    scenario_result = future.result()
+                except Exception as e:
+                    print(f"Error executing quarantined tests for scenario {scenario['requirement_title']}: {str(e)}")
+                    continue
+                summary['scenario_results'].append(scenario_result)
+                summary['passed_tests'] += scenario_result['passed_tests']
+                summary['failed_tests'] += scenario_result['failed_tests']
+        finally:
+            if quarantine['pool'] is not None:
+                quarantine['pool'].shutdown()
+        return summary
+
+    def _select_shard(self, test_scenarios: List[Dict], index: int, count: int):
+        """
+        Pick this shard's scenarios, balanced on historical durations
+
+        Returns:
+            Tuple[List[Dict], List[Optional[Set[str]]]]: Selected scenarios and, per
+                scenario, the test ids to run (None runs the whole module)
+        """
+        if self.shard_granularity == 'method':
+            # Modules that cannot be loaded stay whole so their failure is reported by one shard
+            items_by_scenario = [self._discover_test_ids(scenario) or [self._test_module_name(scenario)]
+                                 for scenario in test_scenarios]
+        else:
+            items_by_scenario = [[self._test_module_name(scenario)] for scenario in test_scenarios]
+        items = [item for scenario_items in items_by_scenario for item in scenario_items]
+        assigned = set(assign_shards(items, count, load_durations(granularity=self.shard_granularity))[index])
+
+        selected, test_filters = [], []
+        for scenario, scenario_items in zip(test_scenarios, items_by_scenario):
+            test_ids = {item for item in scenario_items if item in assigned}
+            if not test_ids:
+                continue
+            selected.append(scenario)
+            test_filters.append(test_ids if '.' in next(iter(test_ids)) else None)
+        print(f"Shard {index + 1}/{count}: {len(assigned)} of {len(items)} "
+              f"{'tests' if self.shard_granularity == 'method' else 'test modules'}")
+        return selected, test_filters
+
+    def _discover_test_ids(self, scenario: Dict) -> List[str]:
+        try:
+            return [test.id() for test in self._iter_tests(self._load_suite(scenario))]
+        except Exception as e:
+            print(f"Could not list tests for scenario {scenario['requirement_title']}: {str(e)}")
+            return []
+
+    def _execute_in_pool(self, test_scenarios: List[Dict], workers: int, sink: JsonlResultSink,
+                         test_filters: List[Optional[Set[str]]], excluded_ids: Set[str]) -> List[Dict]:
+        """
+        Run _execute_scenario_tests for each scenario across a process pool
+
+        Workers are spawned rather than forked and each handles a single
+        scenario, so every scenario imports its test module into a clean
+        interpreter and no sys.path or sys.modules state is shared.
+
+        Args:
+            test_scenarios (List[Dict]): Scenarios to execute
+            workers (int): Maximum number of concurrent worker processes
+            sink (JsonlResultSink): Sink whose file the workers append to
+            test_filters (List[Optional[Set[str]]]): Test ids to run per scenario, None for all
+            excluded_ids (Set[str]): Test ids left out (quarantined)
+
+        Returns:
+            List[Dict]: Scenario results in the same order as test_scenarios
+        """
+        pool_options = {'max_tasks_per_child': 1} if sys.version_info >= (3, 11) else {}
+        with ProcessPoolExecutor(max_workers=min(workers, len(test_scenarios)),
+                                 mp_context=multiprocessing.get_context('spawn'), **pool_options) as pool:
+            futures = [
+                pool.submit(_execute_scenario_in_worker, scenario, sink.path, test_ids, excluded_ids)
+                for scenario, test_ids in zip(test_scenarios, test_filters)
+            ]
+            scenario_results = []
+            for scenario, future in zip(test_scenarios, futures):
+                try:
+                    scenario_results.append(future.result())
+                except Exception as e:
+                    # A worker that dies breaks the pool; the scenarios it leaves unfinished are reported as failed
+                    print(f"Error executing tests for scenario {scenario['requirement_title']}: {str(e)}")
+                    scenario_result = {
+                        'requirement_id': scenario['requirement_id'],
+                        'requirement_title': scenario['requirement_title'],
+                        'passed_tests': 0,
+                        'failed_tests': 0,
+                        'test_cases': []
+                    }
+                    self._record_failure(scenario_result, 'worker_process', str(e), sink)
+                    scenario_results.append(scenario_result)
+        return scenario_results
+
+    def _execute_scenario_tests(self, scenario: Dict, sink: Optional[JsonlResultSink] = None,
+                                test_ids: Optional[Set[str]] = None, excluded_ids: Optional[Set[str]] = None) -> Dict:
         """
         Execute tests for a single scenario
         
         Args:
             scenario (Dict): Test scenario to execute
+            sink (Optional[JsonlResultSink]): Receives one record per test as it finishes
+            test_ids (Optional[Set[str]]): Run only these tests of the module (sharding)
+            excluded_ids (Optional[Set[str]]): Leave these tests out (quarantine)
             
         Returns:
             Dict: Results for this scenario
@@ -72,89 +277,149 @@ class TestExecutor:
         }
 
         # Import and run the test module
-        test_module_name = f"test_{scenario['requirement_title'].lower().replace(' ', '_')}"
-        test_module_path = f"src.test.python.{test_module_name}"
+        test_module_name = self._test_module_name(scenario)
 
         try:
-            # Add the src/test/python directory to Python path
-            test_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../test/python'))
-            if test_dir not in sys.path:
-                sys.path.append(test_dir)
-
-            # Import the test module
-            test_module = importlib.import_module(test_module_name)
-
-            # Create a test suite
-            suite = unittest.TestLoader().loadTestsFromModule(test_module)
+            suite = self._load_suite(scenario)
+            if test_ids is not None or excluded_ids:
+                tests = list(self._iter_tests(suite))
+                suite = unittest.TestSuite(
+                    test for test in tests
+                    if (test_ids is None or test.id() in test_ids) and test.id() not in (excluded_ids or ())
+                )
+                if tests and not suite.countTestCases() and excluded_ids:
+                    # Every selected test is quarantined and runs in the quarantine pool instead
+                    return scenario_result
 
             if not suite or not hasattr(suite, '_tests') or not suite._tests:
                 print(f"No valid tests found in module {test_module_name} for scenario {scenario['requirement_title']}")
-                scenario_result['failed_tests'] += 1
-                scenario_result['test_cases'].append({
-                    'name': 'no_tests_found',
-                    'status': 'FAILED',
-                    'error': 'No valid tests found in module.'
-                })
+                self._record_failure(scenario_result, 'no_tests_found', 'No valid tests found in module.', sink)
             else:
-                # Run the tests
-                result = unittest.TestResult()
+                # Run the tests, streaming each timed result to the sink as it completes
+                result = TimingTestResult(sink, scenario)
                 suite.run(result)
+                outcomes = self._final_outcomes(result.records)
 
-                # Process results
-                for test in result.failures + result.errors:
-                    test_case = {
-                        'name': test[0].id().split('.')[-1],
-                        'status': 'FAILED',
-                        'error': str(test[1])
-                    }
-                    scenario_result['test_cases'].append(test_case)
-                    scenario_result['failed_tests'] += 1
-
-                # Add successful tests
-                successful_tests = result.testsRun - len(result.failures) - len(result.errors)
-                scenario_result['passed_tests'] = successful_tests
-                
-                # Add successful tests
-                all_test_names = set()
-                for test in suite:
-                    try:
-                        all_test_names.add(test.id().split('.')[-1])
-                    except Exception:
-                        pass
-                failed_test_names = set(t['name'] for t in scenario_result['test_cases'])
-                for test_name in all_test_names - failed_test_names:
-                    test_case = {
-                        'name': test_name,
-                        'status': 'PASSED',
-                        'error': None
-                    }
-                    scenario_result['test_cases'].append(test_case)
+                # Rerun only the failed tests, in this worker, up to max_retries times
+                for attempt in range(2, self.max_retries + 2):
+                    failed_ids = [test_id for test_id, record in outcomes.items()
+                                  if record['status'] == 'FAILED' and self._is_rerunnable(test_id)]
+                    if not failed_ids:
+                        break
+                    retry = TimingTestResult(sink, scenario, attempt)
+                    unittest.TestLoader().loadTestsFromNames(failed_ids).run(retry)
+                    outcomes.update(self._final_outcomes(retry.records))
+
+                for test_id, record in outcomes.items():
+                    scenario_result['test_cases'].append({
+                        'test': test_id,
+                        'name': record['name'],
+                        'status': record['status'],
+                        'error': record['error'],
+                        'duration': record['duration'],
+                        'phases': record.get('phases'),
+                        'commands': record.get('commands'),
+                        'wait_seconds': record.get('wait_seconds'),
+                        'attempts': record['attempt'],
+                        'flaky': record['status'] == 'PASSED' and record['attempt'] > 1
+                    })
+                    if record['status'] == 'FAILED':
+                        scenario_result['failed_tests'] += 1
+                    else:
+                        scenario_result['passed_tests'] += 1
 
         except Exception as e:
             print(f"Error executing tests for scenario {scenario['requirement_title']}: {str(e)}")
-            scenario_result['failed_tests'] += 1
-            scenario_result['test_cases'].append({
-                'name': 'module_import',
-                'status': 'FAILED',
-                'error': str(e)
-            })
+            self._record_failure(scenario_result, 'module_import', str(e), sink)
 
         return scenario_result
 
+    def _final_outcomes(self, records: List[Dict]) -> Dict[str, Dict]:
+        """One record per test id; a test with any failed record (e.g. a subtest) failed"""
+        outcomes: Dict[str, Dict] = {}
+        for record in records:
+            if record['test'] not in outcomes or record['status'] == 'FAILED':
+                outcomes[record['test']] = record
+        return outcomes
+
+    def _is_rerunnable(self, test_id: str) -> bool:
+        # setUpClass/setUpModule errors are reported as 'setUpClass (module.Class)'
+        return ' ' not in test_id
+
+    def _test_module_name(self, scenario: Dict) -> str:
+        return f"test_{scenario['requirement_title'].lower().replace(' ', '_')}"
+
+    def _load_suite(self, scenario: Dict) -> unittest.TestSuite:
+        # Add the src/test/python directory to Python path
+        test_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../test/python'))
+        if test_dir not in sys.path:
+            sys.path.append(test_dir)
+
+        # Import the test module and create a test suite
+        test_module = importlib.import_module(self._test_module_name(scenario))
+        return unittest.TestLoader().loadTestsFromModule(test_module)
+
+    def _iter_tests(self, suite):
+        for test in suite:
+            if isinstance(test, unittest.TestSuite):
+                yield from self._iter_tests(test)
+            else:
+                yield test
+
+    def _record_failure(self, scenario_result: Dict, name: str, error: str, sink: Optional[JsonlResultSink]):
+        """Record a failure that happened outside any test method"""
+        scenario_result['failed_tests'] += 1
+        scenario_result['test_cases'].append({
+            'name': name,
+            'status': 'FAILED',
+            'error': error,
+            'duration': None
+        })
+        if sink is not None:
+            sink.write({
+                'requirement_id': scenario_result['requirement_id'],
+                'requirement_title': scenario_result['requirement_title'],
+                'test': name,
+                'name': name,
+                'status': 'FAILED',
+                'error': error,
+                'duration': None,
+                'finished_at': datetime.now().isoformat()
+            })
+
     def _save_test_results(self, results: Dict):
         """
-        Save test results to a file
+        Save a compact run summary next to the JSON Lines results file
         
         Args:
             results (Dict): Test execution results
         """
-        # Create results directory if it doesn't exist
-        os.makedirs('test-results', exist_ok=True)
-        
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'test-results/test_execution_{timestamp}.json'
-        
-        # Save results as JSON
-        with open(filename, 'w') as f:
-            json.dump(results, f, indent=2)
\ No newline at end of file
+        summary = {
+            'execution_time': results['execution_time'],
+            'results_file': results['results_file'],
+            'shard': results.get('shard'),
+            'duration_seconds': results.get('duration_seconds'),
+            'total_scenarios': results['total_scenarios'],
+            'scenarios_run': len(results['scenario_results']),
+            'scenarios_skipped': len(results['skipped_scenarios']),
+            'passed_tests': results['passed_tests'],
+            'failed_tests': results['failed_tests'],
+            'flaky_tests': results['flaky_tests'],
+            'quarantine': {
+                'results_file': results['quarantine']['results_file'],
+                'passed_tests': results['quarantine']['passed_tests'],
+                'failed_tests': results['quarantine']['failed_tests']
+            },
+            'scenarios': [
+                {
+                    'requirement_id': scenario_result['requirement_id'],
+                    'requirement_title': scenario_result['requirement_title'],
+                    'passed_tests': scenario_result['passed_tests'],
+                    'failed_tests': scenario_result['failed_tests']
+                }
+                for scenario_result in results['scenario_results']
+            ],
+            'skipped_scenarios': results['skipped_scenarios'],
+            'slowest': results.get('slowest')
+        }
+        write_summary(results['results_file'].replace('.jsonl', '_summary.json'), summary)
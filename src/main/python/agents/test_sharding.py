@@ -0,0 +1,99 @@
+import glob
+import os
+import re
+from statistics import median
+from typing import Dict, List, Optional, Tuple
+
+from agents.result_sink import iter_results
+
+DEFAULT_HISTORY_PATTERN = os.path.join('test-results', 'test_execution_*.jsonl')
+SHARD_SPEC = re.compile(r"^\s*(\d+)\s*/\s*(\d+)\s*$")
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """
+    Parse a 'i/N' shard spec (1-based)
+
+    Returns:
+        Tuple[int, int]: Zero-based shard index and shard count
+
+    Raises:
+        ValueError: If the spec is malformed or i is not in 1..N
+    """
+    match = SHARD_SPEC.match(spec or '')
+    if not match:
+        raise ValueError(f"Invalid shard '{spec}', expected i/N such as 1/4")
+    index, count = int(match.group(1)), int(match.group(2))
+    if not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{spec}', i must be between 1 and N")
+    return index - 1, count
+
+
+def load_durations(pattern: Optional[str] = None, granularity: str = 'method') -> Dict[str, float]:
+    """
+    Average historical durations from earlier JSON Lines results
+
+    Args:
+        pattern (Optional[str]): Glob of result files (TEST_DURATIONS_PATH)
+        granularity (str): 'method' keys by test id, 'module' by test module
+            name, summing the mean durations of its tests
+
+    Returns:
+        Dict[str, float]: Mean duration in seconds by test id or module
+    """
+    pattern = pattern or os.getenv('TEST_DURATIONS_PATH', DEFAULT_HISTORY_PATTERN)
+    if not glob.glob(pattern):
+        return {}
+    totals: Dict[str, float] = {}
+    samples: Dict[str, int] = {}
+    for record in iter_results(pattern):
+        duration = record.get('duration')
+        test_id = record.get('test') or ''
+        if duration is None or '.' not in test_id:
+            continue
+        totals[test_id] = totals.get(test_id, 0.0) + duration
+        samples[test_id] = samples.get(test_id, 0) + 1
+    durations = {test_id: totals[test_id] / samples[test_id] for test_id in totals}
+    if granularity == 'method':
+        return durations
+    modules: Dict[str, float] = {}
+    for test_id, duration in durations.items():
+        module = test_id.split('.', 1)[0]
+        modules[module] = modules.get(module, 0.0) + duration
+    return modules
+
+
+def assign_shards(items: List[str], count: int, durations: Optional[Dict[str, float]] = None) -> List[List[str]]:
+    """
+    Split items into count shards with about equal expected run time
+
+    Greedy longest-processing-time: items are taken longest first and each is
+    given to the currently shortest shard. Items without history are assumed
+    to take the median known duration. With no history at all the items are
+    dealt round-robin, so shards get equal counts. Ties are broken by name so
+    every CI node computes the same assignment from the same history.
+
+    Args:
+        items (List[str]): Test ids or module names
+        count (int): Number of shards
+        durations (Optional[Dict[str, float]]): Historical duration by item
+
+    Returns:
+        List[List[str]]: Items of each shard, in their original order
+    """
+    durations = durations or {}
+    known = [durations[item] for item in items if item in durations]
+    shards: List[List[str]] = [[] for _ in range(count)]
+    if not known:
+        for position, item in enumerate(sorted(items)):
+            shards[position % count].append(item)
+    else:
+        fallback = median(known)
+        loads = [0.0] * count
+        for item in sorted(items, key=lambda item: (-durations.get(item, fallback), item)):
+            shard = min(range(count), key=lambda index: (loads[index], index))
+            shards[shard].append(item)
+            loads[shard] += durations.get(item, fallback)
+    order = {item: position for position, item in enumerate(items)}
+    return [sorted(shard, key=order.__getitem__) for shard in shards]
+
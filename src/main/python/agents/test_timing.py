@@ -0,0 +1,248 @@
+"""
+Per-phase test timing and WebDriver command latency.
+
+TimingTestResult adds setUp / test body / tearDown wall time to every result
+record. With WEBDRIVER_COMMAND_TIMING=true, drivers built by create_driver are
+wrapped in an EventFiringWebDriver whose CommandTimingListener, together with
+instrumented WebDriverWait.until/until_not, attributes command latency and
+explicit-wait time to the test that is running.
+
+Usage: python src/main/python/agents/test_timing.py [results.jsonl ...] [--top N]
+"""
+import os
+import sys
+import threading
+import time
+from typing import Dict, Iterable, Union
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from selenium.webdriver.support.abstract_event_listener import AbstractEventListener
+
+from agents.result_sink import StreamingTestResult, iter_results
+
+# TestCase hooks wrapped per test; present since Python 3.8
+PHASE_HOOKS = (('_callSetUp', 'setUp'), ('_callTestMethod', 'test'), ('_callTearDown', 'tearDown'))
+
+_collector = threading.local()
+
+
+def command_timing_enabled() -> bool:
+    return os.getenv('WEBDRIVER_COMMAND_TIMING', 'false').lower() == 'true'
+
+
+def begin_command_timing() -> Dict[str, Dict]:
+    """Start attributing commands on this thread to a new collector"""
+    _collector.commands = {}
+    _collector.pending = None
+    return _collector.commands
+
+
+def end_command_timing() -> Dict[str, Dict]:
+    commands = getattr(_collector, 'commands', None) or {}
+    _collector.commands = None
+    return commands
+
+
+def record_command(command: str, seconds: float):
+    commands = getattr(_collector, 'commands', None)
+    if commands is None:
+        return
+    stats = commands.setdefault(command, {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+    stats['count'] += 1
+    stats['seconds'] += seconds
+    stats['max_seconds'] = max(stats['max_seconds'], seconds)
+
+
+class CommandTimingListener(AbstractEventListener):
+    """Times navigation, element lookup, clicks, typing and scripts"""
+
+    def _begin(self, command: str):
+        _collector.pending = (command, time.perf_counter())
+
+    def _end(self):
+        pending = getattr(_collector, 'pending', None)
+        if pending:
+            _collector.pending = None
+            record_command(pending[0], time.perf_counter() - pending[1])
+
+    def before_navigate_to(self, url, driver):
+        self._begin('get')
+
+    def after_navigate_to(self, url, driver):
+        self._end()
+
+    def before_find(self, by, value, driver):
+        self._begin('find_element')
+
+    def after_find(self, by, value, driver):
+        self._end()
+
+    def before_click(self, element, driver):
+        self._begin('click')
+
+    def after_click(self, element, driver):
+        self._end()
+
+    def before_change_value_of(self, element, driver):
+        self._begin('send_keys')
+
+    def after_change_value_of(self, element, driver):
+        self._end()
+
+    def before_execute_script(self, script, driver):
+        self._begin('execute_script')
+
+    def after_execute_script(self, script, driver):
+        self._end()
+
+    def on_exception(self, exception, driver):
+        # A lookup that exhausts the implicit wait still cost its time
+        self._end()
+
+
+def _timed_wait(original, command: str):
+    def wait(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            record_command(command, time.perf_counter() - started)
+    wait._timed = True
+    return wait
+
+
+def instrument_driver(driver):
+    """Wrap a driver for command timing and time explicit waits"""
+    from selenium.webdriver.support.event_firing_webdriver import EventFiringWebDriver
+    from selenium.webdriver.support.wait import WebDriverWait
+
+    if not getattr(WebDriverWait.until, '_timed', False):
+        WebDriverWait.until = _timed_wait(WebDriverWait.until, 'wait')
+        WebDriverWait.until_not = _timed_wait(WebDriverWait.until_not, 'wait')
+    return EventFiringWebDriver(driver, CommandTimingListener())
+
+
+class TimingTestResult(StreamingTestResult):
+    """
+    StreamingTestResult that adds 'phases' (setUp, test, tearDown seconds),
+    'commands' (count, seconds and max_seconds per WebDriver command) and
+    'wait_seconds' to each record.
+    """
+
+    def __init__(self, sink, scenario: Dict, attempt: int = 1):
+        super().__init__(sink, scenario, attempt)
+        self._phases: Dict[str, Dict[str, float]] = {}
+        self._commands: Dict[str, Dict] = {}
+
+    def startTest(self, test):
+        phases = self._phases[test.id()] = {}
+        for hook, phase in PHASE_HOOKS:
+            original = getattr(test, hook, None)
+            if original is not None:
+                setattr(test, hook, self._timed_phase(original, phase, phases))
+        self._commands[test.id()] = begin_command_timing()
+        super().startTest(test)
+
+    def stopTest(self, test):
+        end_command_timing()
+        super().stopTest(test)
+        for hook, _ in PHASE_HOOKS:
+            # Drop the instance wrappers so the TestCase is left as it was
+            test.__dict__.pop(hook, None)
+
+    def _describe(self, test) -> Dict:
+        commands = self._commands.pop(test.id(), {})
+        return {
+            'phases': {phase: round(seconds, 6) for phase, seconds in self._phases.pop(test.id(), {}).items()},
+            'commands': commands,
+            'wait_seconds': round(commands.get('wait', {}).get('seconds', 0.0), 6)
+        }
+
+    @staticmethod
+    def _timed_phase(original, phase: str, phases: Dict[str, float]):
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                phases[phase] = phases.get(phase, 0.0) + time.perf_counter() - started
+        return timed
+
+
+def slowest_report(paths: Union[str, Iterable[str]], top: int = 10) -> Dict:
+    """
+    Find the slowest tests and WebDriver commands in JSON Lines results
+
+    The attempts of a retried test are folded into one entry per run: its
+    duration and phases are summed over the attempts and 'attempts' says
+    how many there were.
+
+    Args:
+        paths (Union[str, Iterable[str]]): Result files or glob patterns
+        top (int): Entries to keep per list
+
+    Returns:
+        Dict: 'tests' (slowest test runs with their phases and attempts) and
+            'commands' (commands by total time, with count, average and max)
+    """
+    tests = []
+    # The entry of each test's latest run, still collecting retry attempts
+    running: Dict[str, Dict] = {}
+    commands: Dict[str, Dict] = {}
+    for record in iter_results(paths):
+        if record.get('duration') is not None:
+            entry = running.get(record['test'])
+            if entry is None or (record.get('attempt') or 1) <= 1:
+                # A first attempt starts a new run of the test
+                if entry is not None:
+                    tests.append(entry)
+                entry = running[record['test']] = {'test': record['test'], 'duration': 0.0, 'attempts': 0, 'phases': {}}
+            entry['duration'] += record['duration']
+            entry['attempts'] += 1
+            for phase, seconds in (record.get('phases') or {}).items():
+                entry['phases'][phase] = entry['phases'].get(phase, 0.0) + seconds
+            # Keep memory bounded on large histories
+            if len(tests) > top * 4:
+                tests = sorted(tests, key=lambda entry: entry['duration'], reverse=True)[:top]
+        for command, stats in (record.get('commands') or {}).items():
+            total = commands.setdefault(command, {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+            total['count'] += stats['count']
+            total['seconds'] += stats['seconds']
+            total['max_seconds'] = max(total['max_seconds'], stats['max_seconds'])
+    tests.extend(running.values())
+    return {
+        'tests': [
+            dict(entry, duration=round(entry['duration'], 6),
+                 phases={phase: round(seconds, 6) for phase, seconds in entry['phases'].items()})
+            for entry in sorted(tests, key=lambda entry: entry['duration'], reverse=True)[:top]
+        ],
+        'commands': [
+            dict(stats, command=command, average_seconds=stats['seconds'] / stats['count'])
+            for command, stats in sorted(commands.items(), key=lambda item: -item[1]['seconds'])[:top]
+        ]
+    }
+
+
+def print_slowest_report(report: Dict):
+    print("Slowest tests:")
+    for entry in report['tests']:
+        phases = ', '.join(f"{phase} {seconds:.2f}s" for phase, seconds in entry['phases'].items())
+        retries = entry.get('attempts', 1) - 1
+        print(f"  {entry['duration']:8.2f}s  {entry['test']}" + (f"  ({phases})" if phases else '')
+              + (f"  [{retries} {'retry' if retries == 1 else 'retries'}]" if retries else ''))
+    if report['commands']:
+        print("Slowest WebDriver commands (total time):")
+        for entry in report['commands']:
+            print(f"  {entry['seconds']:8.2f}s  {entry['command']:<15} {entry['count']:6d} calls  "
+                  f"avg {entry['average_seconds']:.3f}s  max {entry['max_seconds']:.3f}s")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Report the slowest tests and WebDriver commands")
+    parser.add_argument('paths', nargs='*', default=[os.path.join('test-results', 'test_execution_*.jsonl')])
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+    print_slowest_report(slowest_report(args.paths, args.top))
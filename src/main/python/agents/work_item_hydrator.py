@@ -0,0 +1,92 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterator, List, Optional, Sequence
+
+# Azure DevOps rejects get_work_items calls carrying more than 200 ids
+MAX_IDS_PER_REQUEST = 200
+
+# The only fields the pipeline reads from a requirement work item
+REQUIREMENT_FIELDS = [
+    'System.Id',
+    'System.Title',
+    'System.Description',
+    'Microsoft.VSTS.Common.AcceptanceCriteria'
+]
+
+
+class WorkItemHydrator:
+    """
+    Turns WIQL id lists into work items using service-sized, concurrently
+    fetched chunks that only carry the projected fields.
+    """
+
+    def __init__(self, wit_client, fields: Optional[List[str]] = None,
+                 chunk_size: int = MAX_IDS_PER_REQUEST, max_workers: int = 8,
+                 project: Optional[str] = None):
+        if not 0 < chunk_size <= MAX_IDS_PER_REQUEST:
+            raise ValueError(f"chunk_size must be between 1 and {MAX_IDS_PER_REQUEST}")
+        self.wit_client = wit_client
+        self.fields = list(fields) if fields else list(REQUIREMENT_FIELDS)
+        self.chunk_size = chunk_size
+        self.max_workers = max(1, max_workers)
+        self.project = project
+
+    def hydrate(self, ids: Sequence[int]) -> List:
+        """
+        Fetch work items for the given ids
+
+        Args:
+            ids (Sequence[int]): Work item ids in WIQL order
+
+        Returns:
+            List: Work items in the same order as ids; deleted items are omitted
+        """
+        return list(self.iter_hydrate(ids))
+
+    def iter_hydrate(self, ids: Sequence[int]) -> Iterator:
+        """
+        Lazily fetch work items for the given ids, yielding them in WIQL order
+        as soon as the chunk holding them (and every chunk before it) arrives.
+        At most max_workers chunks are in flight at any time.
+
+        Args:
+            ids (Sequence[int]): Work item ids in WIQL order
+
+        Yields:
+            Work items in the same order as ids
+        """
+        chunks = (list(ids[start:start + self.chunk_size])
+                  for start in range(0, len(ids), self.chunk_size))
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        pending = deque(pool.submit(self._fetch_chunk, chunk)
+                        for chunk in islice(chunks, self.max_workers))
+        try:
+            while pending:
+                work_items = pending.popleft().result()
+                for chunk in islice(chunks, 1):
+                    pending.append(pool.submit(self._fetch_chunk, chunk))
+                yield from work_items
+        finally:
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=True)
+
+    def _fetch_chunk(self, chunk: List[int]) -> List:
+        """
+        Fetch a single chunk and restore the requested id order
+
+        Args:
+            chunk (List[int]): At most chunk_size work item ids
+
+        Returns:
+            List: Work items ordered like chunk
+        """
+        work_items = self.wit_client.get_work_items(
+            ids=chunk,
+            project=self.project,
+            fields=self.fields,
+            error_policy="omit"
+        )
+        by_id = {work_item.id: work_item for work_item in work_items or [] if work_item is not None}
+        return [by_id[work_item_id] for work_item_id in chunk if work_item_id in by_id]
@@ -0,0 +1,122 @@
+"""
+Per-test wall time for each browser profile in browser_profiles.json.
+
+Each profile runs the same simulated test (lease a pooled session, open a
+page, wait for an element, release) against a local page whose images,
+fonts and analytics script are served with a delay, so the effect of
+headless mode, image/extension blocking, the eager page-load strategy and
+blocked URLs is visible without network access. Requires Chrome.
+
+Usage: python src/main/python/benchmarks/bench_browser_profiles.py [tests_per_profile] [asset_delay_seconds] [profile ...]
+"""
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from agents.browser_profile import create_driver, load_browser_profiles
+from agents.driver_pool import DriverPool
+
+ASSET_COUNT = 20
+PAGE = """<!DOCTYPE html>
+<html><head>
+<style>@font-face {{ font-family: Bench; src: url('/assets/font.woff2'); }} body {{ font-family: Bench; }}</style>
+<script async src="/www.google-analytics.com/analytics.js"></script>
+</head><body>
+<h1>Inventory</h1>
+{images}
+<button id="add-to-cart">Add to cart</button>
+</body></html>
+"""
+
+
+class SlowAssetServer:
+    """Serves the page immediately and every other resource after a delay"""
+
+    def __init__(self, asset_delay: float):
+        self.asset_delay = asset_delay
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == '/':
+                    images = '\n'.join(f'<img src="/assets/image{index}.png">' for index in range(ASSET_COUNT))
+                    body = PAGE.format(images=images).encode()
+                    content_type = 'text/html'
+                else:
+                    time.sleep(server.asset_delay)
+                    body = b'\0' * 2048
+                    content_type = 'application/octet-stream'
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+def run_profile(profile, url: str, tests: int):
+    pool = DriverPool(driver_factory=lambda: create_driver(profile), max_size=1)
+    durations = []
+    try:
+        for _ in range(tests):
+            started = time.perf_counter()
+            driver = pool.lease()
+            try:
+                driver.get(url)
+                WebDriverWait(driver, profile.explicit_wait).until(
+                    EC.element_to_be_clickable((By.ID, "add-to-cart"))
+                ).click()
+            finally:
+                pool.release(driver)
+            durations.append(time.perf_counter() - started)
+    finally:
+        pool.close(report=False)
+    return durations
+
+
+def main():
+    tests = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    asset_delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+    profiles = load_browser_profiles()
+    names = sys.argv[3:] or list(profiles)
+
+    with SlowAssetServer(asset_delay) as server:
+        for name in names:
+            durations = run_profile(profiles[name], server.url, tests)
+            warm = durations[1:] or durations
+            print(f"{name:<10} first test {durations[0]:6.2f}s  warm average {sum(warm) / len(warm):6.2f}s  "
+                  f"total {sum(durations):6.2f}s over {tests} tests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Python and Java code generation throughput over synthetic scenarios: the
+former per-call Template(...) compile against the shared precompiled
+environment, then full generation to disk (first run, and an unchanged
+rerun that the incremental writer skips), serially and with the parallel
+GenerationEngine. Java locator lookups, which need a browser, are
+stubbed out.
+
+Usage: python src/main/python/benchmarks/bench_code_generation.py [scenarios] [workers]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jinja2 import Template
+
+from agents import java_test_generator
+from agents.code_templates import PYTHON_PAGE_OBJECT_SOURCE, PYTHON_TEST_CLASS_SOURCE, TEMPLATE_ENVIRONMENT
+from agents.generation_engine import GenerationEngine
+from agents.test_automation_generator import TestAutomationGenerator
+
+
+def synthetic_scenarios(count: int) -> List[Dict]:
+    return [
+        {
+            'requirement_id': index,
+            'requirement_title': f"Synthetic Requirement {index}",
+            'test_cases': [
+                {'title': f"Case {index} {case}", 'steps': [f"self.page.step_{case}()"]}
+                for case in range(3)
+            ]
+        }
+        for index in range(count)
+    ]
+
+
+def render_context(scenario: Dict) -> Dict:
+    title = scenario['requirement_title']
+    return {
+        'class_name': f"{title.replace(' ', '')}Page",
+        'elements': [],
+        'actions': [{'name': 'navigate_to', 'description': 'Navigate to the page', 'params': 'url',
+                     'implementation': 'self.driver.get(url)'}],
+        'test_class_name': f"Test{title.replace(' ', '')}",
+        'page_class': f"{title.replace(' ', '')}Page",
+        'page_class_file': f"{title.lower().replace(' ', '_')}_page",
+        'test_cases': [{'name': case['title'].lower().replace(' ', '_'), 'description': case['title'],
+                        'steps': case['steps']} for case in scenario['test_cases']]
+    }
+
+
+def measure(label: str, files: int, run):
+    started = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<36} {files:7d} files  {elapsed:7.2f}s  {files / elapsed:10.0f} files/s")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    scenarios = synthetic_scenarios(count)
+    contexts = [render_context(scenario) for scenario in scenarios]
+
+    def compile_per_call():
+        for context in contexts:
+            Template(PYTHON_PAGE_OBJECT_SOURCE).render(**context)
+            Template(PYTHON_TEST_CLASS_SOURCE).render(**context)
+
+    def precompiled():
+        page_object = TEMPLATE_ENVIRONMENT.get_template('python_page_object.py.j2')
+        test_class = TEMPLATE_ENVIRONMENT.get_template('python_test_class.py.j2')
+        for context in contexts:
+            page_object.render(**context)
+            test_class.render(**context)
+
+    print(f"{count} scenarios")
+    measure("render, Template per call", 2 * count, compile_per_call)
+    measure("render, precompiled environment", 2 * count, precompiled)
+
+    workdir = tempfile.mkdtemp(prefix='bench_codegen_')
+    cwd = os.getcwd()
+    java_test_generator.lookup_locators = lambda action_texts: {}
+    os.environ['GENERATION_MANIFEST_PATH'] = os.path.join(workdir, 'generation_manifest.json')
+    try:
+        os.chdir(workdir)
+        generator = TestAutomationGenerator()
+        measure("python generation to disk", 2 * count, lambda: generator.generate_test_automation(scenarios))
+        measure("python generation, unchanged rerun", 2 * count,
+                lambda: generator.generate_test_automation(scenarios))
+        measure("java generation to disk", 2 * count, lambda: java_test_generator.generate_java_tests(scenarios))
+
+        os.chdir(tempfile.mkdtemp(dir=workdir))
+        os.environ['GENERATION_MANIFEST_PATH'] = os.path.join(os.getcwd(), 'generation_manifest.json')
+        engine = GenerationEngine(workers=workers, locator_lookup=lambda action_texts: {})
+        measure(f"engine, {workers} workers, to disk", 4 * count, lambda: engine.generate(scenarios))
+        measure(f"engine, {workers} workers, unchanged", 4 * count, lambda: engine.generate(scenarios))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
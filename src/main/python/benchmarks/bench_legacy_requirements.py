@@ -0,0 +1,51 @@
+"""
+Round trips and wall-clock time of the legacy AzureDevOpsIntegration.get_requirements
+against a local fake ADO server, compared with the per-item get_work_item loop it replaced.
+
+Usage: python src/main/python/benchmarks/bench_legacy_requirements.py [items]
+"""
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../..'))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(REPO_ROOT)
+
+from benchmarks.fake_ado_server import FakeAdoServer, FakeConnection, FakeWitClient, make_work_items
+from src.main.java.com.crewai.automation.AzureDevOpsIntegration import AzureDevOpsIntegration
+
+
+def per_item_loop(client: FakeWitClient):
+    """The original N+1 strategy: one get_work_item call per WIQL result"""
+    for item in client.query_by_wiql(None).work_items:
+        work_item = client.get_work_item(item.id)
+        yield {'id': work_item.id, 'title': work_item.fields['System.Title']}
+
+
+def run(label: str, requirements_factory, server: FakeAdoServer):
+    client = FakeWitClient(server.url)
+    started = time.perf_counter()
+    first = None
+    count = 0
+    for _ in requirements_factory(client):
+        if first is None:
+            first = time.perf_counter() - started
+        count += 1
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed:8.2f}s total  {first or 0:6.3f}s to first  "
+          f"{client.request_count:6d} round trips  {count} requirements")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    with FakeAdoServer(make_work_items(count), latency=0.01) as server:
+        print(f"Fetching {count} requirements (fake server at {server.url})\n")
+        run("get_work_item per item", per_item_loop, server)
+        run("batched get_requirements",
+            lambda client: AzureDevOpsIntegration(FakeConnection(client), 'Benchmark').get_requirements(),
+            server)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Compare sequential and async RequirementsAnalyzer runs against a local mock
+completion server with injected latency.
+
+Usage: python src/main/python/benchmarks/bench_llm_fanout.py [requirements] [latency_seconds] [concurrency]
+"""
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import openai
+from agents.requirements_analyzer import RequirementsAnalyzer
+from benchmarks.mock_completion_server import MockCompletionServer
+
+
+def make_requirements(count: int):
+    return [
+        {
+            'id': requirement_id,
+            'title': f"Requirement {requirement_id}",
+            'description': f"Users can complete workflow {requirement_id}",
+            'acceptance_criteria': f"Workflow {requirement_id} succeeds for valid input"
+        }
+        for requirement_id in range(1, count + 1)
+    ]
+
+
+def report(label: str, elapsed: float, scenarios, requirements, server: MockCompletionServer):
+    in_order = [scenario['requirement_id'] for scenario in scenarios] == [req['id'] for req in requirements]
+    test_cases = sum(len(scenario['test_cases']) for scenario in scenarios)
+    print(f"{label:<34} {elapsed:7.2f}s  {server.request_count:4d} requests  max in flight {server.max_in_flight:3d}  "
+          f"{test_cases} test cases  order preserved: {in_order}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 16
+    requirements = make_requirements(count)
+
+    for label, run in [
+        ("sequential analyze_requirements", lambda analyzer: list(analyzer.analyze_requirements(requirements))),
+        (f"async, concurrency {concurrency}",
+         lambda analyzer: asyncio.run(analyzer.analyze_requirements_async(requirements, max_concurrency=concurrency))),
+    ]:
+        with MockCompletionServer(latency=latency) as server, tempfile.TemporaryDirectory() as cache_dir:
+            openai.base_url = server.base_url
+            os.environ['OPENAI_API_KEY'] = 'benchmark'
+            # Every leg asks the mock server itself and leaves the real response cache alone
+            os.environ['LLM_CACHE_BYPASS'] = 'true'
+            os.environ['LLM_CACHE_PATH'] = os.path.join(cache_dir, 'llm_responses.db')
+            with contextlib.redirect_stdout(io.StringIO()):
+                analyzer = RequirementsAnalyzer()
+                started = time.perf_counter()
+                scenarios = run(analyzer)
+                elapsed = time.perf_counter() - started
+            report(label, elapsed, scenarios, requirements, server)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Locator lookup time on a large local inventory page: live WebDriver queries
+(a round trip per element with an id) against one DomSnapshot answering
+every action from its in-memory indexes. Requires Chrome.
+
+Usage: python src/main/python/benchmarks/bench_locator_lookup.py [products] [actions]
+"""
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.browser_profile import create_driver, load_browser_profile
+from agents.dom_snapshot import DomSnapshot
+from agents.locator_suggester import find_locators
+
+PRODUCT = """<div class="item" id="item_{index}">
+<span id="item_{index}_title" data-test="item-{index}-title">Product {index}</span>
+<button id="add-to-cart-product-{index}" data-test="add-to-cart-product-{index}">Add to cart</button>
+<a href="#" id="item_{index}_details" aria-label="Details of product {index}">Details</a>
+</div>"""
+
+
+def serve_page(products: int) -> ThreadingHTTPServer:
+    page = ("<!DOCTYPE html><html><body><h1>Inventory</h1><button id='checkout'>Checkout</button>"
+            + ''.join(PRODUCT.format(index=index) for index in range(products))
+            + "</body></html>").encode('utf-8')
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    products = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    action_count = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    actions = ['Checkout', 'Add to cart'] + [f"product {index}" for index in range(action_count - 2)]
+
+    server = serve_page(products)
+    driver = create_driver(load_browser_profile(os.getenv('BROWSER_PROFILE', 'headless')))
+    try:
+        host, port = server.server_address
+        driver.get(f"http://{host}:{port}/")
+        driver.implicitly_wait(0)
+
+        started = time.perf_counter()
+        live = {action: find_locators(driver, action) for action in actions}
+        live_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        snapshot = DomSnapshot.capture(driver)
+        capture_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        indexed = {action: snapshot.find(action) for action in actions}
+        find_seconds = time.perf_counter() - started
+    finally:
+        driver.quit()
+        server.shutdown()
+
+    print(f"{products} products, {len(snapshot.elements)} indexed elements, {len(actions)} actions")
+    print(f"live queries          {live_seconds:8.2f}s")
+    print(f"snapshot capture      {capture_seconds:8.2f}s")
+    print(f"snapshot lookups      {find_seconds:8.4f}s")
+    for action in actions:
+        live_ids = {locator['value'] for locator in live[action] if locator['by'] == 'ID'}
+        indexed_ids = {locator['value'] for locator in indexed[action] if locator['by'] == 'ID'}
+        if not live_ids <= indexed_ids:
+            print(f"  '{action}': live found ids the snapshot missed: {sorted(live_ids - indexed_ids)[:5]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Parse throughput and recovered-case rate over a corpus of recorded scenario
+responses, for the original regex parser, the single-pass free-text parser
+and the structured (JSON tool call) parser.
+
+Usage: python src/main/python/benchmarks/bench_scenario_parsing.py [repetitions] [corpus.json]
+"""
+import os
+import sys
+import time
+from typing import Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.scenario_schema import parse_structured_test_cases
+from agents.scenario_stream_parser import ScenarioStreamParser
+from benchmarks.scenario_corpus import DEFAULT_CORPUS, load_corpus, regex_parse
+
+
+def measure(label: str, parse, entries: List[Dict], repetitions: int):
+    expected = sum(entry['expected_cases'] for entry in entries)
+    recovered = 0
+    complete = 0
+    for entry in entries:
+        test_cases = parse(entry['content'])
+        recovered += min(len(test_cases), entry['expected_cases'])
+        complete += sum(1 for test_case in test_cases if test_case['steps'] and test_case['expected_results'])
+    size = sum(len(entry['content']) for entry in entries)
+
+    started = time.perf_counter()
+    for _ in range(repetitions):
+        for entry in entries:
+            parse(entry['content'])
+    elapsed = time.perf_counter() - started
+
+    responses_per_second = len(entries) * repetitions / elapsed
+    megabytes_per_second = size * repetitions / elapsed / 1e6
+    print(f"{label:<22} {len(entries):3d} responses  {responses_per_second:10.0f} responses/s  "
+          f"{megabytes_per_second:6.1f} MB/s  recovered {recovered}/{expected} "
+          f"({recovered / expected:6.1%})  with steps+results {complete}")
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    corpus_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_CORPUS
+    text_entries = load_corpus(corpus_path, 'text')
+    json_entries = load_corpus(corpus_path, 'json')
+
+    measure("regex (text)", regex_parse, text_entries, repetitions)
+    measure("single-pass (text)", ScenarioStreamParser.parse, text_entries, repetitions)
+    if json_entries:
+        measure("structured (json)", lambda content: parse_structured_test_cases(content)[0],
+                json_entries, repetitions)
+
+
+if __name__ == "__main__":
+    main()
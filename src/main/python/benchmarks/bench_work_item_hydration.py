@@ -0,0 +1,61 @@
+"""
+Compare work item hydration strategies against a local fake ADO server.
+
+Usage: python src/main/python/benchmarks/bench_work_item_hydration.py [items] [workers]
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.work_item_hydrator import MAX_IDS_PER_REQUEST, WorkItemHydrator
+from benchmarks.fake_ado_server import FakeAdoServer, FakeWitClient, make_work_items
+
+
+def single_call(client: FakeWitClient, ids):
+    """The original strategy: one get_work_items call with $expand=All"""
+    return client.get_work_items(ids=ids, expand="All")
+
+
+def serial_expanded_chunks(client: FakeWitClient, ids):
+    """Closest working variant of the original: serial chunks with $expand=All"""
+    work_items = []
+    for start in range(0, len(ids), MAX_IDS_PER_REQUEST):
+        work_items.extend(client.get_work_items(ids=ids[start:start + MAX_IDS_PER_REQUEST], expand="All"))
+    return work_items
+
+
+def run(label: str, strategy, server: FakeAdoServer, ids):
+    client = FakeWitClient(server.url)
+    server.reset_count()
+    started = time.perf_counter()
+    try:
+        work_items = strategy(client, ids)
+    except Exception as e:
+        print(f"{label:<32} failed: {e}")
+        return
+    elapsed = time.perf_counter() - started
+    in_order = [work_item.id for work_item in work_items] == list(ids)
+    print(f"{label:<32} {elapsed:8.2f}s  {server.request_count:5d} requests  "
+          f"{len(work_items):6d} items  order preserved: {in_order}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    # WIQL order is not id order in general, so shuffle deterministically
+    ids = sorted(range(1, count + 1), key=lambda work_item_id: (work_item_id * 7919) % count)
+
+    with FakeAdoServer(make_work_items(count)) as server:
+        print(f"Hydrating {count} work items (fake server at {server.url})\n")
+        run("single call, $expand=All", single_call, server, ids)
+        run("serial chunks, $expand=All", serial_expanded_chunks, server, ids)
+        run("hydrator, 1 worker",
+            lambda client, ids: WorkItemHydrator(client, max_workers=1).hydrate(ids), server, ids)
+        run(f"hydrator, {workers} workers",
+            lambda client, ids: WorkItemHydrator(client, max_workers=workers).hydrate(ids), server, ids)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Local stand-in for the Azure DevOps work item tracking REST API, used by the
+benchmarks to measure round trips and wall-clock time without a real org.
+"""
+import json
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+MAX_IDS_PER_REQUEST = 200
+
+# Filler carried by every work item when the caller asks for $expand=All
+_EXPANDED_FIELDS = {f"Custom.Field{n}": "x" * 64 for n in range(40)}
+_EXPANDED_RELATIONS = [
+    {"rel": "System.LinkTypes.Hierarchy-Reverse", "url": f"https://example.invalid/{n}", "attributes": {}}
+    for n in range(10)
+]
+
+
+def make_work_items(count: int) -> Dict[int, Dict]:
+    """Build count synthetic committed PBIs keyed by id"""
+    return {
+        work_item_id: {
+            "System.Id": work_item_id,
+            "System.Title": f"Requirement {work_item_id}",
+            "System.Description": f"<div>Description for requirement {work_item_id}</div>",
+            "Microsoft.VSTS.Common.AcceptanceCriteria": f"<ul><li>Criterion for {work_item_id}</li></ul>",
+            "System.State": "Committed",
+            "System.Rev": 1,
+            "System.ChangedDate": "2024-01-01T00:00:00Z",
+        }
+        for work_item_id in range(1, count + 1)
+    }
+
+
+class FakeAdoServer:
+    """
+    Threaded HTTP server serving WIQL and work item reads from memory with
+    an injected per-request latency and a per-item cost.
+    """
+
+    def __init__(self, work_items: Dict[int, Dict], latency: float = 0.05,
+                 per_item_latency: float = 0.0002, expand_penalty: float = 4.0):
+        self.work_items = work_items
+        self.latency = latency
+        self.per_item_latency = per_item_latency
+        self.expand_penalty = expand_penalty
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_count(self):
+        with self._lock:
+            self.request_count = 0
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, body: Dict):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                with server._lock:
+                    server.request_count += 1
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                time.sleep(server.latency)
+                ids = sorted(server.work_items)
+                self._reply(200, {"workItems": [{"id": work_item_id} for work_item_id in ids]})
+
+            def do_GET(self):
+                with server._lock:
+                    server.request_count += 1
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query)
+                if parsed.path.rstrip("/").split("/")[-1].isdigit():
+                    ids = [int(parsed.path.rstrip("/").split("/")[-1])]
+                else:
+                    ids = [int(value) for value in query.get("ids", [""])[0].split(",") if value]
+                if len(ids) > MAX_IDS_PER_REQUEST:
+                    time.sleep(server.latency)
+                    self._reply(400, {"message": f"VS402337: The number of work items requested exceeds {MAX_IDS_PER_REQUEST}"})
+                    return
+                fields = query.get("fields", [""])[0].split(",") if "fields" in query else None
+                expand = query.get("$expand", [None])[0]
+                cost = server.per_item_latency * len(ids)
+                if expand == "All":
+                    cost *= server.expand_penalty
+                time.sleep(server.latency + cost)
+                value = []
+                for work_item_id in ids:
+                    source = server.work_items.get(work_item_id)
+                    if source is None:
+                        value.append(None)
+                        continue
+                    if fields:
+                        item_fields = {name: source[name] for name in fields if name in source}
+                    else:
+                        item_fields = dict(source)
+                    item = {"id": work_item_id, "rev": source["System.Rev"], "fields": item_fields}
+                    if expand == "All":
+                        item["fields"].update(_EXPANDED_FIELDS)
+                        item["relations"] = _EXPANDED_RELATIONS
+                    value.append(item)
+                self._reply(200, {"count": len(value), "value": value})
+
+        return Handler
+
+
+class FakeWitClient:
+    """
+    Minimal HTTP client exposing the WorkItemTrackingClient methods the
+    pipeline calls, so the real agents can be pointed at FakeAdoServer.
+    """
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.request_count = 0
+        self._lock = threading.Lock()
+
+    def _get(self, path: str) -> Dict:
+        with self._lock:
+            self.request_count += 1
+        with urllib.request.urlopen(f"{self.base_url}{path}") as response:
+            return json.loads(response.read())
+
+    def query_by_wiql(self, wiql, team_context=None, time_precision=None, top=None):
+        with self._lock:
+            self.request_count += 1
+        request = urllib.request.Request(
+            f"{self.base_url}/_apis/wit/wiql",
+            data=json.dumps({"query": getattr(wiql, "query", "")}).encode(),
+            headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request) as response:
+            body = json.loads(response.read())
+        return SimpleNamespace(work_items=[SimpleNamespace(id=item["id"]) for item in body["workItems"]])
+
+    def get_work_items(self, ids: List[int], project: Optional[str] = None, fields: Optional[List[str]] = None,
+                       as_of=None, expand: Optional[str] = None, error_policy: Optional[str] = None):
+        query = f"ids={','.join(str(work_item_id) for work_item_id in ids)}"
+        if fields:
+            query += f"&fields={','.join(fields)}"
+        if expand:
+            query += f"&$expand={expand}"
+        if error_policy:
+            query += f"&errorPolicy={error_policy}"
+        body = self._get(f"/_apis/wit/workitems?{query}")
+        return [_to_work_item(item) if item else None for item in body["value"]]
+
+    def get_work_item(self, id: int, project: Optional[str] = None, fields: Optional[List[str]] = None,
+                      as_of=None, expand: Optional[str] = None):
+        query = f"?fields={','.join(fields)}" if fields else ""
+        body = self._get(f"/_apis/wit/workitems/{id}{query}")
+        return _to_work_item(body["value"][0])
+
+
+class FakeConnection:
+    """Connection look-alike whose clients hand out a FakeWitClient"""
+
+    def __init__(self, wit_client: FakeWitClient):
+        self.clients = SimpleNamespace(get_work_item_tracking_client=lambda: wit_client)
+
+
+def _to_work_item(item: Dict) -> SimpleNamespace:
+    return SimpleNamespace(id=item["id"], rev=item.get("rev"), fields=item["fields"],
+                           relations=item.get("relations"))
@@ -0,0 +1,143 @@
+"""
+Local OpenAI-compatible chat completion server with injected latency, used by
+the benchmarks to measure LLM fan-out without calling the real API.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+
+SAMPLE_COMPLETION = """Test Case 1:
+1. Test Case Title: Valid login with standard user
+2. Test Steps:
+- Open the login page
+- Enter a valid username and password
+- Click the login button
+3. Expected Results:
+- The products page is displayed
+4. Test Data Requirements:
+- Username: standard_user
+- Password: secret_sauce
+
+Test Case 2:
+1. Test Case Title: Login with locked out user
+2. Test Steps:
+- Open the login page
+- Enter the locked out user's credentials
+- Click the login button
+3. Expected Results:
+- An error message about the locked account is displayed
+4. Test Data Requirements:
+- Username: locked_out_user
+"""
+
+
+class MockCompletionServer:
+    """
+    Threaded HTTP server answering POST /v1/chat/completions after a fixed
+    latency. The reply text comes from responder(request_body), which
+    defaults to SAMPLE_COMPLETION. Streaming requests receive the reply as
+    server-sent events of chunk_size characters, chunk_delay seconds apart.
+    """
+
+    def __init__(self, latency: float = 0.5, responder: Optional[Callable[[Dict], str]] = None,
+                 chunk_size: int = 16, chunk_delay: float = 0.0):
+        self.latency = latency
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.responder = responder or (lambda request: SAMPLE_COMPLETION)
+        self.request_count = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/v1/"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with server._lock:
+                    server.request_count += 1
+                    server._in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server._in_flight)
+                try:
+                    time.sleep(server.latency)
+                    content = server.responder(request)
+                finally:
+                    with server._lock:
+                        server._in_flight -= 1
+                if request.get("stream"):
+                    self._stream(request, content)
+                    return
+                prompt_tokens = sum(len(message.get("content", "")) for message in request.get("messages", [])) // 4
+                completion_tokens = len(content) // 4
+                payload = json.dumps({
+                    "id": f"chatcmpl-mock-{server.request_count}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": request.get("model", "mock"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop"
+                    }],
+                    "usage": {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens,
+                        "total_tokens": prompt_tokens + completion_tokens
+                    }
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _stream(self, request: Dict, content: str):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                for start in range(0, len(content), server.chunk_size):
+                    event = {
+                        "id": f"chatcmpl-mock-{server.request_count}",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": request.get("model", "mock"),
+                        "choices": [{
+                            "index": 0,
+                            "delta": {"content": content[start:start + server.chunk_size]},
+                            "finish_reason": None
+                        }]
+                    }
+                    self.wfile.write(f"data: {json.dumps(event)}\n\n".encode())
+                    self.wfile.flush()
+                    time.sleep(server.chunk_delay)
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+                self.close_connection = True
+
+        return Handler
@@ -0,0 +1,56 @@
+"""
+Corpus of recorded scenario responses and the regex parser RequirementsAnalyzer
+used before the single-pass parser, shared by the parsing benchmark and the
+parser's tests as the reference to compare against.
+"""
+import json
+import os
+import re
+from typing import Dict, List, Optional
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), 'corpus', 'scenario_responses.json')
+
+
+def load_corpus(path: str = DEFAULT_CORPUS, output_format: Optional[str] = None) -> List[Dict]:
+    """Corpus entries, optionally only those of one format ('text' or 'json')"""
+    with open(path) as f:
+        corpus = json.load(f)
+    return [entry for entry in corpus if output_format is None or entry['format'] == output_format]
+
+
+def regex_parse(content: str) -> List[Dict]:
+    """The regex parser RequirementsAnalyzer used before the single-pass parser"""
+    test_cases = []
+    raw_cases = re.split(r"Test Case \d+:|Test Scenario \d+:", content)
+    for raw_case in raw_cases[1:]:
+        lines = [l.strip() for l in raw_case.strip().split("\n") if l.strip()]
+        test_case = {'title': '', 'steps': [], 'expected_results': [], 'test_data': {}}
+        current_section = None
+        for line in lines:
+            if "Test Case Title:" in line:
+                test_case['title'] = line.split("Test Case Title:", 1)[1].strip()
+                current_section = None
+            elif re.match(r"\d+\.\s*Test Steps:?", line):
+                current_section = "steps"
+                continue
+            elif re.match(r"\d+\.\s*Expected Results:?", line):
+                current_section = "expected"
+                continue
+            elif re.match(r"\d+\.\s*Test Data Requirements:?", line):
+                current_section = "test_data"
+                continue
+            if current_section == "steps" and line.startswith("-"):
+                step = line.lstrip("- ").strip()
+                if step:
+                    test_case['steps'].append(step)
+            elif current_section == "expected" and line.startswith("-"):
+                expected = line.lstrip("- ").strip()
+                if expected:
+                    test_case['expected_results'].append(expected)
+            elif current_section == "test_data" and line.startswith("-"):
+                td = line.lstrip("- ").strip()
+                if td:
+                    test_case['test_data'][f"data_{len(test_case['test_data'])+1}"] = td
+        if test_case['title']:
+            test_cases.append(test_case)
+    return test_cases
@@ -1,52 +1,100 @@
+import argparse
+import asyncio
+import os
 from crewai import Crew, Process
 from dotenv import load_dotenv
 from agents.azure_devops_agent import AzureDevOpsAgent
+from agents.generated_files import generated_requirement_ids
+from agents.generation_engine import GenerationEngine
+from agents.impact_analysis import ImpactAnalyzer
 from agents.requirements_analyzer import RequirementsAnalyzer
-from agents.test_automation_generator import TestAutomationGenerator
 from agents.test_executor import TestExecutor
 
 def main():
     import pprint
+    parser = argparse.ArgumentParser(description="Generate and run tests for Azure DevOps requirements")
+    parser.add_argument('--shard', help="run only shard i of N of the generated tests, e.g. 2/4 (TEST_SHARD)")
+    args = parser.parse_args()
+
     azure_devops_agent = AzureDevOpsAgent()
+    # Generated files are only pruned for requirements known to be deleted or closed
+    removed_ids = set()
     try:
-        requirements = azure_devops_agent.fetch_requirements()
+        if os.getenv('INCREMENTAL_SYNC', 'false').lower() == 'true':
+            # Only new or changed requirements flow downstream
+            delta = azure_devops_agent.sync_requirements()
+            requirements = delta['changed']
+            print(f"Requirement sync: {len(delta['changed'])} new/changed, "
+                  f"{len(delta['removed'])} deleted/closed, {delta['unchanged']} unchanged")
+            for removed in delta['removed']:
+                print(f"- removed: {removed['id']} {removed['title']}")
+            removed_ids = {str(removed['id']) for removed in delta['removed']}
+        else:
+            requirements = azure_devops_agent.fetch_requirements()
+            if requirements:
+                # A full backlog: anything generated for a requirement not in it is gone
+                removed_ids = generated_requirement_ids() - {str(requirement['id']) for requirement in requirements}
         print("DEBUG: requirements fetched:")
         pprint.pprint(requirements)
     except Exception as e:
         print(f"Error fetching requirements: {e}")
         requirements = []
+        removed_ids = set()
 
     requirements_analyzer = RequirementsAnalyzer()
-    try:
-        test_scenarios = requirements_analyzer.analyze_requirements(requirements)
-        print("DEBUG: test_scenarios generated:")
-        pprint.pprint(test_scenarios)
-    except Exception as e:
-        print(f"Error analyzing requirements: {e}")
-        test_scenarios = []
-        print("DEBUG: test_scenarios generated (empty due to error):")
-        pprint.pprint(test_scenarios)
+    incremental_sync = os.getenv('INCREMENTAL_SYNC', 'false').lower() == 'true'
+    test_scenarios = []
+
+    def analyzed_scenarios():
+        """Scenarios as analysis produces them, kept in test_scenarios for the later steps"""
+        try:
+            if os.getenv('LLM_PACK', 'false').lower() == 'true':
+                produced = requirements_analyzer.analyze_requirements_packed(requirements)
+            elif os.getenv('LLM_ASYNC', 'false').lower() == 'true':
+                produced = asyncio.run(requirements_analyzer.analyze_requirements_async(requirements))
+            else:
+                # Yields each scenario as its requirement is analyzed, so code generation starts right away
+                produced = requirements_analyzer.analyze_requirements(requirements)
+            for scenario in produced:
+                test_scenarios.append(scenario)
+                yield scenario
+        except Exception as e:
+            print(f"Error analyzing requirements: {e}")
+        if not test_scenarios and not incremental_sync:
+            # Nothing came through analysis; don't prune on the strength of this run alone.
+            # generate() reads removed_ids once every scenario has been rendered
+            removed_ids.clear()
+
+    # Python and Java tests and page objects, rendered as the scenarios arrive
+    generation = GenerationEngine().generate(analyzed_scenarios(), removed_ids=removed_ids)
+    cache_stats = requirements_analyzer.cache.stats()
+    print(f"LLM response cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+          f"{cache_stats['entries']} entries")
+    print("DEBUG: test_scenarios generated:")
+    pprint.pprint(test_scenarios)
 
     print("\nGenerated test scenarios:")
     for scenario in test_scenarios:
         print(f"- {scenario.get('requirement_title', 'N/A')} ({len(scenario.get('test_cases', []))} test cases)")
+    print(f"\nGenerated Python Selenium test files in src/test/python and Java Selenium test files in "
+          f"src/test/java/com/crewai/tests ({generation['failed']} scenarios failed).")
 
     # Export test scenarios to Excel
     from agents.excel_exporter import save_test_scenarios_to_excel
     save_test_scenarios_to_excel(test_scenarios)
 
-
-    test_generator = TestAutomationGenerator()
-    test_generator.generate_test_automation(test_scenarios)
-    print("\nGenerated Python Selenium test files in src/test/python.")
-
-    # Generate Java Selenium test files and page objects
-    from agents.java_test_generator import generate_java_tests
-    generate_java_tests(test_scenarios)
-    print("Generated Java Selenium test files in src/test/java/com/crewai/tests and page objects in src/main/java/com/crewai/pages.")
+    # With IMPACT_ANALYSIS=true only scenarios affected by changes (plus the smoke set) run
+    impact_analyzer = ImpactAnalyzer.from_env()
+    skipped_scenarios = []
+    if impact_analyzer:
+        test_scenarios, skipped_scenarios = impact_analyzer.select(test_scenarios, requirements)
 
     test_executor = TestExecutor()
-    test_executor.execute_tests(test_scenarios)
+    results = test_executor.execute_tests(test_scenarios, shard=args.shard, skipped_scenarios=skipped_scenarios)
+    if impact_analyzer:
+        impact_analyzer.record(results)
+    print(f"\nExecuted {len(results['scenario_results'])} scenarios, "
+          f"skipped {len(results['skipped_scenarios'])} unaffected by changes")
     print("\nAutomation Process Completed!")
     print("Check the test-results directory for detailed execution results.")
 
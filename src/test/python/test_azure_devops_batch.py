@@ -0,0 +1,96 @@
+import json
+import os
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../main/java/com/crewai/automation')))
+
+from azure.devops.released.work_item_tracking import WorkItemTrackingClient
+from msrest.authentication import BasicAuthentication
+from AzureDevOpsIntegration import AzureDevOpsIntegration
+
+
+class FakeBatchEndpoint(ThreadingHTTPServer):
+    """Records each $batch body and answers every entry with a 200"""
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), self._handler())
+        self.paths = []
+        self.bodies = []
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                server.paths.append(self.path)
+                server.bodies.append(body)
+                operations = json.loads(body)
+                payload = json.dumps({
+                    'count': len(operations),
+                    'value': [{'code': 200, 'body': json.dumps({'id': index})} for index in range(len(operations))]
+                }).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+
+class TestSendBatch(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeBatchEndpoint()
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        # A real client, so the body goes through msrest; the Connection stand-in skips resource area discovery
+        wit_client = WorkItemTrackingClient(base_url=self.server.url, creds=BasicAuthentication('', 'token'))
+        connection = SimpleNamespace(
+            base_url=self.server.url,
+            clients=SimpleNamespace(get_work_item_tracking_client=lambda: wit_client)
+        )
+        self.integration = AzureDevOpsIntegration(connection, 'Project')
+
+    def test_body_is_a_json_array_of_operations(self):
+        requests = [
+            {
+                'method': 'PATCH',
+                'uri': '/_apis/wit/workitems/42?api-version=7.1',
+                'headers': {'Content-Type': 'application/json-patch+json'},
+                'body': self.integration.build_test_result_document({'status': 'Passed', 'comment': 'ok'})
+            },
+            {
+                'method': 'PATCH',
+                'uri': '/_apis/wit/workitems/$Test Case?api-version=7.1',
+                'headers': {'Content-Type': 'application/json-patch+json'},
+                'body': self.integration.build_test_case_document('Login', 'Valid login', [])
+            }
+        ]
+
+        responses = self.integration.send_batch(requests)
+
+        self.assertEqual(len(self.server.bodies), 1)
+        self.assertTrue(self.server.paths[0].startswith('/_apis/wit/$batch'))
+        received = json.loads(self.server.bodies[0])
+        self.assertIsInstance(received, list)
+        self.assertEqual(received, requests)
+        self.assertEqual([response['code'] for response in responses], [200, 200])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import json
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../main/python')))
+
+from agents.prompt_packer import demultiplex, pack_requirements
+from agents.scenario_schema import parse_packed_structured_test_cases
+
+
+def _entry(requirement_id):
+    return {"requirement_id": requirement_id,
+            "test_cases": [{"title": f"Case {requirement_id}", "steps": ["Open"], "expected_results": ["Shown"],
+                            "test_data": []}]}
+
+
+class TestPackedCompletions(unittest.TestCase):
+    def test_group_size_is_capped(self):
+        requirements = [{'id': index} for index in range(12)]
+        groups = pack_requirements(requirements, 10 ** 6, lambda requirement: 1, max_group_size=5)
+        self.assertEqual([len(group) for group in groups], [5, 5, 2])
+
+    def test_truncated_text_keeps_closed_sections_only(self):
+        content = ("=== Requirement 1 ===\nTest Case 1: Login\n"
+                   "=== Requirement 2 ===\nTest Case 1: Logout\n"
+                   "=== Requirement 3 ===\nTest Case 1: Sea")
+        self.assertEqual(sorted(demultiplex(content, [1, 2, 3])), ['1', '2', '3'])
+        sections = demultiplex(content, [1, 2, 3], truncated=True)
+        self.assertEqual(sorted(sections), ['1', '2'])
+        self.assertNotIn('Sea', sections['2'])
+
+    def test_truncated_arguments_keep_closed_entries_only(self):
+        arguments = json.dumps({"requirements": [_entry("1"), _entry("2"), _entry("3")]})
+        cut = arguments[:arguments.index('"3"') + 10]
+        self.assertEqual(parse_packed_structured_test_cases(cut), ({}, 1))
+        test_cases_by_id, rejected = parse_packed_structured_test_cases(cut, truncated=True)
+        self.assertEqual(sorted(test_cases_by_id), ['1', '2'])
+        self.assertEqual(rejected, 0)
+        self.assertEqual(parse_packed_structured_test_cases(arguments, truncated=True)[0].keys(), {'1', '2', '3'})
+
+
+if __name__ == '__main__':
+    unittest.main()
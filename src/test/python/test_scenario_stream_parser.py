@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../main/python')))
+
+from agents.scenario_stream_parser import ScenarioStreamParser
+from benchmarks.scenario_corpus import load_corpus, regex_parse
+
+
+class TestScenarioStreamParser(unittest.TestCase):
+    def test_recovers_everything_the_regex_parser_did(self):
+        entries = load_corpus(output_format='text')
+        for index, entry in enumerate(entries):
+            parsed = ScenarioStreamParser.parse(entry['content'])
+            baseline = regex_parse(entry['content'])
+            self.assertGreaterEqual(len(parsed), len(baseline), f"corpus entry {index}")
+            for old, new in zip(baseline, parsed):
+                # The regex parser left emphasis markup in front of drifted titles
+                self.assertTrue(old['title'].endswith(new['title']), f"corpus entry {index}: {new['title']}")
+                for field in ('steps', 'expected_results'):
+                    if old[field]:
+                        self.assertEqual(old[field], new[field], f"corpus entry {index}: {field}")
+                if old['test_data']:
+                    self.assertEqual(old['test_data'], new['test_data'], f"corpus entry {index}")
+
+    def test_step_mentioning_a_test_case_is_not_a_header(self):
+        content = ("Test Case 2:\n1. Test Case Title: Logout\n2. Test Steps:\n- Log in as in Test Case 1.\n"
+                   "- Click Logout\n3. Expected Results:\n- Login page shown")
+        self.assertEqual(ScenarioStreamParser.parse(content), regex_parse(content))
+        self.assertEqual(ScenarioStreamParser.parse(content)[0]['steps'], ['Log in as in Test Case 1.', 'Click Logout'])
+
+    def test_markdown_headers(self):
+        content = ("## Test Case 1: **Login**\n**Test Steps:**\n- Open the page\n**Expected Results**: Shown\n"
+                   "**Test Case 2: Logout**\n__Steps__\n* Click Logout\n")
+        self.assertEqual(ScenarioStreamParser.parse(content), [
+            {'title': 'Login', 'steps': ['Open the page'], 'expected_results': ['Shown'], 'test_data': {}},
+            {'title': 'Logout', 'steps': ['Click Logout'], 'expected_results': [], 'test_data': {}},
+        ])
+
+    def test_emphasis_inside_items_is_kept(self):
+        content = ("Test Case 1:\nTest Case Title: Emphasis\nTest Steps:\n- **Open** page\n- Click *Submit*\n"
+                   "- Set snake_case_name_\n- **Whole step**\n1. _Numbered_\n")
+        self.assertEqual(ScenarioStreamParser.parse(content)[0]['steps'],
+                         ['**Open** page', 'Click *Submit*', 'Set snake_case_name_', 'Whole step', 'Numbered'])
+
+    def test_streamed_fragments_match_a_complete_parse(self):
+        content = load_corpus(output_format='text')[0]['content']
+        parser = ScenarioStreamParser()
+        test_cases = []
+        for start in range(0, len(content), 7):
+            test_cases.extend(parser.feed(content[start:start + 7]))
+        test_cases.extend(parser.close())
+        self.assertEqual(test_cases, ScenarioStreamParser.parse(content))
+
+
+if __name__ == '__main__':
+    unittest.main()